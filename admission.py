@@ -0,0 +1,134 @@
+import os
+import math
+import threading
+from collections import deque
+
+import metrics
+
+# Configuration
+# Per process (i.e. per gunicorn worker); gunicorn.conf.py derives the heavy limits from its
+# thread count so uploads can never occupy every thread
+ADMISSION_ENABLED = os.environ.get('ADMISSION_CONTROL', '1') != '0'
+ADMISSION_HEAVY_CONCURRENCY = int(os.environ.get('ADMISSION_HEAVY_CONCURRENCY', 4))
+ADMISSION_HEAVY_QUEUE = int(os.environ.get('ADMISSION_HEAVY_QUEUE', 8))
+ADMISSION_HEAVY_MAX_WAIT = float(os.environ.get('ADMISSION_HEAVY_MAX_WAIT', 10))
+ADMISSION_LIGHT_CONCURRENCY = int(os.environ.get('ADMISSION_LIGHT_CONCURRENCY', 32))
+ADMISSION_LIGHT_QUEUE = int(os.environ.get('ADMISSION_LIGHT_QUEUE', 64))
+ADMISSION_LIGHT_MAX_WAIT = float(os.environ.get('ADMISSION_LIGHT_MAX_WAIT', 2))
+MAX_RETRY_AFTER = 120
+
+# Endpoint -> class; endpoints not listed (stats, metrics, probes, static files) are never limited
+ENDPOINT_CLASSES = {
+    'predict_pdf': 'heavy',
+    'predict_batch_pdf': 'heavy',
+    'predict': 'light'
+}
+
+
+class Overloaded(Exception):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """
+    Concurrency limiter with a bounded FIFO wait queue. A request past the queue bound, or
+    one that waits longer than max_wait, is rejected at once with a Retry-After estimated
+    from the queue ahead of it and the recent average service time.
+    """
+
+    def __init__(self, name, concurrency, queue_size, max_wait):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(0, queue_size)
+        self.max_wait = max_wait
+        self.active = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.avg_service_seconds = None  # EWMA of admitted request durations
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def retry_after(self, ahead=None):
+        """
+        Seconds until a new request would likely get a slot.
+        """
+        if ahead is None:
+            ahead = len(self._waiters)
+        service = self.avg_service_seconds or 1.0
+        return min(MAX_RETRY_AFTER, max(1, math.ceil((ahead + 1) * service / self.concurrency)))
+
+    def acquire(self):
+        with self._lock:
+            if self.active < self.concurrency and not self._waiters:
+                self.active += 1
+                self.admitted += 1
+                return
+            if len(self._waiters) >= self.queue_size:
+                self.shed_queue_full += 1
+                retry_after = self.retry_after()
+                metrics.ADMISSION_SHED.inc(endpoint_class=self.name, reason='queue_full')
+                raise Overloaded(f"Too many {self.name} requests in flight", retry_after)
+            slot = threading.Event()
+            self._waiters.append(slot)
+            self.queued += 1
+
+        if slot.wait(self.max_wait):
+            return
+        with self._lock:
+            if slot.is_set():
+                return  # Handed a slot just as the wait timed out
+            self._waiters.remove(slot)
+            self.shed_timeout += 1
+            retry_after = self.retry_after()
+        metrics.ADMISSION_SHED.inc(endpoint_class=self.name, reason='timeout')
+        raise Overloaded(f"Timed out waiting for a {self.name} request slot", retry_after)
+
+    def release(self, duration=None):
+        with self._lock:
+            if duration is not None:
+                if self.avg_service_seconds is None:
+                    self.avg_service_seconds = duration
+                else:
+                    self.avg_service_seconds = 0.8 * self.avg_service_seconds + 0.2 * duration
+            if self._waiters:
+                # Hand the slot straight to the oldest waiter: FIFO, and no thundering herd
+                self._waiters.popleft().set()
+                self.admitted += 1
+            else:
+                self.active -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'concurrency': self.concurrency,
+                'in_flight': self.active,
+                'queue_depth': len(self._waiters),
+                'queue_size': self.queue_size,
+                'max_wait_s': self.max_wait,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'shed': {'queue_full': self.shed_queue_full, 'timeout': self.shed_timeout},
+                'avg_service_ms': round(self.avg_service_seconds * 1000, 1) if self.avg_service_seconds is not None else None,
+                'retry_after_s': self.retry_after(len(self._waiters))
+            }
+
+
+_gates = {
+    'heavy': AdmissionGate('heavy', ADMISSION_HEAVY_CONCURRENCY, ADMISSION_HEAVY_QUEUE, ADMISSION_HEAVY_MAX_WAIT),
+    'light': AdmissionGate('light', ADMISSION_LIGHT_CONCURRENCY, ADMISSION_LIGHT_QUEUE, ADMISSION_LIGHT_MAX_WAIT)
+}
+
+def get_gate(endpoint):
+    """
+    The gate for a Flask endpoint name, or None when it is not admission-controlled.
+    """
+    if not ADMISSION_ENABLED:
+        return None
+    return _gates.get(ENDPOINT_CLASSES.get(endpoint))
+
+def stats():
+    return dict({name: gate.stats() for name, gate in _gates.items()}, enabled=ADMISSION_ENABLED)
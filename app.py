@@ -1,13 +1,29 @@
 print("Starting app.py...")
+import time
+APP_IMPORT_STARTED = time.perf_counter()
 import os
-import requests
-from flask import Flask, request, jsonify, send_from_directory
+import json
+from flask import Flask, request, jsonify, Response, stream_with_context, g, redirect
 from flask_cors import CORS
 import concurrent.futures
+import uuid
 
 # Local imports for modularity
 import utils
 import predictor
+import text_cache
+import ocr_pool
+import webhook_dispatcher
+import uploads
+import metrics
+import timing
+import warmup
+import jobs
+import dedup_index
+import prediction_cache
+import admission
+import static_assets
+import drift_store
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Default static folder is fine, we'll handle routing manually for SPA
@@ -17,23 +33,178 @@ CORS(app)  # Enable CORS for all routes
 # Configuration
 N8N_WEBHOOK_URL = os.environ.get('N8N_WEBHOOK_URL', 'https://optatively-punchier-pauline.ngrok-free.dev/webhook-test/upload_resume')
 
+# Long-lived pool for batch orchestration. Threads only wait on I/O and on the
+# shared OCR process pool, which is where CPU-bound Tesseract work runs.
+BATCH_THREADS = int(os.environ.get('BATCH_THREADS', 8))
+BATCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=BATCH_THREADS, thread_name_prefix='batch')
+
 # Ensure OCR binaries from local conda env are found (for utils to use)
 CONDA_BIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.conda', 'bin')
 if os.path.exists(CONDA_BIN):
     os.environ['PATH'] = CONDA_BIN + os.pathsep + os.environ['PATH']
 
+# Probe endpoints are excluded from the first-request measurement
+PROBE_PATHS = {'/healthz', '/readyz', '/metrics'}
 
-def trigger_n8n_webhook(payload):
+# Serving role for multi-pool deployments (see gunicorn.conf.py): 'all', 'fast' (JSON
+# endpoints only) or 'heavy' (uploads that may need OCR)
+SERVING_ROLE = os.environ.get('SERVING_ROLE', 'all')
+# Where a 'fast' pool sends upload requests that reach it anyway
+HEAVY_POOL_URL = os.environ.get('HEAVY_POOL_URL', '').rstrip('/')
+HEAVY_ENDPOINTS = {'predict_pdf', 'predict_batch_pdf'}
+
+# Start async job workers in this process on import (gunicorn starts them after fork instead)
+JOB_AUTOSTART = os.environ.get('JOB_AUTOSTART', '1') != '0'
+
+
+def create_app(role=None):
     """
-    Sends the analysis results to n8n webhook.
+    App factory for WSGI servers: gunicorn -c gunicorn.conf.py (wsgi_app = 'app:create_app()').
+    The app itself is built at import time so the master can preload it before forking.
     """
+    app.config['SERVING_ROLE'] = role or SERVING_ROLE
+    return app
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.timing_token = timing.start_request()
+
+@app.before_request
+def route_by_role():
+    # Keep extraction/OCR requests off the workers that serve fast JSON calls
+    if app.config.get('SERVING_ROLE', SERVING_ROLE) != 'fast' or request.endpoint not in HEAVY_ENDPOINTS:
+        return None
+    if HEAVY_POOL_URL:
+        # 307 keeps the method and the multipart body
+        return redirect(HEAVY_POOL_URL + request.full_path.rstrip('?'), code=307)
+    return jsonify({'error': 'This server only handles JSON endpoints; send uploads to the heavy pool'}), 421
+
+@app.before_request
+def admit_request():
+    # Bounded concurrency per endpoint class: shed with a fast 503 instead of queueing forever
+    gate = admission.get_gate(request.endpoint)
+    if gate is None:
+        return None
     try:
-        print(f"Sending data to n8n: {N8N_WEBHOOK_URL}")
-        # Send async or with short timeout so we don't block the UI response too long
-        response = requests.post(N8N_WEBHOOK_URL, json=payload, timeout=2)
-        print(f"n8n response: {response.status_code}")
-    except Exception as e:
-        print(f"Failed to trigger n8n webhook: {e}")
+        gate.acquire()
+    except admission.Overloaded as e:
+        response = jsonify({'error': str(e), 'retry_after': e.retry_after})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    g.admission_gate = gate
+    g.admitted_at = time.perf_counter()
+    return None
+
+@app.after_request
+def record_request_latency(response):
+    started = g.get('request_started')
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+
+    # Route template (not raw path) keeps label cardinality bounded
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.REQUEST_LATENCY.observe(
+        elapsed,
+        endpoint=endpoint,
+        method=request.method,
+        status=response.status_code
+    )
+    if endpoint not in PROBE_PATHS:
+        warmup.get_warmup().note_request(request.path, elapsed)
+
+    # Per-stage breakdown: always as Server-Timing, in the body with ?timings=1
+    stages = timing.breakdown()
+    stages['total'] = {'ms': round(elapsed * 1000, 2), 'count': 1}
+    response.headers['Server-Timing'] = timing.server_timing_header(stages)
+    if request.args.get('timings') and response.is_json and not response.is_streamed:
+        body = response.get_json()
+        if isinstance(body, dict):
+            body['timings'] = stages
+            response.set_data(json.dumps(body))
+    return response
+
+@app.after_request
+def hold_admission_for_stream(response):
+    # Streamed batches do their work while the body is written: keep the slot until it closes
+    gate = g.get('admission_gate')
+    if gate is not None and response.is_streamed:
+        g.pop('admission_gate')
+        admitted_at = g.pop('admitted_at')
+        response.call_on_close(lambda: gate.release(time.perf_counter() - admitted_at))
+    return response
+
+@app.teardown_request
+def release_admission(exc):
+    gate = g.pop('admission_gate', None)
+    if gate is not None:
+        gate.release(time.perf_counter() - g.pop('admitted_at'))
+
+@app.teardown_request
+def end_request_timer(exc):
+    token = g.pop('timing_token', None)
+    if token is not None:
+        try:
+            timing.end_request(token)
+        except ValueError:
+            # Streamed responses finish in a different context
+            pass
+
+# Scrape-time gauges for the shared subsystems
+def _cache_lookups():
+    cache = text_cache.get_cache()
+    return {'memory_hit': cache.memory_hits, 'disk_hit': cache.disk_hits, 'miss': cache.misses}
+
+metrics.gauge_func('resume_extraction_cache_lookups', 'Extraction cache lookups by outcome.', _cache_lookups, labelnames=('outcome',))
+metrics.gauge_func('resume_ocr_in_flight', 'OCR tasks queued or running.', lambda: ocr_pool.get_pool().stats()['in_flight'])
+metrics.gauge_func('resume_upload_budget_in_use_bytes', 'Upload memory budget currently reserved.', lambda: uploads.get_budget().stats()['in_use_bytes'])
+metrics.gauge_func('resume_webhook_queue_depth', 'Webhook payloads waiting for delivery.', lambda: webhook_dispatcher.get_dispatcher(N8N_WEBHOOK_URL).stats()['queue_depth'])
+metrics.gauge_func('resume_jobs', 'Async jobs by status.', lambda: jobs.get_queue().stats()['counts'], labelnames=('status',))
+
+def _admission_gauge(field):
+    return lambda: {name: gate[field] for name, gate in admission.stats().items() if name != 'enabled'}
+
+metrics.gauge_func('resume_admission_queue_depth', 'Requests waiting for an admission slot, by endpoint class.', _admission_gauge('queue_depth'), labelnames=('endpoint_class',))
+metrics.gauge_func('resume_admission_in_flight', 'Admitted requests in progress, by endpoint class.', _admission_gauge('in_flight'), labelnames=('endpoint_class',))
+
+def _prediction_cache_lookups():
+    cache = prediction_cache.get_cache()
+    return {'hit': cache.hits, 'miss': cache.misses}
+
+metrics.gauge_func('resume_prediction_cache_lookups', 'Prediction cache lookups by outcome.', _prediction_cache_lookups, labelnames=('outcome',))
+metrics.gauge_func('resume_prediction_cache_bytes', 'Estimated memory held by the prediction cache.', lambda: prediction_cache.get_cache().stats()['memory_bytes'])
+
+def _dedup_lookups():
+    index = dedup_index.get_index()
+    return {'duplicate': index.hits, 'new': index.lookups - index.hits}
+
+metrics.gauge_func('resume_dedup_lookups', 'Near-duplicate index lookups by outcome.', _dedup_lookups, labelnames=('outcome',))
+
+def trigger_n8n_webhook(payload):
+    """
+    Queues the analysis results for background delivery to the n8n webhook.
+    Returns immediately; delivery, batching and retries happen in webhook_dispatcher.
+    """
+    with timing.span('webhook'):
+        webhook_dispatcher.get_dispatcher(N8N_WEBHOOK_URL).enqueue(payload)
+
+def build_webhook_payload(response, skills, text=None, filename=None):
+    """
+    The n8n payload for a classified resume: the response with the full skills string, plus
+    the extracted text and uploaded filename when there is one. Shared by /predict,
+    /predict_pdf and async jobs so n8n sees the same payload for all of them. The response's
+    own parsed_data is never modified.
+    """
+    payload = response.copy()
+    payload['parsed_data'] = dict(response['parsed_data'], skills=skills)
+    if text:
+        payload['full_text'] = text
+    if filename:
+        payload['filename'] = filename
+    return payload
 
 @app.route('/predict_pdf', methods=['POST'])
 def predict_pdf():
@@ -48,8 +219,8 @@ def predict_pdf():
         if file:
             file_content = file.read() # Read once
             
-            # Use unified extractor from utils
-            text = utils.extract_text_from_file(file_content, file.filename)
+            # Use unified extractor from utils (cached by content hash)
+            text = utils.extract_text_from_file_cached(file_content, file.filename)
             
             # Validation: Check if text content is sufficient and looks like a resume
             if len(text.strip()) < 50:
@@ -62,7 +233,13 @@ def predict_pdf():
                 pass
                 
             # Parse features using utils
-            parsed_data = utils.parse_resume_text(text)
+            with timing.span('parse'):
+                parsed_data = utils.parse_resume_text(text)
+
+            # A resubmission of an already classified resume gets the earlier result, no webhook
+            duplicate, dedup_key = find_duplicate(text, parsed_data, file.filename)
+            if duplicate is not None:
+                return jsonify(duplicate)
             
             # Get prediction using predictor
             response_data = predictor.get_prediction_data(
@@ -74,16 +251,10 @@ def predict_pdf():
                 filename=file.filename,
                 name=parsed_data.get('name')
             )
+            remember_result(dedup_key, response_data)
             
             # Trigger webhook
-            webhook_payload = response_data.copy()
-            webhook_payload['parsed_data']['skills'] = parsed_data['skills'] # Full skills
-            if text:
-                webhook_payload['full_text'] = text
-            if file.filename:
-                webhook_payload['filename'] = file.filename
-            
-            trigger_n8n_webhook(webhook_payload)
+            trigger_n8n_webhook(build_webhook_payload(response_data, parsed_data['skills'], text, file.filename))
 
             return jsonify(response_data)
             
@@ -98,91 +269,361 @@ def predict_batch_pdf():
             
         files = request.files.getlist('files[]')
         
-        # Pre-load model to ensure it's safe for threads
-        predictor.get_model()
+        # Pre-load the model before threads use it; the compact scorer (preloaded by warm-up)
+        # makes unpickling the sklearn pipeline unnecessary
+        predictor.get_scorer() or predictor.get_model()
         
-        # Read all files into memory (Flask streams are not thread-safe)
-        file_data_list = []
-        for file in files:
-            if file.filename:
-                file_data_list.append((file.filename, file.read()))
+        # Spool uploads before handing them to threads (Flask streams are not thread-safe).
+        # Large files go to temp files and are read through mmap instead of RAM copies.
+        upload_list = []
+        try:
+            for file in files:
+                if file.filename:
+                    upload_list.append(uploads.SpooledUpload.from_file_storage(file))
+        except Exception:
+            for upload in upload_list:
+                upload.close()
+            raise
         
-        results = []
+        # Streaming mode: NDJSON or Server-Sent Events, one record per finished file
+        stream_format = get_stream_format()
+        if stream_format:
+            return stream_batch(upload_list, stream_format)
         
-        # Use ThreadPoolExecutor for I/O bound tasks (OCR/PDF read)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_file = {
-                executor.submit(process_single_file, filename, content): filename 
-                for filename, content in file_data_list
-            }
-            
-            for future in concurrent.futures.as_completed(future_to_file):
-                filename = future_to_file[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    results.append({
-                        'filename': filename,
-                        'error': f"Thread error: {str(e)}"
-                    })
-
-        return jsonify({'results': results})
+        # Shared executor: OCR itself is bounded globally by the OCR process pool.
+        # Threads only extract and parse; scoring happens once for the whole batch.
+        future_to_file = {
+            BATCH_EXECUTOR.submit(timing.propagate(extract_upload), upload): upload.filename 
+            for upload in upload_list
+        }
+        
+        extracted = []
+        for future in concurrent.futures.as_completed(future_to_file):
+            filename = future_to_file[future]
+            try:
+                extracted.append(future.result())
+            except Exception as e:
+                extracted.append({
+                    'filename': filename,
+                    'error': f"Thread error: {str(e)}"
+                })
+
+        return jsonify({'results': score_extracted(extracted)})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def process_single_file(filename, file_content):
+def get_stream_format():
     """
-    Helper function for processing a single file in a separate thread.
+    Streaming is requested with ?stream=ndjson|sse or a matching Accept header.
+    """
+    requested = request.args.get('stream', '').lower()
+    if requested in ('ndjson', 'sse'):
+        return requested
+    accept = request.headers.get('Accept', '')
+    if 'text/event-stream' in accept:
+        return 'sse'
+    if 'application/x-ndjson' in accept:
+        return 'ndjson'
+    return None
+
+def format_stream_record(record, stream_format):
+    data = json.dumps(record)
+    if stream_format == 'sse':
+        return f"event: {record['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+def stream_batch(upload_list, stream_format):
+    """
+    Writes each result as soon as its file finishes instead of buffering the whole batch.
+    Every result carries its filename and upload position; a summary record comes last.
+    """
+    started = time.perf_counter()
+    total = len(upload_list)
+    future_to_file = {
+        BATCH_EXECUTOR.submit(timing.propagate(extract_upload), upload): (index, upload.filename)
+        for index, upload in enumerate(upload_list)
+    }
+
+    def generate():
+        succeeded = 0
+        failed = 0
+        for future in concurrent.futures.as_completed(future_to_file):
+            # Drop our reference so finished results are not retained
+            index, filename = future_to_file.pop(future)
+            try:
+                item = future.result()
+            except Exception as e:
+                item = {
+                    'filename': filename,
+                    'error': f"Thread error: {str(e)}"
+                }
+            result = score_extracted([item])[0]
+            if 'error' in result:
+                failed += 1
+            else:
+                succeeded += 1
+            yield format_stream_record(dict(result, type='result', index=index, filename=filename), stream_format)
+
+        yield format_stream_record({
+            'type': 'summary',
+            'total': total,
+            'succeeded': succeeded,
+            'failed': failed,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        }, stream_format)
+
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        # Disable proxy buffering so records reach the client immediately
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def extract_upload(upload):
     """
+    Extracts one spooled upload under the global in-flight memory budget, then frees it.
+    Threads wait here (backpressure) while large batches would exceed the budget.
+    """
+    budget = uploads.get_budget()
+    cost = upload.estimated_cost()
     try:
-        if not filename:
-             return None
-             
-        # Process file using utils
-        text = utils.extract_text_from_file(file_content, filename)
-        
-        if not text or len(text.strip()) < 50:
-             return {
-                 'filename': filename,
-                 'error': 'Text extraction failed or content too short'
-             }
+        budget.acquire(cost)
+    except uploads.MemoryBudgetExceeded as e:
+        upload.close()
+        return {
+            'filename': upload.filename,
+            'error': str(e)
+        }
+    try:
+        return extract_features(upload.filename, upload.buffer())
+    finally:
+        budget.release(cost)
+        upload.close()
 
+class InsufficientText(Exception):
+    pass
+
+def find_duplicate(text, parsed_data, filename):
+    """
+    Looks the text up in the near-duplicate index. Returns (earlier result marked with
+    'duplicate_of', None) for a resubmitted resume, otherwise (None, key) where key is passed
+    to remember_result once the resume has been classified. Index failures never fail requests.
+    """
+    if not dedup_index.DEDUP_ENABLED:
+        return None, None
+    identity = dedup_index.candidate_identity(parsed_data.get('email'), parsed_data.get('name'))
+    if not identity:
+        return None, None
+    try:
+        with timing.span('dedup'):
+            sig = dedup_index.signature(text)
+            if sig is None:
+                return None, None
+            match = dedup_index.get_index().lookup(sig, predictor.get_model_version(), identity)
+    except Exception as e:
+        print(f"Duplicate index lookup failed: {e}")
+        return None, None
+    if match is None:
+        return None, (sig, identity)
+    return dict(match['result'], filename=filename, duplicate_of={
+        'id': match['id'],
+        'filename': match['filename'],
+        'similarity': match['similarity'],
+        'classified_at': match['created_at']
+    }), None
+
+def remember_result(dedup_key, response):
+    # Only real model outputs: errors and exception fallbacks would be replayed for months
+    if dedup_key is None or response.get('class_label') == 'Error' or response.get('fallback'):
+        return
+    sig, identity = dedup_key
+    try:
+        dedup_index.get_index().add(sig, predictor.get_model_version(), identity, response.get('filename'), response)
+    except Exception as e:
+        print(f"Duplicate index update failed: {e}")
+
+def extract_record(filename, file_content):
+    """
+    Extracts and parses one file into a predictor record. Raises on failure.
+    A near-duplicate of an already classified resume yields {'filename', 'duplicate': result}.
+    """
+    # Process file using utils (cached by content hash)
+    text = utils.extract_text_from_file_cached(file_content, filename)
+
+    if not text or len(text.strip()) < 50:
+        raise InsufficientText('Text extraction failed or content too short')
+
+    with timing.span('parse'):
         parsed_data = utils.parse_resume_text(text)
-        
-        # Get prediction using predictor
-        prediction_result = predictor.get_prediction_data(
-            parsed_data['skills'], 
-            parsed_data['experience_years'], 
-            parsed_data['education'],
-            email=parsed_data['email'],
-            full_text=text,
-            filename=filename,
-            name=parsed_data.get('name')
-        )
-        
-        return prediction_result
-        
+    duplicate, dedup_key = find_duplicate(text, parsed_data, filename)
+    if duplicate is not None:
+        return {'filename': filename, 'duplicate': duplicate}
+    return {
+        'skills': parsed_data['skills'],
+        'experience_years': parsed_data['experience_years'],
+        'education': parsed_data['education'],
+        'email': parsed_data['email'],
+        'name': parsed_data.get('name'),
+        'filename': filename,
+        'dedup_key': dedup_key,
+        'text': text
+    }
+
+def extract_features(filename, file_content):
+    """
+    Helper function for extracting and parsing a single file in a separate thread.
+    Returns a predictor record, or a dict with an 'error' key.
+    """
+    try:
+        return extract_record(filename, file_content)
     except Exception as e:
         return {
             'filename': filename,
             'error': str(e)
         }
 
+def score_extracted(extracted):
+    """
+    Scores every successfully parsed record in one batched predictor call.
+    Error entries are passed through unchanged and duplicates get their earlier result,
+    preserving order.
+    """
+    records = [item for item in extracted if 'error' not in item and 'duplicate' not in item]
+    scored = iter(predictor.get_prediction_batch(records))
+    results = []
+    for item in extracted:
+        if 'error' in item:
+            results.append(item)
+        elif 'duplicate' in item:
+            results.append(item['duplicate'])
+        else:
+            response = next(scored)
+            remember_result(item.get('dedup_key'), response)
+            results.append(response)
+    return results
+
+def process_single_file(filename, file_content):
+    """
+    Helper function for processing a single file in a separate thread.
+    """
+    if not filename:
+         return None
+    return score_extracted([extract_features(filename, file_content)])[0]
+
+def run_job(filename, path):
+    """
+    Async job handler: the /predict_pdf path (extract, parse, predict, webhook) for an upload
+    stored by the job queue. Unexpected errors propagate so the job is retried.
+    """
+    size = os.path.getsize(path)
+    if not size:
+        raise jobs.JobFailed('Empty file')
+
+    budget = uploads.get_budget()
+    cost = uploads.estimate_cost(size)
+    budget.acquire(cost)
+    mapped = uploads.map_file(path)
+    try:
+        record = extract_record(filename, mapped)
+    except InsufficientText as e:
+        raise jobs.JobFailed(str(e))
+    finally:
+        budget.release(cost)
+        try:
+            mapped.close()
+        except BufferError:
+            pass
+
+    if 'duplicate' in record:
+        return record['duplicate']
+    response = predictor.get_prediction_batch([record])[0]
+    remember_result(record.get('dedup_key'), response)
+    trigger_n8n_webhook(build_webhook_payload(response, record['skills'], record['text'], filename))
+    return response
+
+_job_workers = None
+
+def get_job_workers():
+    global _job_workers
+    if _job_workers is None:
+        _job_workers = jobs.JobWorkers(jobs.get_queue(), run_job)
+    return _job_workers
+
+@app.route('/jobs', methods=['POST'])
+def submit_jobs():
+    """
+    Queues uploads for background classification and returns immediately (202).
+    'file' -> one job; 'files' (one or more) -> a batch with its own status URL.
+    """
+    is_batch = 'files' in request.files
+    uploaded = [f for f in request.files.getlist('files' if is_batch else 'file') if f and f.filename]
+    if not uploaded:
+        return jsonify({'error': 'No file part'}), 400
+
+    queue = jobs.get_queue()
+    if not is_batch:
+        job_id = queue.submit(uploaded[0].filename, uploaded[0].stream)
+        return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': f'/jobs/{job_id}'}), 202
+
+    batch_id = uuid.uuid4().hex
+    submitted = [{'job_id': queue.submit(f.filename, f.stream, batch_id), 'filename': f.filename} for f in uploaded]
+    return jsonify({'batch_id': batch_id, 'jobs': submitted, 'status_url': f'/jobs/batch/{batch_id}'}), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = jobs.get_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/batch/<batch_id>', methods=['GET'])
+def get_job_batch(batch_id):
+    batch = jobs.get_queue().get_batch(batch_id)
+    if batch is None:
+        return jsonify({'error': 'Unknown batch'}), 404
+    return jsonify(batch)
+
+@app.route('/jobs/stats', methods=['GET'])
+def get_job_stats():
+    return jsonify(dict(jobs.get_queue().stats(), workers=get_job_workers().stats()))
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
-    else:
-        return send_from_directory(app.static_folder, 'index.html')
+    # Dashboard files come from an in-memory index of dist (see static_assets)
+    index = static_assets.get_index(app.static_folder)
+    asset = index.get(path) if path else None
+    if asset is None:
+        # Client-side routes get the SPA shell; a missing file is a real 404
+        if os.path.splitext(path)[1]:
+            return jsonify({'error': 'Not found'}), 404
+        asset = index.get('index.html')
+        if asset is None:
+            return jsonify({'error': 'Dashboard not built (run npm run build in resume-classifier-frontend)'}), 404
+
+    encoding, body, etag = asset.select(request.headers.get('Accept-Encoding'))
+    headers = {'ETag': etag, 'Cache-Control': asset.cache_control}
+    if len(asset.representations) > 1:
+        headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype=asset.mimetype, headers=headers)
 
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
         data = request.get_json()
         
+        # Batch variant: a JSON array of records, or {"records": [...]}
+        if isinstance(data, dict) and isinstance(data.get('records'), list):
+            data = data['records']
+        if isinstance(data, list):
+            return predict_records(data)
+
         # Extract features
         skills = data.get('skills', '')
         experience_years = float(data.get('experience_years', 0))
@@ -192,18 +633,102 @@ def predict():
         response = predictor.get_prediction_data(skills, experience_years, education)
         
         # Webhook logic for manual entry
-        webhook_payload = response.copy()
-        webhook_payload['parsed_data']['skills'] = skills
-        trigger_n8n_webhook(webhook_payload)
+        trigger_n8n_webhook(build_webhook_payload(response, skills))
         
         return jsonify(response)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+def predict_records(items):
+    """
+    Scores a list of manual-entry records with a single predictor call.
+    """
+    records = []
+    for item in items:
+        records.append({
+            'skills': item.get('skills', ''),
+            'experience_years': float(item.get('experience_years', 0)),
+            'education': item.get('education', 'Unknown')
+        })
+
+    responses = predictor.get_prediction_batch(records)
+
+    for record, response in zip(records, responses):
+        trigger_n8n_webhook(build_webhook_payload(response, record['skills']))
+
+    return jsonify({'results': responses})
+
 @app.route('/stats', methods=['GET'])
 def get_stats():
     return jsonify(predictor.get_stats())
 
+@app.route('/drift', methods=['GET'])
+def get_drift():
+    # ?window=15m|6h|7d (default 1h), optional ?baseline= in the same format
+    if not drift_store.DRIFT_ENABLED:
+        return jsonify({'error': 'Drift store is disabled'}), 404
+    try:
+        window = drift_store.parse_window(request.args.get('window'))
+        baseline = drift_store.parse_window(request.args.get('baseline'), default=None)
+    except ValueError:
+        return jsonify({'error': 'Invalid window, expected e.g. 900, 15m, 6h or 7d'}), 400
+    return jsonify(drift_store.get_store().window(window, baseline_seconds=baseline))
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/timings', methods=['GET'])
+def get_timings():
+    return jsonify(timing.stage_percentiles())
+
+@app.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify(text_cache.get_cache().stats())
+
+@app.route('/predict/cache/stats', methods=['GET'])
+def get_prediction_cache_stats():
+    return jsonify(prediction_cache.get_cache().stats())
+
+@app.route('/admission/stats', methods=['GET'])
+def get_admission_stats():
+    return jsonify(admission.stats())
+
+@app.route('/ocr/stats', methods=['GET'])
+def get_ocr_stats():
+    return jsonify(ocr_pool.get_pool().stats())
+
+@app.route('/uploads/stats', methods=['GET'])
+def get_upload_stats():
+    return jsonify(uploads.get_budget().stats())
+
+@app.route('/dedup/stats', methods=['GET'])
+def get_dedup_stats():
+    return jsonify(dedup_index.get_index().stats())
+
+@app.route('/webhook/stats', methods=['GET'])
+def get_webhook_stats():
+    return jsonify(webhook_dispatcher.get_dispatcher(N8N_WEBHOOK_URL).stats())
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    # Liveness: the process is up and serving, whether or not warm-up has finished
+    return jsonify({'status': 'alive'})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    # Readiness: model loaded and a dummy inference done
+    state = warmup.get_warmup()
+    return jsonify(state.report()), 200 if state.is_ready() else 503
+
+# Heavy modules and the model load in the background (WARMUP_MODE), after the import-time report
+warmup.get_warmup().add_step('static', lambda: static_assets.get_index(app.static_folder).stats()['files'])
+warmup.get_warmup().record_phase('app_import', time.perf_counter() - APP_IMPORT_STARTED)
+warmup.get_warmup().start(origin=APP_IMPORT_STARTED)
+
+if JOB_AUTOSTART:
+    get_job_workers().ensure_started()
+
 if __name__ == '__main__':
     app.run(debug=False, host='0.0.0.0', port=5003)
@@ -0,0 +1,159 @@
+import os
+import csv
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Note: The file has a leading space in the name
+DATASET_PATH = os.path.join(BASE_DIR, ' resume_dataset.csv')
+
+
+def load_rows(path=DATASET_PATH):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def resume_lines(row):
+    """
+    Renders one dataset row as the lines of a plausible plain-text resume.
+    """
+    name = row['name']
+    handle = name.lower().replace(' ', '.')
+    lines = [
+        name,
+        f"{handle}@example.com | +91 9876543210",
+        "",
+        "Summary",
+        f"{row['job_title']} with {row['experience_years']} years of experience in the {row['industry']} industry.",
+        "Focused on delivering results, collaborating with teams and continuous learning.",
+        "",
+        "Experience",
+        f"{row['job_title']} - Acme Corp ({row['experience_years']} years)",
+        "- Worked on key initiatives and delivered projects on time.",
+        "- Collaborated with stakeholders across departments.",
+        "",
+        "Education",
+        f"{row['education']} from State University, 2015",
+        "Higher Secondary, 2011",
+        "",
+        "Skills",
+    ]
+    lines.extend(f"• {skill}" for skill in row['skills'].split(';'))
+    lines.extend([
+        "",
+        "Projects",
+        "- Built internal tooling for reporting",
+        "- Improved data quality checks",
+    ])
+    return lines
+
+def resume_text(row):
+    return "\n".join(resume_lines(row))
+
+def resume_texts(path=DATASET_PATH):
+    return [resume_text(row) for row in load_rows(path)]
+
+
+# --- Synthetic documents ---
+
+def _pdf_escape(text):
+    return text.encode('latin-1', 'replace').decode('latin-1').replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def _build_pdf(page_streams, width=612, height=792):
+    """
+    Writes a minimal PDF (Helvetica, one content stream per page) without extra dependencies.
+    """
+    count = len(page_streams)
+    font_id = 3 + 2 * count
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>' % (' '.join(f'{3 + 2 * i} 0 R' for i in range(count)), count)).encode()
+    ]
+    for i, stream in enumerate(page_streams):
+        objects.append((f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] '
+                        f'/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>').encode())
+        data = stream.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(data) + data + b'\nendstream')
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return out
+
+def text_pdf(lines):
+    """
+    Single-column text-layer PDF.
+    """
+    body = ' '.join(f'({_pdf_escape(line)}) Tj T*' for line in lines)
+    return _build_pdf([f'BT /F1 11 Tf 14 TL 50 740 Td {body} ET'])
+
+def layout_pdf(lines):
+    """
+    Two-column PDF with every line absolutely positioned, as produced by resume templates.
+    """
+    half = (len(lines) + 1) // 2
+    operations = []
+    for column, chunk in enumerate((lines[:half], lines[half:])):
+        x = 40 + column * 300
+        for row, line in enumerate(chunk):
+            operations.append(f'BT /F1 10 Tf {x} {750 - row * 16} Td ({_pdf_escape(line)}) Tj ET')
+    return _build_pdf([' '.join(operations)])
+
+def render_page(lines, dpi=150):
+    """
+    Renders resume lines onto a white letter-size page image, like a scan.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = int(8.5 * dpi), int(11 * dpi)
+    image = Image.new('L', (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    size = max(10, dpi // 6)
+    try:
+        font = ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has no scalable default font
+        font = ImageFont.load_default()
+    y = dpi // 2
+    for line in lines:
+        draw.text((dpi // 2, y), line, fill=0, font=font)
+        y += int(size * 1.5)
+    return image
+
+def image_bytes(lines, fmt, dpi=150):
+    import io
+
+    buffer = io.BytesIO()
+    image = render_page(lines, dpi)
+    if fmt == 'JPEG':
+        image.save(buffer, fmt, quality=85)
+    elif fmt == 'PDF':
+        image.save(buffer, fmt, resolution=dpi)
+    else:
+        image.save(buffer, fmt)
+    return buffer.getvalue()
+
+# kind -> (file extension, builder)
+DOCUMENT_KINDS = {
+    'text_pdf': ('.pdf', text_pdf),
+    'layout_pdf': ('.pdf', layout_pdf),
+    'scanned_pdf': ('.pdf', lambda lines: image_bytes(lines, 'PDF')),
+    'png': ('.png', lambda lines: image_bytes(lines, 'PNG')),
+    'jpeg': ('.jpg', lambda lines: image_bytes(lines, 'JPEG')),
+    'tiff': ('.tiff', lambda lines: image_bytes(lines, 'TIFF')),
+}
+
+def build_documents(kinds=None, per_kind=20, path=DATASET_PATH):
+    """
+    Returns {kind: [(filename, bytes), ...]} built from the first `per_kind` dataset rows.
+    """
+    rows = load_rows(path)[:per_kind]
+    documents = {}
+    for kind in kinds or DOCUMENT_KINDS:
+        extension, builder = DOCUMENT_KINDS[kind]
+        documents[kind] = [(f"{kind}-{row['resume_id']}{extension}", builder(resume_lines(row))) for row in rows]
+    return documents
@@ -0,0 +1,195 @@
+"""
+Image preprocessing benchmark: the previous OCR input path (decode at full resolution, first
+frame only, RGB) against image_preprocess (draft-mode JPEG decoding, downscaling, grayscale,
+every TIFF frame up to the limit).
+
+Per image kind it reports preprocessing latency, peak RSS growth of a fresh process and the
+pixels handed to Tesseract. When Tesseract is installed it also reports OCR latency and word
+recall against the rendered text.
+
+Usage:
+    python benchmarks/image_bench.py [--samples 3] [--output image_bench.json]
+"""
+import io
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import resource
+import multiprocessing
+import concurrent.futures
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import image_preprocess
+from corpus import load_rows, resume_lines, render_page
+
+SCAN_DPI = 300
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def phone_photo(lines):
+    # A letter page shot at ~44 MP, as modern phones produce
+    from PIL import Image
+
+    page = render_page(lines, SCAN_DPI).resize((5865, 7590), Image.Resampling.BILINEAR).convert('RGB')
+    buffer = io.BytesIO()
+    page.save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+def scan_png(lines):
+    buffer = io.BytesIO()
+    render_page(lines, SCAN_DPI).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def multipage_tiff(lines):
+    # Fax-style bilevel TIFF, the resume split over two frames
+    half = len(lines) // 2
+    pages = [render_page(chunk, SCAN_DPI).convert('1') for chunk in (lines[:half], lines[half:])]
+    buffer = io.BytesIO()
+    pages[0].save(buffer, 'TIFF', save_all=True, append_images=pages[1:], compression='group4')
+    return buffer.getvalue()
+
+IMAGE_KINDS = {
+    'phone_jpeg': phone_photo,
+    'scan_png': scan_png,
+    'multipage_tiff': multipage_tiff,
+}
+
+
+def legacy_frames(data):
+    # Previous ocr_image_bytes: first frame only, full resolution
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    if image.mode not in ('L', 'RGB'):
+        image = image.convert('RGB')
+    image.load()
+    return [image]
+
+def bounded_frames(data):
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    return [image_preprocess.prepare(frame) for frame in image_preprocess.iter_frames(image)]
+
+METHODS = {'legacy': legacy_frames, 'bounded': bounded_frames}
+
+
+def _reset_peak_rss():
+    # Linux: clear the high-water mark, which otherwise survives fork+exec from the parent
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+def _status_kb(field):
+    # VmHWM = peak RSS, VmRSS = current RSS (Linux); ru_maxrss elsewhere
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def run_once(method, data, ocr):
+    """
+    Runs in a fresh process so peak RSS belongs to this image alone.
+    """
+    from PIL import Image  # Imported before the baseline is taken
+
+    _reset_peak_rss()
+    baseline_kb = _status_kb('VmRSS')
+    started = time.perf_counter()
+    frames = METHODS[method](data)
+    prepare_seconds = time.perf_counter() - started
+    result = {
+        'prepare_ms': prepare_seconds * 1000,
+        'frames': len(frames),
+        'pixels': sum(frame.size[0] * frame.size[1] for frame in frames),
+        'modes': sorted({frame.mode for frame in frames})
+    }
+    if ocr:
+        import pytesseract
+
+        started = time.perf_counter()
+        result['text'] = '\n'.join(pytesseract.image_to_string(frame) for frame in frames)
+        result['ocr_ms'] = (time.perf_counter() - started) * 1000
+    result['peak_rss_growth_mb'] = (_status_kb('VmHWM') - baseline_kb) / 1024
+    return result
+
+def tesseract_available():
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+def word_recall(expected_lines, text):
+    expected = WORD_RE.findall(' '.join(expected_lines).lower())
+    found = set(WORD_RE.findall(text.lower()))
+    return sum(1 for word in expected if word in found) / len(expected) if expected else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bounded image preprocessing for OCR.")
+    parser.add_argument('--samples', type=int, default=3, help="Resumes rendered per image kind")
+    parser.add_argument('--kinds', default=','.join(IMAGE_KINDS))
+    parser.add_argument('--no-ocr', action='store_true', help="Skip Tesseract even if installed")
+    parser.add_argument('--output', help="Write results JSON here")
+    args = parser.parse_args()
+
+    ocr = not args.no_ocr and tesseract_available()
+    if not ocr:
+        print("Tesseract not run: latency and memory only, no accuracy figures.")
+    rows = load_rows()[:args.samples]
+    context = multiprocessing.get_context('spawn')
+    report = {}
+
+    for kind in [k.strip() for k in args.kinds.split(',') if k.strip()]:
+        documents = [(resume_lines(row), IMAGE_KINDS[kind](resume_lines(row))) for row in rows]
+        report[kind] = {}
+        for method in METHODS:
+            runs = []
+            for lines, data in documents:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(run_once, method, data, ocr).result()
+                if ocr:
+                    result['recall'] = word_recall(lines, result.pop('text'))
+                runs.append(result)
+            summary = {
+                'file_kb': round(sum(len(data) for _, data in documents) / len(documents) / 1024, 1),
+                'prepare_ms': round(sum(run['prepare_ms'] for run in runs) / len(runs), 1),
+                'peak_rss_growth_mb': round(max(run['peak_rss_growth_mb'] for run in runs), 1),
+                'megapixels_to_ocr': round(sum(run['pixels'] for run in runs) / len(runs) / 1e6, 2),
+                'frames': runs[0]['frames'],
+                'modes': runs[0]['modes']
+            }
+            if ocr:
+                summary['ocr_ms'] = round(sum(run['ocr_ms'] for run in runs) / len(runs), 1)
+                summary['word_recall'] = round(sum(run['recall'] for run in runs) / len(runs), 3)
+            report[kind][method] = summary
+
+    print(f"\n{'kind':<16}{'method':<9}{'file KB':>9}{'prep ms':>9}{'peak MB':>9}{'MP->OCR':>9}{'frames':>8}"
+          + (f"{'ocr ms':>9}{'recall':>8}" if ocr else ''))
+    for kind, methods in report.items():
+        for method, summary in methods.items():
+            line = (f"{kind:<16}{method:<9}{summary['file_kb']:>9}{summary['prepare_ms']:>9}"
+                    f"{summary['peak_rss_growth_mb']:>9}{summary['megapixels_to_ocr']:>9}{summary['frames']:>8}")
+            if ocr:
+                line += f"{summary['ocr_ms']:>9}{summary['word_recall']:>8}"
+            print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'ocr': ocr, 'results': report}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
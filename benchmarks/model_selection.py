@@ -0,0 +1,240 @@
+"""
+Model selection with serving cost: cross-validates a grid of TF-IDF sizes x classifiers in
+parallel, then measures what each candidate would cost predictor at request time.
+
+Per candidate: CV accuracy and F1, per-row and batched predict_proba latency, pickle size,
+unpickle time, and per-row latency of the compact NumPy scorer when the model can be exported.
+Candidates on the accuracy/latency Pareto front are marked with '*'.
+
+Usage:
+    python benchmarks/model_selection.py --output selection.json
+    python benchmarks/model_selection.py --features 500 --classifiers sgd --export sgd-500
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import tempfile
+import concurrent.futures
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import StratifiedKFold, cross_validate
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+import compact_model
+from corpus import DATASET_PATH
+
+CLASSIFIERS = {
+    # What train_model.py ships
+    'sgd': lambda: SGDClassifier(loss='log_loss', random_state=42, max_iter=1000, tol=1e-3),
+    'logreg': lambda: LogisticRegression(max_iter=1000),
+    # What technical_breakdown.md describes
+    'random_forest': lambda: RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=1),
+}
+ROW_REPEATS = 200
+BATCH_SIZE = 256
+LOAD_REPEATS = 5
+
+
+def load_dataset(path=DATASET_PATH):
+    # Same preprocessing as train_model.py
+    df = pd.read_csv(path)
+    df['skills'] = df['skills'].fillna('')
+    df['education'] = df['education'].fillna('Unknown')
+    df['experience_years'] = df['experience_years'].fillna(0)
+    return df[['skills', 'experience_years', 'education']], df['is_it_resume']
+
+def build_candidate(max_features, classifier):
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('text', TfidfVectorizer(max_features=max_features), 'skills'),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), ['education'])
+        ],
+        remainder='passthrough'
+    )
+    return Pipeline([
+        ('preprocessor', preprocessor),
+        ('classifier', CLASSIFIERS[classifier]())
+    ])
+
+def candidate_name(max_features, classifier):
+    return f"{classifier}-{max_features or 'all'}"
+
+def evaluate(max_features, classifier, folds):
+    """
+    Pool task: cross-validation plus a fit on all rows. Returns scores and the pickled model.
+    """
+    X, y = load_dataset()
+    pipeline = build_candidate(max_features, classifier)
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    started = time.perf_counter()
+    scores = cross_validate(pipeline, X, y, cv=cv, scoring=('accuracy', 'f1'), n_jobs=1)
+    cv_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    pipeline.fit(X, y)
+    fit_seconds = time.perf_counter() - started
+    return {
+        'name': candidate_name(max_features, classifier),
+        'classifier': classifier,
+        'max_features': max_features,
+        'accuracy': round(float(scores['test_accuracy'].mean()), 4),
+        'accuracy_std': round(float(scores['test_accuracy'].std()), 4),
+        'f1': round(float(scores['test_f1'].mean()), 4),
+        'cv_seconds': round(cv_seconds, 2),
+        'fit_seconds': round(fit_seconds, 3)
+    }, pickle.dumps(pipeline)
+
+def _median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def measure_serving(blob, X):
+    """
+    Request-time cost of one candidate, measured sequentially so candidates don't contend.
+    """
+    load_times = []
+    for _ in range(LOAD_REPEATS):
+        started = time.perf_counter()
+        pipeline = pickle.loads(blob)
+        load_times.append(time.perf_counter() - started)
+
+    rows = [X.iloc[[i % len(X)]] for i in range(ROW_REPEATS)]
+    pipeline.predict_proba(rows[0])  # First call pays one-off allocations
+    row_times = []
+    for row in rows:
+        started = time.perf_counter()
+        pipeline.predict_proba(row)
+        row_times.append(time.perf_counter() - started)
+
+    batch = pd.concat([X] * (BATCH_SIZE // len(X) + 1)).iloc[:BATCH_SIZE]
+    batch_times = []
+    for _ in range(5):
+        started = time.perf_counter()
+        pipeline.predict_proba(batch)
+        batch_times.append(time.perf_counter() - started)
+    batch_seconds = _median(batch_times)
+
+    result = {
+        'pickle_bytes': len(blob),
+        'load_ms': round(_median(load_times) * 1000, 3),
+        'row_p50_ms': round(_percentile(row_times, 0.50) * 1000, 3),
+        'row_p95_ms': round(_percentile(row_times, 0.95) * 1000, 3),
+        'batch_row_ms': round(batch_seconds / BATCH_SIZE * 1000, 4),
+        'batch_rows_per_s': round(BATCH_SIZE / batch_seconds, 1),
+        'compact_row_p50_ms': None
+    }
+
+    # What predictor would actually run for this model, if it has a compact export
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            compact_model.export(pipeline, os.path.join(directory, 'compact'))
+        except compact_model.UnsupportedModel:
+            return result
+        scorer = compact_model.CompactScorer(os.path.join(directory, 'compact'))
+        records = [row.iloc[0].to_dict() for row in rows]
+        compact_times = []
+        for record in records:
+            started = time.perf_counter()
+            scorer.predict_proba([record])
+            compact_times.append(time.perf_counter() - started)
+        result['compact_row_p50_ms'] = round(_percentile(compact_times, 0.50) * 1000, 3)
+    return result
+
+def pareto_front(results):
+    """
+    Names of candidates no other candidate beats on both accuracy and serving latency.
+    """
+    def latency(entry):
+        return entry['compact_row_p50_ms'] or entry['row_p50_ms']
+    front = set()
+    for entry in results:
+        dominated = any(
+            other is not entry
+            and other['accuracy'] >= entry['accuracy'] and latency(other) <= latency(entry)
+            and (other['accuracy'] > entry['accuracy'] or latency(other) < latency(entry))
+            for other in results
+        )
+        if not dominated:
+            front.add(entry['name'])
+    return front
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validate model candidates and measure their serving cost.")
+    parser.add_argument('--features', default='250,500,1000,5000', help="TF-IDF max_features values ('all' = no limit)")
+    parser.add_argument('--classifiers', default=','.join(CLASSIFIERS), help="Subset of: " + ', '.join(CLASSIFIERS))
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Candidates cross-validated in parallel")
+    parser.add_argument('--output', help="Write results JSON here")
+    parser.add_argument('--export', metavar='NAME', help="Save this candidate as resume_it_model.pkl (+ compact export)")
+    args = parser.parse_args()
+
+    features = [None if value.strip() == 'all' else int(value) for value in args.features.split(',') if value.strip()]
+    classifiers = [name.strip() for name in args.classifiers.split(',') if name.strip()]
+    unknown = [name for name in classifiers if name not in CLASSIFIERS]
+    if unknown:
+        parser.error(f"Unknown classifiers: {', '.join(unknown)}")
+    grid = [(max_features, classifier) for classifier in classifiers for max_features in features]
+
+    print(f"Cross-validating {len(grid)} candidates ({args.folds} folds) on {args.jobs} processes...")
+    evaluated = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = [executor.submit(evaluate, max_features, classifier, args.folds) for max_features, classifier in grid]
+        for future in concurrent.futures.as_completed(futures):
+            scores, blob = future.result()
+            print(f"  {scores['name']}: accuracy {scores['accuracy']}, f1 {scores['f1']} ({scores['cv_seconds']}s)")
+            evaluated.append((scores, blob))
+
+    print("Measuring serving cost (sequentially)...")
+    X, _ = load_dataset()
+    results = []
+    blobs = {}
+    for scores, blob in sorted(evaluated, key=lambda item: item[0]['name']):
+        results.append(dict(scores, **measure_serving(blob, X)))
+        blobs[scores['name']] = blob
+
+    front = pareto_front(results)
+    results.sort(key=lambda entry: (-entry['accuracy'], entry['compact_row_p50_ms'] or entry['row_p50_ms']))
+    print(f"\n  {'candidate':<20}{'acc':>8}{'f1':>8}{'row p50':>10}{'row p95':>10}{'compact':>10}"
+          f"{'batch/row':>11}{'pickle KB':>11}{'load ms':>9}")
+    for entry in results:
+        marker = '*' if entry['name'] in front else ' '
+        compact = entry['compact_row_p50_ms'] if entry['compact_row_p50_ms'] is not None else '-'
+        print(f"{marker} {entry['name']:<20}{entry['accuracy']:>8}{entry['f1']:>8}{entry['row_p50_ms']:>10}"
+              f"{entry['row_p95_ms']:>10}{compact:>10}{entry['batch_row_ms']:>11}"
+              f"{entry['pickle_bytes'] / 1024:>11.1f}{entry['load_ms']:>9}")
+    print("\n* = Pareto-optimal on accuracy vs per-row latency (compact scorer where available). Latencies in ms.")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'folds': args.folds, 'pareto_front': sorted(front), 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.export:
+        if args.export not in blobs:
+            print(f"Unknown candidate {args.export}; choose one of: {', '.join(sorted(blobs))}")
+            return 1
+        model_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), compact_model.MODEL_FILENAME)
+        with open(model_path, 'wb') as f:
+            f.write(blobs[args.export])
+        try:
+            compact_model.export(pickle.loads(blobs[args.export]), os.path.join(os.path.dirname(model_path), compact_model.COMPACT_DIRNAME), model_path)
+            print(f"Saved {args.export} to {model_path} with a compact export")
+        except compact_model.UnsupportedModel as e:
+            print(f"Saved {args.export} to {model_path} (no compact export: {e})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Micro-benchmark: single-pass resume_parser vs. the previous parse_resume_text.
+
+Usage: python benchmarks/parser_bench.py [--repeat N]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_parser
+from corpus import resume_texts
+
+
+# --- Reference implementation (previous utils.parse_resume_text), kept for comparison ---
+
+def legacy_extract_candidate_name(text):
+    """
+    Heuristic: The candidate name is usually the first non-empty line at the top of a resume.
+    """
+    section_headers = {'education', 'experience', 'skills', 'summary', 'objective', 'profile', 
+                       'contact', 'projects', 'work', 'achievements', 'certifications', 'references',
+                       'curriculum vitae', 'resume', 'cv', 'phone', 'address', 'email'}
+    
+    lines = text.strip().split('\n')
+    for line in lines[:10]:  # Check first 10 lines
+        line = line.strip()
+        if not line or len(line) < 3:
+            continue
+        if '@' in line or 'http' in line.lower() or 'www.' in line.lower():
+            continue
+        if re.search(r'\d{5,}', line):  # Skip phone numbers
+            continue
+        if line.lower().strip(':').strip() in section_headers:
+            continue
+        words = line.split()
+        if 1 <= len(words) <= 5 and not re.search(r'\d', line):
+            # Clean up: title case, remove special chars
+            name = re.sub(r'[^a-zA-Z\s\.\-]', '', line).strip()
+            if len(name) > 2:
+                return name.title()
+    return None
+
+def legacy_parse_resume_text(text):
+    """
+    Simple heuristic parser to extract features from resume text.
+    """
+    candidate_name = legacy_extract_candidate_name(text)
+    text = text.lower()
+    
+    # 1. Experience
+    experience_years = 0.0
+    exp_match = re.search(r'(\d+(\.\d+)?)(\+)?\s*(year|yr)', text)
+    if exp_match:
+        try:
+            experience_years = float(exp_match.group(1))
+        except ValueError:
+            pass
+            
+    # 2. Education
+    education = "Not Specified" 
+    degrees = [
+        "ph.d", "doctorate", "phd",
+        "m.tech", "m.sc", "m.s", "mca", "mba", "master", "post graduate",
+        "b.tech", "b.e", "b.sc", "b.s", "bca", "bba", "bachelor", "graduate", "engineer",
+        "diploma", "high school", "senior secondary"
+    ]
+    
+    found_degree = False
+    for degree in degrees:
+        if degree in text:
+            for line in text.split('\n'):
+                if degree in line:
+                    education = line.strip()
+                    if len(education) < 100:
+                         found_degree = True
+                         break
+            if found_degree:
+                break
+    
+    if not found_degree and "education" in text:
+        try:
+            post_education = text.split("education", 1)[1]
+            lines = [l.strip() for l in post_education.split('\n') if l.strip()]
+            if lines:
+                for line in lines[:3]:
+                    if len(line) > 3:
+                        education = line
+                        break
+        except:
+            pass
+            
+    education = education.title().replace('B.Tech', 'B.Tech').replace('M.Tech', 'M.Tech')
+    education = re.sub(r'[^\w\s\.,\-\(\)]', '', education)
+        
+    # 3. Skills
+    skills = text
+    if "skills" in text:
+        try:
+            skills_section = text.split("skills", 1)[1]
+            skills = skills_section[:500] 
+        except:
+            pass
+            
+    # 4. Email
+    email = "Not Found"
+    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    email_matches = re.findall(email_pattern, text)
+    if email_matches:
+        email = email_matches[0]
+        
+    # Cleanup Skills
+    for char in ['\n', '\r', '\t', ';', '|']:
+        skills = skills.replace(char, ', ')
+    for bullet in ['➢', '●', '•', '·', '-', '–', '>']:
+         skills = skills.replace(bullet, ', ')
+    skills = re.sub(r'\s+', ' ', skills)
+    skills = re.sub(r',\s*,', ', ', skills)
+    skills = skills.replace(',', ', ')
+    skills = re.sub(r'\s+', ' ', skills)
+    skills = skills.strip(' ,')
+
+    return {
+        "skills": skills,
+        "experience_years": experience_years,
+        "education": education,
+        "email": email,
+        "name": candidate_name
+    }
+
+
+def time_parser(parse, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            parse(text)
+        best = min(best, time.perf_counter() - started)
+    return best / len(texts)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    texts = resume_texts()
+    mismatches = sum(1 for text in texts if legacy_parse_resume_text(text) != resume_parser.parse_resume_text(text))
+    print(f"Corpus: {len(texts)} resumes from resume_dataset.csv, {mismatches} output mismatches")
+
+    legacy = time_parser(legacy_parse_resume_text, texts, args.repeat)
+    current = time_parser(resume_parser.parse_resume_text, texts, args.repeat)
+    print(f"legacy parse_resume_text: {legacy * 1e6:8.1f} us/resume")
+    print(f"resume_parser:            {current * 1e6:8.1f} us/resume")
+    print(f"speedup:                  {legacy / current:8.2f}x")
+    return 1 if mismatches else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Offline stage benchmarks for the resume pipeline.
+
+Builds a synthetic corpus from resume_dataset.csv (text PDFs, layout PDFs, scanned PDFs,
+PNG/JPEG/TIFF images) and measures extract_text_from_file, parse_resume_text and
+get_prediction_data separately: throughput plus p50/p95/p99 latency per stage.
+
+Usage:
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --baseline bench.json --threshold 0.2   # exit 1 on regression
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Synthetic traffic must not reach the production drift rollups or duplicate index, and the
+# predict stage measures the model, not prediction-cache hits on repeated passes
+os.environ['DRIFT_STORE'] = '0'
+os.environ['DEDUP_INDEX'] = '0'
+os.environ['PREDICTION_CACHE'] = '0'
+
+import utils
+import predictor
+from corpus import DOCUMENT_KINDS, build_documents, resume_texts
+
+# Differences below this are noise on any machine, whatever the ratio
+MIN_REGRESSION_MS = 0.05
+
+
+def percentile(ordered, fraction):
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples, errors=0):
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        'count': len(ordered),
+        'errors': errors,
+        'throughput_per_s': round(len(ordered) / total, 2) if total else None,
+        'mean_ms': round(total / len(ordered) * 1000, 3),
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3)
+    }
+
+def measure(fn, items, repeat):
+    """
+    Calls fn(item) for every item, `repeat` times; returns per-call seconds and the last outputs.
+    """
+    samples = []
+    outputs = []
+    for _ in range(repeat):
+        outputs = []
+        for item in items:
+            started = time.perf_counter()
+            outputs.append(fn(item))
+            samples.append(time.perf_counter() - started)
+    return samples, outputs
+
+def bench_extraction(documents, repeat):
+    results = {}
+    for kind, files in documents.items():
+        print(f"  extract_text_from_file [{kind}] x{len(files)}...")
+        samples, texts = measure(lambda doc: utils.extract_text_from_file(doc[1], doc[0]), files, repeat)
+        errors = sum(1 for text in texts if len(text.strip()) < 50)
+        results[f'extract.{kind}'] = summarize(samples, errors)
+    return results
+
+def bench_parse(texts, repeat):
+    print(f"  parse_resume_text x{len(texts)}...")
+    samples, parsed = measure(utils.parse_resume_text, texts, repeat)
+    return {'parse': summarize(samples)}, parsed
+
+def bench_predict(parsed, repeat):
+    print(f"  get_prediction_data x{len(parsed)}...")
+    if predictor.get_scorer() is None and predictor.get_model() is None:
+        print("  (no model available, skipping prediction)")
+        return {}
+    samples, _ = measure(
+        lambda data: predictor.get_prediction_data(data['skills'], data['experience_years'], data['education']),
+        parsed,
+        repeat
+    )
+    return {'predict': summarize(samples)}
+
+def compare(current, baseline, threshold):
+    """
+    Returns a list of regression messages for stages slower than baseline * (1 + threshold).
+    """
+    regressions = []
+    for stage, stats in current.items():
+        reference = baseline.get(stage)
+        if not reference:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            now, before = stats.get(key), reference.get(key)
+            if now is None or before is None:
+                continue
+            if now > before * (1 + threshold) and now - before > MIN_REGRESSION_MS:
+                regressions.append(f"{stage} {key}: {before} -> {now} (+{(now / before - 1) * 100:.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stage benchmarks for the resume pipeline.")
+    parser.add_argument('--kinds', default=','.join(DOCUMENT_KINDS), help="Document kinds to extract")
+    parser.add_argument('--per-kind', type=int, default=20, help="Documents generated per kind")
+    parser.add_argument('--repeat', type=int, default=3, help="Passes over each input set")
+    parser.add_argument('--skip-extract', action='store_true', help="Only benchmark parse and predict")
+    parser.add_argument('--output', help="Write results JSON here")
+    parser.add_argument('--baseline', help="Results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown ratio before failing")
+    args = parser.parse_args()
+
+    results = {}
+    if not args.skip_extract:
+        kinds = [kind.strip() for kind in args.kinds.split(',') if kind.strip()]
+        print(f"Building corpus ({args.per_kind} per kind: {', '.join(kinds)})...")
+        documents = build_documents(kinds, args.per_kind)
+        results.update(bench_extraction(documents, args.repeat))
+
+    texts = resume_texts()
+    parse_results, parsed = bench_parse(texts, args.repeat)
+    results.update(parse_results)
+    results.update(bench_predict(parsed, args.repeat))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'per_kind': args.per_kind,
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+
+    print(f"\n{'stage':<24}{'count':>7}{'err':>5}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, stats in results.items():
+        print(f"{stage:<24}{stats['count']:>7}{stats['errors']:>5}{stats['throughput_per_s'] or 0:>10}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nREGRESSIONS (threshold {args.threshold:.0%}):")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%}).")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+Bulk classification of a directory of resumes, for backfills.
+
+Files are extracted and parsed across a process pool, scored in batches by the predictor and
+appended to a JSONL file. Progress is checkpointed after every batch, so an interrupted run
+(Ctrl+C, crash, reboot) continues where it stopped when started again with the same arguments.
+
+Usage:
+    python classify_dir.py /data/resumes --output results.jsonl [--workers 8] [--batch-size 64]
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import concurrent.futures
+
+# Each pool process already is a dedicated worker; OCR must not fork yet another pool
+os.environ.setdefault('OCR_POOL_MODE', 'inline')
+# A backfill is not live traffic: recorded now, it would look like a distribution shift
+os.environ['DRIFT_STORE'] = '0'
+
+import utils
+import predictor
+
+EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg', '.tif', '.tiff')
+MIN_TEXT_LENGTH = 50
+PROGRESS_INTERVAL = 0.5
+
+
+def _ignore_sigint():
+    # Ctrl+C is handled by the parent, which finishes the current batch before exiting
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def extract_one(root, relpath):
+    """
+    Pool task: extract and parse one file. Returns a predictor record or {'path', 'error'}.
+    """
+    filename = os.path.basename(relpath)
+    try:
+        with open(os.path.join(root, relpath), 'rb') as f:
+            file_content = f.read()
+        text = utils.extract_text_from_file(file_content, filename)
+        if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+            return {'path': relpath, 'filename': filename, 'error': 'Text extraction failed or content too short'}
+        parsed_data = utils.parse_resume_text(text)
+        return {
+            'path': relpath,
+            'skills': parsed_data['skills'],
+            'experience_years': parsed_data['experience_years'],
+            'education': parsed_data['education'],
+            'email': parsed_data['email'],
+            'name': parsed_data.get('name'),
+            'filename': filename
+        }
+    except Exception as e:
+        return {'path': relpath, 'filename': filename, 'error': f"{type(e).__name__}: {e}"}
+
+def find_files(root, extensions, exclude=()):
+    exclude = {os.path.abspath(path) for path in exclude}
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            if name.lower().endswith(extensions) and os.path.abspath(path) not in exclude:
+                found.append(os.path.relpath(path, root))
+    return found
+
+
+class Checkpoint:
+    """
+    Append-only log with one JSON line per committed batch: {"offset": n, "paths": [...]}.
+    `offset` is the output size once that batch was written, so on resume any output past
+    the last committed batch (written, but not checkpointed) is truncated and redone.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        self.offset = 0
+        valid = 0
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from an interrupted write
+                    self.done.update(entry['paths'])
+                    self.offset = entry['offset']
+                    valid += len(line)
+        self._file = open(path, 'a')
+        # Cut the torn line off, or the next commit would be appended to it and lost
+        self._file.truncate(valid)
+
+    def commit(self, offset, paths):
+        self._file.write(json.dumps({'offset': offset, 'paths': paths}) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.done.update(paths)
+        self.offset = offset
+
+    def close(self):
+        self._file.close()
+
+
+class BulkClassifier:
+    def __init__(self, root, output, checkpoint, batch_size):
+        self.root = root
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.pending = []
+        self.written = 0
+        self.errors = 0
+
+        # Drop output from a batch that was written but never checkpointed
+        size = os.path.getsize(output) if os.path.exists(output) else 0
+        if size < checkpoint.offset:
+            # Truncating would pad the file with NUL bytes up to the offset
+            raise ValueError(f"{output} is shorter ({size} bytes) than its checkpoint records "
+                             f"({checkpoint.offset} bytes); it was deleted or edited. Run again with --restart.")
+        self.output = open(output, 'ab')
+        self.output.truncate(checkpoint.offset)
+        self.output.seek(checkpoint.offset)
+
+    def add(self, record):
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        # Taken before writing: if the write or commit is interrupted, close() must not write the
+        # batch again (the next run truncates it back to the last checkpoint and redoes it)
+        pending, self.pending = self.pending, []
+        records = [item for item in pending if 'error' not in item]
+        scored = iter(predictor.get_prediction_batch(records))
+        lines = []
+        for item in pending:
+            if 'error' in item:
+                self.errors += 1
+                result = {'path': item['path'], 'filename': item['filename'], 'error': item['error']}
+            else:
+                # parsed_data only has the truncated display copy; keep the full skills so reviewed
+                # results can be fed to train_incremental.py
+                result = dict(next(scored), path=item['path'], skills=item['skills'])
+            lines.append(json.dumps(result) + '\n')
+        self.output.write(''.join(lines).encode('utf-8'))
+        self.output.flush()
+        os.fsync(self.output.fileno())
+        self.checkpoint.commit(self.output.tell(), [item['path'] for item in pending])
+        self.written += len(pending)
+
+    def close(self):
+        self.flush()
+        self.output.close()
+        self.checkpoint.close()
+
+
+def print_progress(done, total, errors, started, final=False):
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else 0.0
+    sys.stderr.write(f"\r{done}/{total} files  {rate:.1f} files/s  errors {errors}  "
+                     f"elapsed {elapsed:.0f}s  eta {eta:.0f}s   ")
+    if final:
+        sys.stderr.write('\n')
+    sys.stderr.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify every resume in a directory (resumable).")
+    parser.add_argument('directory', help="Directory to walk recursively")
+    parser.add_argument('--output', default='classified.jsonl', help="JSONL results file (appended to)")
+    parser.add_argument('--checkpoint', help="Progress file (default: <output>.checkpoint)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Extraction processes")
+    parser.add_argument('--batch-size', type=int, default=64, help="Records per scoring call and checkpoint")
+    parser.add_argument('--extensions', default=','.join(EXTENSIONS), help="Comma-separated file extensions")
+    parser.add_argument('--restart', action='store_true', help="Ignore the checkpoint and start over")
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.directory)
+    checkpoint_path = args.checkpoint or args.output + '.checkpoint'
+    if args.restart:
+        for path in (args.output, checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    extensions = tuple(ext.strip().lower() for ext in args.extensions.split(',') if ext.strip())
+    files = find_files(root, extensions, exclude=(args.output, checkpoint_path))
+    checkpoint = Checkpoint(checkpoint_path)
+    todo = [path for path in files if path not in checkpoint.done]
+    print(f"{len(files)} files found, {len(files) - len(todo)} already done, {len(todo)} to classify "
+          f"with {args.workers} workers.")
+    if not todo:
+        checkpoint.close()
+        return 0
+
+    if predictor.get_scorer() is None and predictor.get_model() is None:
+        print("No model available; train one with train_model.py first.")
+        checkpoint.close()
+        return 1
+
+    try:
+        classifier = BulkClassifier(root, args.output, checkpoint, args.batch_size)
+    except ValueError as e:
+        print(f"Error: {e}")
+        checkpoint.close()
+        return 1
+    started = time.perf_counter()
+    last_progress = 0.0
+    done = 0
+    interrupted = False
+    # Bounded window of in-flight files keeps memory flat and lets slow (OCR) files overlap fast ones
+    window = max(1, args.workers) * 4
+    remaining = iter(todo)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers, initializer=_ignore_sigint) as executor:
+        in_flight = set()
+        try:
+            while True:
+                for relpath in remaining:
+                    in_flight.add(executor.submit(extract_one, root, relpath))
+                    if len(in_flight) >= window:
+                        break
+                if not in_flight:
+                    break
+                finished, in_flight = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    classifier.add(future.result())
+                    done += 1
+                now = time.perf_counter()
+                if now - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = now
+                    print_progress(done, len(todo), classifier.errors, started)
+        except KeyboardInterrupt:
+            interrupted = True
+            for future in in_flight:
+                future.cancel()
+            # Keep whatever already finished; unfinished files are redone on the next run
+            for future in in_flight:
+                if future.done() and not future.cancelled():
+                    classifier.add(future.result())
+                    done += 1
+        finally:
+            classifier.close()
+
+    print_progress(done, len(todo), classifier.errors, started, final=True)
+    if interrupted:
+        print(f"Interrupted: {classifier.written} results saved to {args.output}. Run again to resume.")
+        return 130
+    print(f"Done: {classifier.written} results ({classifier.errors} errors) appended to {args.output}.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Compact export of the trained sklearn pipeline for fast request-time scoring.
+
+The artifact is a directory holding meta.json (feature layout, TF-IDF terms, one-hot
+categories, classes) and .npy arrays (IDF weights, coefficients, intercept) that are
+memory-mapped on load, so forked workers share the pages. Scoring needs only NumPy.
+
+Usage:
+    python compact_model.py [resume_it_model.pkl] [resume_it_model_compact]
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import numpy as np
+
+FORMAT_VERSION = 1
+MODEL_FILENAME = 'resume_it_model.pkl'
+COMPACT_DIRNAME = 'resume_it_model_compact'
+
+# TfidfVectorizer settings the scorer reproduces; anything else is exported as unsupported
+_TFIDF_DEFAULTS = {
+    'analyzer': 'word',
+    'ngram_range': (1, 1),
+    'strip_accents': None,
+    'preprocessor': None,
+    'tokenizer': None,
+    'stop_words': None,
+    'binary': False,
+    'use_idf': True
+}
+
+
+class UnsupportedModel(Exception):
+    pass
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _column_names(columns, feature_names_in):
+    if isinstance(columns, str):
+        return [columns]
+    names = []
+    for column in columns:
+        if isinstance(column, (int, np.integer)):
+            if feature_names_in is None:
+                raise UnsupportedModel("Positional columns without feature names")
+            column = feature_names_in[column]
+        names.append(str(column))
+    return names
+
+def _is_passthrough(transformer):
+    if transformer == 'passthrough':
+        return True
+    # sklearn >= 1.5 wraps the fitted remainder in an identity FunctionTransformer
+    return type(transformer).__name__ == 'FunctionTransformer' and transformer.func is None
+
+def _describe_blocks(preprocessor, arrays):
+    feature_names_in = getattr(preprocessor, 'feature_names_in_', None)
+    blocks = []
+    offset = 0
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == 'drop':
+            continue
+        names = _column_names(columns, feature_names_in)
+        if not names:
+            continue
+        kind = type(transformer).__name__
+        if kind == 'TfidfVectorizer':
+            params = transformer.get_params()
+            for key, expected in _TFIDF_DEFAULTS.items():
+                if params[key] != expected:
+                    raise UnsupportedModel(f"TfidfVectorizer {key}={params[key]!r}")
+            terms = [None] * len(transformer.vocabulary_)
+            for term, index in transformer.vocabulary_.items():
+                terms[index] = term
+            arrays[f'idf_{name}'] = np.asarray(transformer.idf_, dtype=np.float64)
+            blocks.append({
+                'type': 'tfidf', 'name': name, 'column': names[0], 'offset': offset, 'size': len(terms),
+                'terms': terms, 'lowercase': params['lowercase'], 'token_pattern': params['token_pattern'],
+                'norm': params['norm'], 'sublinear_tf': params['sublinear_tf']
+            })
+            offset += len(terms)
+        elif kind == 'OneHotEncoder':
+            if transformer.handle_unknown != 'ignore' or transformer.drop is not None or len(names) != 1:
+                raise UnsupportedModel("OneHotEncoder must be single-column with handle_unknown='ignore' and no drop")
+            categories = [str(category) for category in transformer.categories_[0]]
+            blocks.append({'type': 'onehot', 'name': name, 'column': names[0], 'offset': offset,
+                           'size': len(categories), 'categories': categories})
+            offset += len(categories)
+        elif _is_passthrough(transformer):
+            for column in names:
+                blocks.append({'type': 'numeric', 'name': name, 'column': column, 'offset': offset, 'size': 1})
+                offset += 1
+        else:
+            raise UnsupportedModel(f"Transformer {name} ({kind})")
+    return blocks, offset
+
+def export(pipeline, directory, model_path=None):
+    """
+    Writes the compact artifact for a Pipeline(preprocessor=ColumnTransformer, classifier=linear
+    log-loss model). Raises UnsupportedModel for anything the NumPy scorer can't reproduce.
+    """
+    steps = dict(pipeline.steps) if hasattr(pipeline, 'steps') else {}
+    preprocessor = steps.get('preprocessor')
+    classifier = steps.get('classifier')
+    if preprocessor is None or classifier is None or not hasattr(preprocessor, 'transformers_'):
+        raise UnsupportedModel("Expected a fitted Pipeline with 'preprocessor' and 'classifier' steps")
+    if not hasattr(classifier, 'coef_'):
+        raise UnsupportedModel(f"{type(classifier).__name__} is not a linear model")
+    is_sgd_log = type(classifier).__name__ == 'SGDClassifier' and classifier.loss == 'log_loss'
+    is_binary_logistic = type(classifier).__name__ == 'LogisticRegression' and len(classifier.classes_) == 2
+    if not (is_sgd_log or is_binary_logistic):
+        raise UnsupportedModel(f"{type(classifier).__name__} has no logistic predict_proba")
+
+    arrays = {
+        'coef': np.asarray(classifier.coef_, dtype=np.float64),
+        'intercept': np.asarray(classifier.intercept_, dtype=np.float64)
+    }
+    blocks, n_features = _describe_blocks(preprocessor, arrays)
+    if arrays['coef'].shape[1] != n_features:
+        raise UnsupportedModel(f"Classifier expects {arrays['coef'].shape[1]} features, layout has {n_features}")
+
+    meta = {
+        'format': FORMAT_VERSION,
+        'classes': [c.item() if hasattr(c, 'item') else c for c in classifier.classes_],
+        'n_features': n_features,
+        'blocks': blocks,
+        'model_sha256': file_sha256(model_path) if model_path else None
+    }
+
+    # Write into a sibling temp dir and swap it in, so readers never see a half-written artifact
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f'{name}.npy'), array)
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    if os.path.isdir(directory):
+        old_dir = f"{directory}.old-{os.getpid()}"
+        os.replace(directory, old_dir)
+        os.replace(tmp_dir, directory)
+        for name in os.listdir(old_dir):
+            os.remove(os.path.join(old_dir, name))
+        os.rmdir(old_dir)
+    else:
+        os.replace(tmp_dir, directory)
+    return meta
+
+
+class CompactScorer:
+    """
+    NumPy re-implementation of the exported pipeline's predict_proba: TF-IDF (raw counts x IDF,
+    L2-normalised), one-hot education, passthrough experience, then the logistic link.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('format') != FORMAT_VERSION:
+            raise UnsupportedModel(f"Compact model format {meta.get('format')} != {FORMAT_VERSION}")
+        self.directory = directory
+        self.meta = meta
+        self.classes = meta['classes']
+        self.coef = np.load(os.path.join(directory, 'coef.npy'), mmap_mode='r')
+        self.intercept = np.load(os.path.join(directory, 'intercept.npy'), mmap_mode='r')
+        self.blocks = []
+        for block in meta['blocks']:
+            block = dict(block)
+            if block['type'] == 'tfidf':
+                block['vocabulary'] = {term: index for index, term in enumerate(block.pop('terms'))}
+                block['token_re'] = re.compile(block['token_pattern'])
+                block['idf'] = np.load(os.path.join(directory, f"idf_{block['name']}.npy"), mmap_mode='r')
+            elif block['type'] == 'onehot':
+                block['index'] = {category: i for i, category in enumerate(block.pop('categories'))}
+            self.blocks.append(block)
+
+    @classmethod
+    def load(cls, directory, model_path=None):
+        """
+        Returns a scorer, or None when the artifact is missing or was exported from a
+        different model file than the one at model_path.
+        """
+        if not os.path.isfile(os.path.join(directory, 'meta.json')):
+            return None
+        scorer = cls(directory)
+        expected = scorer.meta.get('model_sha256')
+        if model_path and expected and os.path.isfile(model_path) and file_sha256(model_path) != expected:
+            print(f"Compact model in {directory} is stale (exported from a different {os.path.basename(model_path)}), ignoring it.")
+            return None
+        return scorer
+
+    def _tfidf(self, block, values, decision):
+        vocabulary = block['vocabulary']
+        token_re = block['token_re']
+        rows, columns, counts = [], [], []
+        for row, text in enumerate(values):
+            text = str(text)
+            if block['lowercase']:
+                text = text.lower()
+            term_counts = {}
+            for token in token_re.findall(text):
+                index = vocabulary.get(token)
+                if index is not None:
+                    term_counts[index] = term_counts.get(index, 0) + 1
+            rows.extend([row] * len(term_counts))
+            columns.extend(term_counts.keys())
+            counts.extend(term_counts.values())
+        if not columns:
+            return
+
+        rows = np.asarray(rows, dtype=np.intp)
+        columns = np.asarray(columns, dtype=np.intp)
+        tf = np.asarray(counts, dtype=np.float64)
+        if block['sublinear_tf']:
+            tf = np.log(tf) + 1
+        weights = tf * block['idf'][columns]
+        n_rows = len(values)
+        if block['norm'] == 'l2':
+            norms = np.sqrt(np.bincount(rows, weights * weights, minlength=n_rows))
+            weights = weights / norms[rows]
+        elif block['norm'] == 'l1':
+            norms = np.bincount(rows, np.abs(weights), minlength=n_rows)
+            weights = weights / norms[rows]
+        coef = self.coef[:, block['offset'] + columns]
+        for k in range(coef.shape[0]):
+            decision[:, k] += np.bincount(rows, weights * coef[k], minlength=n_rows)
+
+    def decision_function(self, records):
+        decision = np.tile(np.asarray(self.intercept, dtype=np.float64), (len(records), 1))
+        for block in self.blocks:
+            values = [record[block['column']] for record in records]
+            if block['type'] == 'tfidf':
+                self._tfidf(block, values, decision)
+            elif block['type'] == 'onehot':
+                index = block['index']
+                for row, value in enumerate(values):
+                    position = index.get(str(value))
+                    if position is not None:
+                        decision[row] += self.coef[:, block['offset'] + position]
+            else:
+                numeric = np.asarray([float(value) for value in values], dtype=np.float64)
+                decision += numeric[:, None] * self.coef[:, block['offset']]
+        return decision
+
+    def predict_proba(self, records):
+        """
+        records: dicts keyed by the training column names. Returns an (n, n_classes) array
+        matching sklearn's predict_proba for the exported model.
+        """
+        decision = self.decision_function(records)
+        positive = 1.0 / (1.0 + np.exp(-decision))
+        if positive.shape[1] == 1:
+            return np.hstack([1.0 - positive, positive])
+        # One-vs-rest normalisation, as SGDClassifier does for multiclass log loss
+        return positive / positive.sum(axis=1, keepdims=True)
+
+
+if __name__ == '__main__':
+    import pickle
+    from model_def import LiteModel  # Required for pickle loading
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else MODEL_FILENAME
+    directory = sys.argv[2] if len(sys.argv) > 2 else COMPACT_DIRNAME
+    with open(model_path, 'rb') as f:
+        pipeline = pickle.load(f)
+    try:
+        meta = export(pipeline, directory, model_path)
+    except UnsupportedModel as e:
+        print(f"Cannot export compact model: {e}")
+        sys.exit(1)
+    print(f"Compact model written to {directory} ({meta['n_features']} features)")
@@ -0,0 +1,272 @@
+"""
+Near-duplicate detection for extracted resume text.
+
+Each text gets a MinHash signature over its word shingles. Signatures are indexed with LSH
+bands in a local SQLite database that every worker on the host shares, and it survives
+restarts. When a lightly edited re-upload matches a resume that was already classified,
+the stored result is returned (with a `duplicate_of` reference). The resume is then neither
+scored nor delivered to n8n again.
+"""
+import os
+import re
+import json
+import time
+import zlib
+import hashlib
+import sqlite3
+import threading
+
+# Configuration
+DEDUP_ENABLED = os.environ.get('DEDUP_INDEX', '1') != '0'
+DEDUP_DIR = os.environ.get('DEDUP_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'dedup'))
+# Estimated Jaccard similarity of word shingles at which two texts count as the same resume
+DEDUP_THRESHOLD = float(os.environ.get('DEDUP_THRESHOLD', 0.85))
+DEDUP_RETENTION_SECONDS = float(os.environ.get('DEDUP_RETENTION_SECONDS', 90 * 24 * 3600))
+
+# Bump when the signature parameters change; old databases are then simply not opened
+SIGNATURE_VERSION = 1
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs above ~0.7 similarity share at least one band almost surely,
+# pairs below ~0.4 almost never do
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    model_version TEXT NOT NULL,
+    identity TEXT NOT NULL,
+    filename TEXT,
+    signature BLOB NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    key INTEGER NOT NULL,
+    entry_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bands_key ON bands (key);
+CREATE INDEX IF NOT EXISTS bands_entry ON bands (entry_id);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created_at);
+"""
+
+
+def candidate_identity(email, name=None):
+    """
+    Who a resume belongs to: the email address, else the parsed name, else ''. Matches are
+    only made within one identity, because templated resumes of different people can share
+    most of their shingles.
+    """
+    if email and '@' in email:
+        return email.strip().lower()
+    if name:
+        return ' '.join(WORD_RE.findall(name.lower()))
+    return ''
+
+def shingles(text):
+    """
+    Hashed word 3-grams of the normalized text (lowercase, alphanumeric words only), so
+    layout, punctuation and OCR whitespace differences don't matter.
+    """
+    words = WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_WORDS]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+_permutations = None
+
+def _get_permutations():
+    global _permutations
+    if _permutations is None:
+        import numpy as np  # Deferred like the compact scorer: keeps app import fast
+
+        # Fixed seed: signatures must agree across processes and restarts. a and b stay below
+        # 2^32 so that signature() can compute a * x + b in uint64 without overflow
+        rng = np.random.RandomState(1)
+        _permutations = (
+            rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64),
+            rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+        )
+    return _permutations
+
+def signature(text):
+    """
+    MinHash signature (NUM_PERM uint32 values), or None for texts without words.
+    """
+    import numpy as np
+
+    hashed = shingles(text)
+    if not hashed:
+        return None
+    perm_a, perm_b = _get_permutations()
+    values = np.fromiter(hashed, dtype=np.uint64, count=len(hashed))
+    # (a * x + b) mod p for every shingle x and permutation (a, b), minimum per permutation.
+    # Exact in uint64, without wraparound: x (crc32) and a, b are all below 2^32, so
+    # a * x + b <= (2^32 - 1)^2 + 2^32 - 1 < 2^64, and % p sees the true value
+    permuted = (np.outer(values, perm_a) + perm_b) % np.uint64(MERSENNE_PRIME) & np.uint64(MAX_HASH)
+    return permuted.min(axis=0).astype(np.uint32)
+
+def band_keys(sig):
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8, salt=bytes([band]))
+        keys.append(int.from_bytes(digest.digest(), 'little', signed=True))
+    return keys
+
+
+class DuplicateIndex:
+    """
+    Persistent MinHash LSH index of classified resumes. Safe across threads and processes:
+    every thread has its own connection and the database runs in WAL mode. Entries are
+    tagged with the model version, so results of a replaced model are never returned, and
+    with the candidate identity, so only resubmissions by the same candidate match.
+    """
+
+    def __init__(self, index_dir=DEDUP_DIR, threshold=DEDUP_THRESHOLD):
+        self.db_path = os.path.join(index_dir, f'minhash-v{SIGNATURE_VERSION}.db')
+        self.threshold = threshold
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self.lookups = 0
+        self.hits = 0
+        self.lookup_seconds = 0.0
+        os.makedirs(index_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        # SQLite connections must not cross a fork, so key them by pid too
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def lookup(self, sig, model_version, identity):
+        """
+        Returns the most similar stored resume of this identity at or above the threshold as
+        {'id', 'filename', 'similarity', 'result', 'created_at'}, or None.
+        """
+        import numpy as np
+
+        started = time.perf_counter()
+        keys = band_keys(sig)
+        rows = self._connect().execute(
+            f"SELECT DISTINCT e.id, e.filename, e.signature, e.result, e.created_at FROM bands b "
+            f"JOIN entries e ON e.id = b.entry_id "
+            f"WHERE b.key IN ({','.join('?' * len(keys))}) AND e.model_version = ? AND e.identity = ?",
+            keys + [model_version, identity]
+        ).fetchall()
+        best = None
+        for entry_id, filename, stored, result, created_at in rows:
+            similarity = float(np.count_nonzero(np.frombuffer(stored, dtype=np.uint32) == sig)) / NUM_PERM
+            if similarity >= self.threshold and (best is None or similarity > best['similarity']):
+                best = {'id': entry_id, 'filename': filename, 'similarity': round(similarity, 3),
+                        'result': result, 'created_at': created_at}
+        if best is not None:
+            best['result'] = json.loads(best['result'])
+        with self._lock:
+            self.lookups += 1
+            self.hits += best is not None
+            self.lookup_seconds += time.perf_counter() - started
+        return best
+
+    def add(self, sig, model_version, identity, filename, result):
+        """
+        Stores a classified resume. Returns the new entry id.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.execute(
+                'INSERT INTO entries (model_version, identity, filename, signature, result, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (model_version, identity, filename, sig.tobytes(), json.dumps(result), time.time())
+            )
+            entry_id = cursor.lastrowid
+            conn.executemany('INSERT INTO bands (key, entry_id) VALUES (?, ?)', [(key, entry_id) for key in band_keys(sig)])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self._maybe_purge()
+        return entry_id
+
+    def purge(self, older_than=DEDUP_RETENTION_SECONDS, batch_size=500):
+        """
+        Forgets resumes indexed longer ago than the retention period. Returns the number removed.
+        Deletes in short transactions of batch_size entries, so writers are never held up long.
+        """
+        conn = self._connect()
+        cutoff = time.time() - older_than
+        removed = 0
+        while True:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                ids = [row[0] for row in conn.execute(
+                    'SELECT id FROM entries WHERE created_at < ? LIMIT ?', (cutoff, batch_size)
+                )]
+                if ids:
+                    placeholders = ','.join('?' * len(ids))
+                    conn.execute(f'DELETE FROM bands WHERE entry_id IN ({placeholders})', ids)
+                    conn.execute(f'DELETE FROM entries WHERE id IN ({placeholders})', ids)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            removed += len(ids)
+            if len(ids) < batch_size:
+                return removed
+
+    def _maybe_purge(self):
+        now = time.time()
+        with self._lock:
+            if now - self._last_purge < 3600:
+                return
+            self._last_purge = now
+        # Off the request path: the first add() of every worker would otherwise pay for it
+        threading.Thread(target=self._purge_quietly, name='dedup-purge', daemon=True).start()
+
+    def _purge_quietly(self):
+        try:
+            removed = self.purge()
+            if removed:
+                print(f"Purged {removed} duplicate-index entries")
+        except sqlite3.OperationalError:
+            pass
+
+    def stats(self):
+        entries = self._connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        with self._lock:
+            return {
+                'entries': entries,
+                'lookups': self.lookups,
+                'duplicates': self.hits,
+                'hit_ratio': round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                'avg_lookup_ms': round(self.lookup_seconds / self.lookups * 1000, 3) if self.lookups else 0.0,
+                'threshold': self.threshold,
+                'enabled': DEDUP_ENABLED
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DuplicateIndex()
+    return _index
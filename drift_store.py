@@ -0,0 +1,291 @@
+"""
+Persistent, cross-worker prediction rollups for drift monitoring.
+
+Every scored resume is counted into a per-minute and a per-hour bucket: count, IT count,
+confidence sum and a confidence histogram (metrics.CONFIDENCE_BUCKETS). Workers accumulate
+buckets in memory; a background thread upserts them every DRIFT_FLUSH_INTERVAL seconds into
+a SQLite database in WAL mode, shared by every process on the host and kept across restarts.
+A window query is a primary-key range scan over its buckets, so it costs O(window), never
+O(history).
+
+Only live traffic belongs here: backfills and benchmarks run with DRIFT_STORE=0.
+"""
+import os
+import math
+import time
+import bisect
+import atexit
+import sqlite3
+import threading
+
+import metrics
+
+# Configuration
+DRIFT_ENABLED = os.environ.get('DRIFT_STORE', '1') != '0'
+DRIFT_DIR = os.environ.get('DRIFT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'drift'))
+# Unflushed counts of a crashed worker are lost; at most this many seconds' worth
+DRIFT_FLUSH_INTERVAL = float(os.environ.get('DRIFT_FLUSH_INTERVAL', 5))
+DRIFT_MINUTE_RETENTION_HOURS = float(os.environ.get('DRIFT_MINUTE_RETENTION_HOURS', 48))
+DRIFT_HOUR_RETENTION_DAYS = float(os.environ.get('DRIFT_HOUR_RETENTION_DAYS', 90))
+
+MINUTE = 60
+HOUR = 3600
+# Windows up to this long are answered from minute buckets, longer ones from hour buckets
+MINUTE_WINDOW_LIMIT = 6 * HOUR
+BUCKET_EDGES = metrics.CONFIDENCE_BUCKETS
+HIST_COLUMNS = [f'h{i}' for i in range(len(BUCKET_EDGES))]
+VALUE_COLUMNS = ['count', 'it_count', 'confidence_sum'] + HIST_COLUMNS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    it_count INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    {', '.join(f'{column} INTEGER NOT NULL' for column in HIST_COLUMNS)},
+    PRIMARY KEY (resolution, bucket)
+) WITHOUT ROWID;
+"""
+
+UPSERT = (
+    f"INSERT INTO rollups (resolution, bucket, {', '.join(VALUE_COLUMNS)}) "
+    f"VALUES (?, ?, {', '.join('?' * len(VALUE_COLUMNS))}) "
+    f"ON CONFLICT (resolution, bucket) DO UPDATE SET "
+    + ', '.join(f'{column} = {column} + excluded.{column}' for column in VALUE_COLUMNS)
+)
+
+
+def parse_window(value, default=HOUR):
+    """
+    '90' (seconds), '15m', '6h' or '7d' -> seconds. Raises ValueError.
+    """
+    if not value:
+        return default
+    units = {'s': 1, 'm': MINUTE, 'h': HOUR, 'd': 24 * HOUR}
+    value = value.strip().lower()
+    if value[-1] in units:
+        seconds = float(value[:-1]) * units[value[-1]]
+    else:
+        seconds = float(value)
+    if seconds <= 0:
+        raise ValueError("Window must be positive")
+    return int(seconds)
+
+def _histogram_labels():
+    labels, lower = [], 0.0
+    for upper in BUCKET_EDGES:
+        labels.append(f'{lower:g}-{upper:g}')
+        lower = upper
+    return labels
+
+def psi(expected, actual):
+    """
+    Population stability index between two histograms (0 = identical; > 0.2 is usually
+    read as a significant shift).
+    """
+    expected_total, actual_total = sum(expected), sum(actual)
+    if not expected_total or not actual_total:
+        return None
+    value = 0.0
+    for e, a in zip(expected, actual):
+        # Smooth empty bins so the log stays finite
+        p = max(e / expected_total, 1e-4)
+        q = max(a / actual_total, 1e-4)
+        value += (q - p) * math.log(q / p)
+    return round(value, 4)
+
+
+class DriftStore:
+    """
+    Minute and hour rollups of predictions, shared through SQLite. Safe across threads and
+    processes: every thread has its own connection and writes are batched upserts.
+    """
+
+    def __init__(self, store_dir=DRIFT_DIR):
+        self.db_path = os.path.join(store_dir, 'drift.db')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._pid = None
+        self._last_purge = 0.0
+        self.flushes = 0
+        self.flush_errors = 0
+        os.makedirs(store_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        # SQLite connections must not cross a fork, so key them by pid too
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _ensure_flusher(self):
+        # Threads don't survive fork: start (again) in whichever process is recording. Counts
+        # inherited from the parent are the parent's to flush, not this child's.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._pending = {}
+        if DRIFT_FLUSH_INTERVAL > 0:
+            threading.Thread(target=self._flush_periodically, name='drift-flush', daemon=True).start()
+
+    def _flush_periodically(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(DRIFT_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Drift store flush failed: {e}")
+
+    def record(self, scored, now=None):
+        """
+        Counts [(class_id, confidence)] predictions into the current minute and hour buckets.
+        """
+        if not scored:
+            return
+        self._ensure_flusher()
+        now = time.time() if now is None else now
+        keys = [(MINUTE, int(now // MINUTE) * MINUTE), (HOUR, int(now // HOUR) * HOUR)]
+        with self._lock:
+            rows = [self._pending.setdefault(key, [0, 0, 0.0] + [0] * len(HIST_COLUMNS)) for key in keys]
+            for prediction, confidence in scored:
+                column = 3 + min(bisect.bisect_left(BUCKET_EDGES, confidence), len(HIST_COLUMNS) - 1)
+                for row in rows:
+                    row[0] += 1
+                    row[1] += prediction == 1
+                    row[2] += confidence
+                    row[column] += 1
+        if DRIFT_FLUSH_INTERVAL <= 0:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._pid != os.getpid():
+                return  # Inherited across a fork: the parent flushes these
+        if not pending:
+            return
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(UPSERT, [key + tuple(values) for key, values in pending.items()])
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            # Keep the counts for the next attempt rather than dropping them
+            print(f"Drift store flush failed: {e}")
+            with self._lock:
+                self.flush_errors += 1
+                for key, values in pending.items():
+                    row = self._pending.setdefault(key, [0, 0, 0.0] + [0] * len(HIST_COLUMNS))
+                    for i, value in enumerate(values):
+                        row[i] += value
+            return
+        with self._lock:
+            self.flushes += 1
+        self._maybe_purge()
+
+    def _maybe_purge(self):
+        now = time.time()
+        if now - self._last_purge < HOUR:
+            return
+        self._last_purge = now
+        try:
+            self._connect().execute(
+                'DELETE FROM rollups WHERE (resolution = ? AND bucket < ?) OR (resolution = ? AND bucket < ?)',
+                (MINUTE, now - DRIFT_MINUTE_RETENTION_HOURS * HOUR, HOUR, now - DRIFT_HOUR_RETENTION_DAYS * 24 * HOUR)
+            )
+        except sqlite3.OperationalError:
+            pass
+
+    def _buckets(self, resolution, start, end):
+        return self._connect().execute(
+            f"SELECT bucket, {', '.join(VALUE_COLUMNS)} FROM rollups "
+            f"WHERE resolution = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+            (resolution, start, end)
+        ).fetchall()
+
+    @staticmethod
+    def _summarize(rows):
+        totals = [0, 0, 0.0] + [0] * len(HIST_COLUMNS)
+        for row in rows:
+            for i, value in enumerate(row[1:]):
+                totals[i] += value
+        count, it_count, confidence_sum = totals[:3]
+        return {
+            'count': count,
+            'it_ratio': round(it_count / count, 4) if count else None,
+            'avg_confidence': round(confidence_sum / count, 4) if count else None,
+            'confidence_histogram': dict(zip(_histogram_labels(), totals[3:]))
+        }
+
+    def window(self, seconds, resolution=None, baseline_seconds=None, now=None):
+        """
+        Rollup of the last `seconds`, a per-bucket series, and a comparison with the
+        `baseline_seconds` before it (default: 24x the window, from hour buckets).
+        """
+        self.flush()
+        now = time.time() if now is None else now
+        if resolution is None:
+            resolution = MINUTE if seconds <= MINUTE_WINDOW_LIMIT else HOUR
+        end = int(now // resolution) * resolution + resolution  # Includes the current bucket
+        start = end - max(resolution, int(math.ceil(seconds / resolution)) * resolution)
+        rows = self._buckets(resolution, start, end)
+        result = dict(self._summarize(rows), window_seconds=end - start, resolution=resolution)
+        result['series'] = [
+            {
+                'start': row[0],
+                'count': row[1],
+                'it_ratio': round(row[2] / row[1], 4) if row[1] else None,
+                'avg_confidence': round(row[3] / row[1], 4) if row[1] else None
+            }
+            for row in rows
+        ]
+
+        baseline_seconds = baseline_seconds or 24 * (end - start)
+        baseline_resolution = HOUR if baseline_seconds >= HOUR else MINUTE
+        baseline_end = start - start % baseline_resolution
+        baseline_rows = self._buckets(baseline_resolution, baseline_end - baseline_seconds, baseline_end)
+        baseline = self._summarize(baseline_rows)
+        baseline['window_seconds'] = baseline_seconds
+        baseline['psi'] = psi(list(baseline['confidence_histogram'].values()), list(result['confidence_histogram'].values()))
+        if baseline['it_ratio'] is not None and result['it_ratio'] is not None:
+            baseline['it_ratio_delta'] = round(result['it_ratio'] - baseline['it_ratio'], 4)
+        result['baseline'] = baseline
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending_buckets': len(self._pending),
+                'flushes': self.flushes,
+                'flush_errors': self.flush_errors,
+                'enabled': DRIFT_ENABLED
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DriftStore()
+                atexit.register(_store.flush)
+    return _store
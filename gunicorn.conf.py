@@ -0,0 +1,72 @@
+"""
+Production serving: pre-forked gunicorn workers sharing one preloaded model.
+
+Single pool (everything on :5003):
+    gunicorn -c gunicorn.conf.py
+
+Split pools, so OCR-heavy uploads never occupy the workers serving fast JSON calls
+(route /predict_pdf and /predict_batch_pdf to :5004 in the reverse proxy; anything that
+still reaches the fast pool is redirected there with a 307):
+    SERVING_ROLE=heavy gunicorn -c gunicorn.conf.py
+    SERVING_ROLE=fast HEAVY_POOL_URL=http://127.0.0.1:5004 gunicorn -c gunicorn.conf.py
+"""
+import gc
+import os
+import multiprocessing
+
+CPU_COUNT = multiprocessing.cpu_count()
+SERVING_ROLE = os.environ.get('SERVING_ROLE', 'all')
+
+wsgi_app = 'app:create_app()'
+
+# Import the app, the model and a dummy inference in the master; workers fork afterwards
+# and share those pages copy-on-write instead of each loading their own copy
+preload_app = True
+os.environ.setdefault('WARMUP_MODE', 'blocking')
+# Job worker threads must not start in the master; post_fork starts them per worker
+os.environ.setdefault('JOB_AUTOSTART', '0')
+
+worker_class = 'gthread'
+if SERVING_ROLE == 'heavy':
+    # Threads mostly wait on the shared OCR process pool, so fewer processes, more threads
+    bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5004')
+    workers = int(os.environ.get('GUNICORN_WORKERS', max(2, CPU_COUNT // 2)))
+    threads = int(os.environ.get('GUNICORN_THREADS', 8))
+    timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
+else:
+    # Scoring is CPU-bound NumPy/Python: one process per core, a few threads for I/O waits
+    bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5003')
+    workers = int(os.environ.get('GUNICORN_WORKERS', CPU_COUNT))
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
+    timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300 if SERVING_ROLE == 'all' else 30))
+
+# Every worker owns an OCR pool; split the cores between them instead of cores x workers Tesseracts
+os.environ.setdefault('OCR_WORKERS', str(max(1, CPU_COUNT // workers)))
+
+# Admission control (per worker): uploads in progress plus those waiting for a slot never hold
+# every thread, so /predict, /stats and health probes are still served while uploads pile up
+heavy_threads = threads - 1 if SERVING_ROLE == 'heavy' else threads // 2
+os.environ.setdefault('ADMISSION_HEAVY_CONCURRENCY', str(max(1, (heavy_threads + 1) // 2)))
+os.environ.setdefault('ADMISSION_HEAVY_QUEUE', str(max(0, heavy_threads - (heavy_threads + 1) // 2)))
+
+graceful_timeout = 30
+keepalive = 5
+# Heartbeat files on tmpfs so a slow disk can't make the master kill healthy workers
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+
+
+def when_ready(server):
+    # Move everything loaded so far into a permanent generation: the cyclic GC then never
+    # writes to those object headers, so forked workers keep sharing the pages
+    gc.freeze()
+    server.log.info(f"Serving role '{SERVING_ROLE}': {workers} workers x {threads} threads, "
+                    f"{os.environ['OCR_WORKERS']} OCR processes per worker, "
+                    f"{os.environ['ADMISSION_HEAVY_CONCURRENCY']} concurrent uploads (+{os.environ['ADMISSION_HEAVY_QUEUE']} queued) per worker")
+
+def post_fork(server, worker):
+    # The fast pool only queues jobs; heavy (or single) pool workers drain the shared queue
+    if SERVING_ROLE != 'fast':
+        import app
+        app.get_job_workers().ensure_started()
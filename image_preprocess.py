@@ -0,0 +1,74 @@
+"""
+Bounded image preprocessing for OCR input: runs inside OCR workers before Tesseract.
+
+- JPEGs are decoded at reduced size (draft mode: the decoder skips DCT detail directly)
+- Images are downscaled to a target OCR resolution and converted to grayscale
+- Decoded pixel counts are capped, so a huge upload fails fast instead of exhausting memory
+- Multi-frame TIFFs are read frame by frame, up to a limit, instead of only the first frame
+"""
+import os
+
+# Configuration
+# Longest side after downscaling: ~300 DPI for a letter page, where Tesseract is most accurate
+OCR_IMAGE_MAX_SIDE = int(os.environ.get('OCR_IMAGE_MAX_SIDE', 3300))
+# Decoded pixels per frame (after draft-mode decoding) above which an image is rejected
+OCR_IMAGE_MAX_PIXELS = int(os.environ.get('OCR_IMAGE_MAX_PIXELS', 60_000_000))
+OCR_IMAGE_MAX_FRAMES = int(os.environ.get('OCR_IMAGE_MAX_FRAMES', 2))
+OCR_IMAGE_GRAYSCALE = os.environ.get('OCR_IMAGE_GRAYSCALE', '1') != '0'
+
+
+class ImageTooLarge(Exception):
+    pass
+
+
+def iter_frames(image, max_frames=OCR_IMAGE_MAX_FRAMES):
+    """
+    Yields up to max_frames frames. Seeking decodes one frame at a time, so earlier frames
+    can be freed before later ones are loaded.
+    """
+    frames = getattr(image, 'n_frames', 1)
+    for index in range(min(frames, max_frames)):
+        if index:
+            image.seek(index)
+        yield image
+
+def prepare(image, max_side=OCR_IMAGE_MAX_SIDE, grayscale=OCR_IMAGE_GRAYSCALE, max_pixels=OCR_IMAGE_MAX_PIXELS):
+    """
+    Returns a loaded copy of `image` no larger than max_side, in 'L' (or 'RGB') mode.
+    Must be called before the frame is loaded, so JPEG draft mode can take effect.
+    """
+    from PIL import Image, ImageOps
+
+    width, height = image.size
+    scale = min(1.0, max_side / max(width, height)) if max_side else 1.0
+    if image.format == 'JPEG':
+        # Decode at the smallest 1/2, 1/4 or 1/8 scale still >= the target size
+        image.draft('L' if grayscale else 'RGB', (max(1, int(width * scale)), max(1, int(height * scale))))
+    if image.size[0] * image.size[1] > max_pixels:
+        raise ImageTooLarge(f"Image of {image.size[0]}x{image.size[1]} pixels exceeds the {max_pixels} pixel limit")
+
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+    if image.mode in ('I', 'I;16', 'I;16B', 'I;16L'):
+        # 16-bit scans: plain convert('L') would clip everything above 255 to white
+        image = image.convert('I').point(lambda value: value / 256).convert('L')
+    elif has_alpha and image.mode not in ('RGBA', 'LA'):
+        # Palette or tRNS transparency (also on L/RGB images): make the alpha channel explicit
+        image = image.convert('RGBA')
+    elif image.mode not in ('L', 'RGB', 'RGBA', 'LA'):
+        # 1-bit and CMYK images can't be resampled smoothly as they are
+        image = image.convert('L' if grayscale else 'RGB')
+    if max_side and max(image.size) > max_side:
+        # A new image: the source frame stays intact for seeking to the next TIFF frame
+        scale = max_side / max(image.size)
+        size = (max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale)))
+        image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    if 'A' in image.getbands():
+        # Transparent areas are paper, not black ink
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        background.info = image.info
+        image = background
+    if grayscale and image.mode != 'L':
+        image = image.convert('L')
+    # Phone photos are often stored sideways with an EXIF rotation; cheap once downscaled
+    return ImageOps.exif_transpose(image)
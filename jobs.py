@@ -0,0 +1,405 @@
+"""
+Asynchronous classification jobs backed by a local SQLite queue.
+
+Uploads are stored under JOBS_DIR and a row is queued; background worker threads claim rows,
+run the regular extract -> parse -> predict -> webhook path and store the result. Queued and
+interrupted jobs survive restarts: a running job whose lease expires is claimed again, until
+it has used up JOB_MAX_ATTEMPTS (a file that keeps killing its worker then fails).
+
+Web processes run JOB_WORKERS threads each. To size workers independently of the web tier,
+set JOB_WORKERS=0 for the web server and run dedicated processes with:
+    python jobs.py
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import threading
+
+# Configuration
+JOBS_DIR = os.environ.get('JOBS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'jobs'))
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))  # Worker threads per process
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+# Workers renew the lease of a running job every third of this; a job whose lease lapses
+# (the process died) is handed out again
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', 600))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))
+JOB_RETENTION_SECONDS = float(os.environ.get('JOB_RETENTION_SECONDS', 7 * 24 * 3600))
+
+STATUSES = ('queued', 'running', 'done', 'failed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    batch_id TEXT,
+    filename TEXT,
+    file_path TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch_id);
+"""
+
+
+class JobFailed(Exception):
+    """
+    Raised by a job handler for failures that retrying cannot fix (e.g. no text in the file).
+    Any other exception is retried up to JOB_MAX_ATTEMPTS times.
+    """
+    pass
+
+
+class JobQueue:
+    """
+    Persistent FIFO of upload jobs. Safe across threads and processes: every thread has its
+    own connection, the database runs in WAL mode, and claims happen in an IMMEDIATE transaction.
+    """
+
+    def __init__(self, jobs_dir=JOBS_DIR):
+        self.jobs_dir = jobs_dir
+        self.files_dir = os.path.join(jobs_dir, 'files')
+        self.db_path = os.path.join(jobs_dir, 'jobs.db')
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        os.makedirs(self.files_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        # SQLite connections must not cross a fork, so key them by pid too
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def submit(self, filename, stream, batch_id=None):
+        """
+        Stores the upload stream on disk and queues it. Returns the job id.
+        """
+        job_id = uuid.uuid4().hex
+        path = os.path.join(self.files_dir, job_id)
+        tmp_path = path + '.part'
+        with open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(stream, f, 1024 * 1024)
+        os.replace(tmp_path, path)
+
+        self._connect().execute(
+            'INSERT INTO jobs (id, batch_id, filename, file_path, status, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (job_id, batch_id, filename, path, 'queued', time.time())
+        )
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def claim(self):
+        """
+        Atomically takes the oldest queued (or lease-expired) job. Returns a row or None.
+        Lease-expired jobs that have used up their attempts are failed instead.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            exhausted = conn.execute(
+                "SELECT id, file_path FROM jobs WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, JOB_MAX_ATTEMPTS)
+            ).fetchall()
+            for job in exhausted:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, lease_until = NULL, file_path = NULL WHERE id = ?",
+                    (f'Worker stopped while processing (attempt {JOB_MAX_ATTEMPTS} of {JOB_MAX_ATTEMPTS})', now, job['id'])
+                )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, lease_until = ? WHERE id = ?",
+                    (now, now + JOB_LEASE_SECONDS, row['id'])
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        for job in exhausted:
+            print(f"Job {job['id']} failed: lease expired after {JOB_MAX_ATTEMPTS} attempts")
+            if job['file_path']:
+                try:
+                    os.remove(job['file_path'])
+                except OSError:
+                    pass
+        return row
+
+    def renew(self, job_id, attempts):
+        """
+        Extends the lease of a job this worker still holds (identified by its attempt count,
+        which every claim increments). Returns False once the job is no longer ours.
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running' AND attempts = ?",
+            (time.time() + JOB_LEASE_SECONDS, job_id, attempts)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, result, attempts):
+        """
+        Stores the result of the attempt that holds the lease. Returns False if the lease was
+        lost (it expired and the job was claimed again), leaving the job untouched.
+        """
+        return self._finish(job_id, attempts, 'done', result=json.dumps(result))
+
+    def fail(self, job_id, error, attempts, retry=True):
+        """
+        Records a failed attempt: requeued while attempts remain, else failed for good.
+        Returns False if the lease was lost, like complete().
+        """
+        if retry and attempts < JOB_MAX_ATTEMPTS:
+            cursor = self._connect().execute(
+                "UPDATE jobs SET status = 'queued', error = ?, lease_until = NULL WHERE id = ? AND status = 'running' AND attempts = ?",
+                (error, job_id, attempts)
+            )
+            return cursor.rowcount == 1
+        return self._finish(job_id, attempts, 'failed', error=error)
+
+    def _finish(self, job_id, attempts, status, result=None, error=None):
+        # The attempt count is the lease token: every claim increments it, so a worker whose
+        # lease lapsed can no longer overwrite the outcome of the attempt that replaced it
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                "SELECT file_path FROM jobs WHERE id = ? AND status = 'running' AND attempts = ?",
+                (job_id, attempts)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    'UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL, file_path = NULL WHERE id = ?',
+                    (status, result, error, time.time(), job_id)
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if row is None:
+            return False
+        if row['file_path']:
+            try:
+                os.remove(row['file_path'])
+            except OSError:
+                pass
+        return True
+
+    def wait_for_work(self, timeout):
+        with self._wakeup:
+            self._wakeup.wait(timeout)
+
+    @staticmethod
+    def _to_dict(row):
+        job = {
+            'job_id': row['id'],
+            'batch_id': row['batch_id'],
+            'filename': row['filename'],
+            'status': row['status'],
+            'attempts': row['attempts'],
+            'created_at': row['created_at'],
+            'finished_at': row['finished_at']
+        }
+        if row['status'] == 'done':
+            job['result'] = json.loads(row['result'])
+        elif row['error']:
+            job['error'] = row['error']
+        return job
+
+    def get(self, job_id):
+        row = self._connect().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def get_batch(self, batch_id):
+        rows = self._connect().execute('SELECT * FROM jobs WHERE batch_id = ? ORDER BY rowid', (batch_id,)).fetchall()
+        if not rows:
+            return None
+        jobs = [self._to_dict(row) for row in rows]
+        counts = {status: 0 for status in STATUSES}
+        for job in jobs:
+            counts[job['status']] += 1
+        return {
+            'batch_id': batch_id,
+            'total': len(jobs),
+            'counts': counts,
+            'complete': counts['queued'] + counts['running'] == 0,
+            'jobs': jobs
+        }
+
+    def purge(self, older_than=JOB_RETENTION_SECONDS):
+        """
+        Deletes finished jobs older than the retention period. Returns the number removed.
+        """
+        cursor = self._connect().execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+            (time.time() - older_than,)
+        )
+        return cursor.rowcount
+
+    def stats(self):
+        counts = {status: 0 for status in STATUSES}
+        for status, count in self._connect().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'):
+            counts[status] = count
+        oldest = self._connect().execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        return {
+            'counts': counts,
+            'oldest_queued_age_s': round(time.time() - oldest, 1) if oldest else 0.0
+        }
+
+
+class JobWorkers:
+    """
+    Background threads that drain a JobQueue with `handler(filename, path)`, which returns a
+    JSON-serializable result. Restarted automatically in a forked child (see ensure_started).
+    """
+
+    def __init__(self, job_queue, handler, workers=JOB_WORKERS):
+        self.queue = job_queue
+        self.handler = handler
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.lost_leases = 0
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._last_purge = 0.0
+
+    def ensure_started(self):
+        # Threads don't survive fork: start (again) in whichever process is calling
+        if self._pid == os.getpid() or self.workers <= 0:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            for index in range(self.workers):
+                threading.Thread(target=self._run, name=f'job-worker-{index}', daemon=True).start()
+            print(f"Started {self.workers} job worker(s) in process {self._pid}")
+
+    def stop(self):
+        self._stopping.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                row = self.queue.claim()
+            except sqlite3.OperationalError as e:
+                print(f"Job queue busy: {e}")
+                row = None
+            if row is None:
+                self._maybe_purge()
+                self.queue.wait_for_work(JOB_POLL_INTERVAL)
+                continue
+            self._process(row)
+
+    def _heartbeat(self, row, done):
+        # Keeps a long OCR job from being handed to a second worker (and a second webhook)
+        attempts = row['attempts'] + 1
+        while not done.wait(JOB_LEASE_SECONDS / 3):
+            try:
+                if not self.queue.renew(row['id'], attempts):
+                    return
+            except sqlite3.OperationalError as e:
+                print(f"Job {row['id']} lease renewal failed: {e}")
+
+    def _process(self, row):
+        done = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(row, done), name=f"job-lease-{row['id'][:8]}", daemon=True).start()
+        try:
+            self._run_handler(row)
+        finally:
+            done.set()
+
+    def _run_handler(self, row):
+        attempts = row['attempts'] + 1
+        try:
+            result = self.handler(row['filename'], row['file_path'])
+        except JobFailed as e:
+            held = self.queue.fail(row['id'], str(e), attempts, retry=False)
+            outcome = 'failed'
+        except Exception as e:
+            print(f"Job {row['id']} attempt {attempts} failed: {e}")
+            held = self.queue.fail(row['id'], str(e), attempts)
+            outcome = 'failed'
+        else:
+            held = self.queue.complete(row['id'], result, attempts)
+            outcome = 'processed'
+        if not held:
+            # Another worker claimed the job after our lease lapsed; its attempt decides
+            print(f"Job {row['id']} attempt {attempts} lost its lease, outcome discarded")
+            outcome = 'lost_leases'
+        self._count(outcome)
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _maybe_purge(self):
+        now = time.time()
+        if now - self._last_purge < 3600:
+            return
+        self._last_purge = now
+        try:
+            removed = self.queue.purge()
+            if removed:
+                print(f"Purged {removed} finished job(s)")
+        except sqlite3.OperationalError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers if self._pid == os.getpid() else 0,
+                'processed': self.processed,
+                'failed': self.failed,
+                'lost_leases': self.lost_leases
+            }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+
+if __name__ == '__main__':
+    # Dedicated worker process: the web tier can then run with JOB_WORKERS=0
+    os.environ['JOB_AUTOSTART'] = '0'
+    import app
+
+    workers = app.get_job_workers()
+    workers.workers = max(1, workers.workers)
+    workers.ensure_started()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        workers.stop()
@@ -0,0 +1,259 @@
+import abc
+import weakref
+import threading
+from bisect import bisect_left
+
+# Default latency buckets (seconds): fast JSON calls up to multi-page OCR
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (10e3, 50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6, 25e6)
+CONFIDENCE_BUCKETS = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99, 1.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _ShardHolder:
+    # Lives only in its thread's threading.local, so it is freed when the thread exits
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self, shard):
+        self.shard = shard
+
+
+class _Sharded(abc.ABC):
+    """
+    Per-thread storage: each thread only ever writes its own dict, so updates take no lock.
+    Readers merge all shards. When a thread exits its shard is folded into a base total, so
+    totals never go backwards and the shard list stays as long as the number of live threads.
+    """
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        # Reentrant: a finalizer may fire while this thread already holds the lock
+        self._shards_lock = threading.RLock()
+
+    def _shard(self):
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = _ShardHolder({})
+            self._local.holder = holder
+            with self._shards_lock:
+                self._shards.append(holder.shard)
+            weakref.finalize(holder, self._retire, holder.shard)
+        return holder.shard
+
+    def _retire(self, shard):
+        # The owning thread has exited, so nothing writes to the shard any more
+        with self._shards_lock:
+            for index, candidate in enumerate(self._shards):
+                if candidate is shard:
+                    del self._shards[index]
+                    break
+            for key, value in shard.items():
+                current = self._retired.get(key)
+                self._retired[key] = value if current is None else self._merge(current, value)
+
+    @staticmethod
+    @abc.abstractmethod
+    def _merge(a, b):
+        """
+        Combines two values of the same key, e.g. when a retired shard is folded into the base.
+        """
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _snapshots(self):
+        with self._shards_lock:
+            shards = list(self._shards)
+            retired = dict(self._retired)
+        # dict() copies in C under the GIL, so a concurrent writer cannot tear it
+        return [retired] + [dict(shard) for shard in shards]
+
+
+class Counter(_Sharded):
+    kind = 'counter'
+
+    @staticmethod
+    def _merge(a, b):
+        return a + b
+
+    def inc(self, amount=1, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def collect(self):
+        totals = {}
+        for snapshot in self._snapshots():
+            for key, value in snapshot.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def value(self, **labels):
+        if labels:
+            return self.collect().get(self._key(labels), 0)
+        return sum(self.collect().values())
+
+    def render(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.collect().items())]
+
+
+class Histogram(_Sharded):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        cell = shard.get(key)
+        # Per-bucket counts (non-cumulative), then +Inf, then sum. Cells are replaced, never
+        # mutated, so a reader always sees a count and sum from the same observation
+        cell = [0] * (len(self.buckets) + 1) + [0.0] if cell is None else list(cell)
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+        shard[key] = tuple(cell)
+
+    @staticmethod
+    def _merge(a, b):
+        return tuple(x + y for x, y in zip(a, b))
+
+    def collect(self):
+        """
+        Returns {label values: (cumulative bucket counts incl. +Inf, sum, count)}.
+        """
+        merged = {}
+        for snapshot in self._snapshots():
+            for key, cell in snapshot.items():
+                cell = list(cell)
+                total = merged.get(key)
+                merged[key] = cell if total is None else [a + b for a, b in zip(total, cell)]
+        result = {}
+        for key, cell in merged.items():
+            cumulative = []
+            running = 0
+            for count in cell[:-1]:
+                running += count
+                cumulative.append(running)
+            result[key] = (cumulative, cell[-1], running)
+        return result
+
+    def summary(self, **labels):
+        """
+        Returns (sum, count) across all label values, or for the given labels.
+        """
+        collected = self.collect()
+        if labels:
+            entry = collected.get(self._key(labels))
+            return (entry[1], entry[2]) if entry else (0.0, 0)
+        return (sum(entry[1] for entry in collected.values()), sum(entry[2] for entry in collected.values()))
+
+    def render(self):
+        lines = []
+        for key, (cumulative, total, count) in sorted(self.collect().items()):
+            for bound, value in zip(self.buckets + (float('inf'),), cumulative):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(float(bound))))} {value}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class GaugeFunc:
+    """
+    Gauge whose value is read from a callback at scrape time (queue depths, cache sizes).
+    The callback returns a number, or a {label value: number} dict when labelnames has one entry.
+    """
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, callback, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+
+    def render(self):
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"Metric {self.name} callback failed: {e}")
+            return []
+        if isinstance(value, dict):
+            return [f"{self.name}{_format_labels(self.labelnames, (key,))} {_format_value(v)}"
+                    for key, v in sorted(value.items())]
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+def histogram(name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+    return REGISTRY.register(Histogram(name, documentation, buckets, labelnames))
+
+def gauge_func(name, documentation, callback, labelnames=()):
+    return REGISTRY.register(GaugeFunc(name, documentation, callback, labelnames))
+
+
+# --- Application metrics ---
+
+REQUEST_LATENCY = histogram('resume_http_request_duration_seconds', 'HTTP request latency by route.',
+                            labelnames=('endpoint', 'method', 'status'))
+PREDICTIONS = counter('resume_predictions_total', 'Resumes classified, by predicted class.', labelnames=('label',))
+CONFIDENCE = histogram('resume_prediction_confidence', 'Model confidence of each prediction.', buckets=CONFIDENCE_BUCKETS)
+EXTRACTION_PAGES = counter('resume_extraction_pages_total', 'PDF pages by extraction strategy used.', labelnames=('strategy',))
+OCR_PAGES = counter('resume_ocr_pages_total', 'Pages or images sent to Tesseract.', labelnames=('source',))
+OCR_ESCALATIONS = counter('resume_ocr_escalations_total', 'Progressive OCR passes beyond the low-DPI first page.', labelnames=('step',))
+ADMISSION_SHED = counter('resume_admission_shed_total', 'Requests rejected with 503 by admission control.', labelnames=('endpoint_class', 'reason'))
+FILE_SIZE = histogram('resume_upload_size_bytes', 'Size of files submitted for extraction.', buckets=SIZE_BUCKETS, labelnames=('kind',))
@@ -0,0 +1,222 @@
+import os
+import io
+import functools
+import threading
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+
+import image_preprocess
+
+# Configuration
+# One Tesseract process per core; more only oversubscribes the CPU
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', os.cpu_count() or 1))
+# Max pages queued or running across all requests before submitters block
+OCR_QUEUE_SIZE = int(os.environ.get('OCR_QUEUE_SIZE', OCR_WORKERS * 4))
+OCR_SUBMIT_TIMEOUT = float(os.environ.get('OCR_SUBMIT_TIMEOUT', 60))
+# 'process' (default) or 'inline' (run in the calling thread, e.g. inside other worker pools)
+OCR_POOL_MODE = os.environ.get('OCR_POOL_MODE', 'process')
+
+
+class OCRQueueFull(Exception):
+    pass
+
+
+class OCRError(Exception):
+    """
+    Raised in place of worker-side exceptions. Some (e.g. pytesseract's TesseractNotFoundError)
+    cannot be unpickled in the parent and would otherwise break the whole pool.
+    """
+    pass
+
+
+# --- Tasks (module-level so they can be pickled into worker processes) ---
+
+def _otsu_threshold(histogram):
+    """
+    Gray level that best separates ink from paper (maximum between-class variance).
+    """
+    total = sum(histogram)
+    sum_all = sum(level * count for level, count in enumerate(histogram))
+    weight_bg = 0
+    sum_bg = 0
+    best_level, best_variance = 127, -1.0
+    for level, count in enumerate(histogram):
+        weight_bg += count
+        if not weight_bg:
+            continue
+        weight_fg = total - weight_bg
+        if not weight_fg:
+            break
+        sum_bg += level * count
+        mean_bg = sum_bg / weight_bg
+        mean_fg = (sum_all - sum_bg) / weight_fg
+        variance = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+def binarize(image):
+    """
+    Grayscale + global Otsu threshold: fewer, cleaner pixels for Tesseract's fast pass.
+    """
+    gray = image if image.mode == 'L' else image.convert('L')
+    threshold = _otsu_threshold(gray.histogram())
+    return gray.point([0 if level <= threshold else 255 for level in range(256)])
+
+def ocr_image_bytes(file_content, max_side=None, preprocess=False):
+    """
+    Opens an uploaded image (bytes, or a path to a spooled upload) and runs Tesseract on it.
+    Frames are decoded, downscaled (to max_side, default OCR_IMAGE_MAX_SIDE) and converted
+    to grayscale by image_preprocess; multi-frame TIFFs contribute up to OCR_IMAGE_MAX_FRAMES
+    pages. preprocess also binarizes (progressive OCR fast pass).
+    """
+    import pytesseract
+    from PIL import Image
+
+    try:
+        image = Image.open(file_content if isinstance(file_content, str) else io.BytesIO(file_content))
+        texts = []
+        for frame in image_preprocess.iter_frames(image):
+            prepared = image_preprocess.prepare(frame, max_side or image_preprocess.OCR_IMAGE_MAX_SIDE)
+            if preprocess:
+                prepared = binarize(prepared)
+            texts.append(pytesseract.image_to_string(prepared))
+            del prepared
+        return "\n".join(texts)
+    except Exception as e:
+        raise OCRError(f"{type(e).__name__}: {e}") from None
+
+def ocr_pdf_page(file_content, page_number, dpi, preprocess=False):
+    """
+    Rasterizes a single (1-based) PDF page and runs Tesseract on it.
+    file_content is the PDF bytes, or a path to a spooled upload. With preprocess the page
+    is rendered in grayscale and binarized.
+    """
+    import pytesseract
+    from pdf2image import convert_from_bytes, convert_from_path
+
+    try:
+        if isinstance(file_content, str):
+            images = convert_from_path(file_content, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=preprocess)
+        else:
+            images = convert_from_bytes(file_content, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=preprocess)
+        if preprocess:
+            images = [binarize(image) for image in images]
+        return "\n".join(pytesseract.image_to_string(image) for image in images)
+    except Exception as e:
+        raise OCRError(f"{type(e).__name__}: {e}") from None
+
+
+class OCRPool:
+    """
+    Long-lived, process-based OCR executor shared by every request in this process.
+    A bounded number of tasks may be queued or running at once; further submitters
+    wait for a slot (backpressure) instead of piling more work onto the CPU.
+    """
+
+    def __init__(self, workers=OCR_WORKERS, queue_size=OCR_QUEUE_SIZE, mode=OCR_POOL_MODE):
+        self.workers = max(1, workers)
+        self.queue_size = max(self.workers, queue_size)
+        self.mode = mode
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                print(f"Starting OCR pool with {self.workers} worker processes (queue {self.queue_size})...")
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _reset_executor(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, executor, future):
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled() or error is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        self._slots.release()
+        if isinstance(error, BrokenProcessPool):
+            # Only the executor that ran this task: a late callback must not tear down a
+            # replacement pool that is already serving other requests
+            self._reset_executor(executor)
+
+    def submit(self, fn, *args):
+        if self.mode == 'inline':
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        if not self._slots.acquire(timeout=OCR_SUBMIT_TIMEOUT):
+            raise OCRQueueFull(f"OCR queue full ({self.queue_size} pages pending)")
+        with self._lock:
+            self.in_flight += 1
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge scan); start a fresh pool once
+            self._reset_executor(executor)
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except Exception:
+                self._release_unsubmitted()
+                raise
+        except Exception:
+            self._release_unsubmitted()
+            raise
+        future.add_done_callback(functools.partial(self._on_done, executor))
+        return future
+
+    def _release_unsubmitted(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def run(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'in_flight': self.in_flight,
+                'completed': self.completed,
+                'failed': self.failed
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = OCRPool()
+    return _pool
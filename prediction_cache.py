@@ -0,0 +1,127 @@
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+# Configuration
+PREDICTION_CACHE_ENABLED = os.environ.get('PREDICTION_CACHE', '1') != '0'
+PREDICTION_CACHE_MAX_ENTRIES = int(os.environ.get('PREDICTION_CACHE_MAX_ENTRIES', 50000))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+
+# Approximate bookkeeping per entry on top of the key strings: tuples, floats, dict slot
+ENTRY_OVERHEAD_BYTES = 240
+
+
+def feature_key(record, model_version):
+    """
+    Normalized (model_version, skills, experience_years, education) tuple, or None when the
+    record can't be cached safely. Skills are lowercased and whitespace-collapsed, which the
+    TF-IDF/hashing vectorizers already do; education is kept verbatim because the one-hot
+    encoder is case- and whitespace-sensitive.
+    """
+    skills = record.get('skills')
+    education = record.get('education')
+    experience = record.get('experience_years')
+    if not isinstance(skills, str) or not isinstance(education, str):
+        return None
+    if isinstance(experience, bool) or not isinstance(experience, (int, float)):
+        return None
+    return (model_version, ' '.join(skills.lower().split()), float(experience), education)
+
+
+class PredictionCache:
+    """
+    In-process LRU of model outputs ((class_id, confidence) per feature key), bounded by entry
+    count, with a TTL. The model version is part of every key, so outputs of a replaced model
+    are never returned; they just age out.
+    """
+
+    def __init__(self, max_entries=PREDICTION_CACHE_MAX_ENTRIES, ttl=PREDICTION_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(key):
+        return sys.getsizeof(key[1]) + sys.getsizeof(key[3]) + ENTRY_OVERHEAD_BYTES
+
+    def _remove(self, key):
+        self._entries.pop(key)
+        self._bytes -= self._entry_size(key)
+
+    def get_many(self, keys):
+        """
+        Returns the cached value for each key, None for misses (and for None keys).
+        """
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key) if key is not None else None
+                if entry is not None and entry[1] < now:
+                    self._remove(key)
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    values.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    values.append(entry[0])
+        return values
+
+    def put(self, key, value):
+        if key is None or self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at)
+            self._bytes += self._entry_size(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'memory_bytes': self._bytes,
+                'ttl_seconds': self.ttl,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'enabled': PREDICTION_CACHE_ENABLED
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PredictionCache()
+    return _cache
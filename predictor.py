@@ -1,23 +1,30 @@
 import os
 import pickle
+import hashlib
 import traceback
-import pandas as pd
 from model_def import LiteModel  # Required for pickle loading
+import metrics
+import timing
+import prediction_cache
+import drift_store
 
-# Global Stats Storage (In-Memory)
-STATS_TOTAL_ANALYZED = 0
-STATS_IT_COUNT = 0
-STATS_TOTAL_CONFIDENCE = 0.0
+# Configuration
+# Score with the NumPy export of the model when it is present and matches the pickle
+COMPACT_MODEL_ENABLED = os.environ.get('COMPACT_MODEL', '1') != '0'
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'resume_it_model.pkl')
+COMPACT_MODEL_DIR = os.environ.get('COMPACT_MODEL_DIR', os.path.join(os.path.dirname(__file__), 'resume_it_model_compact'))
 
 model_lazy = None
+scorer_lazy = None
+scorer_checked = False
+model_version_lazy = None
 
 def get_model():
     global model_lazy
     if model_lazy is None:
         try:
-            model_path = os.path.join(os.path.dirname(__file__), 'resume_it_model.pkl')
-            print(f"Loading model from {model_path} (lazy)...")
-            with open(model_path, 'rb') as f:
+            print(f"Loading model from {MODEL_PATH} (lazy)...")
+            with open(MODEL_PATH, 'rb') as f:
                 model_lazy = pickle.load(f)
             print("Model loaded successfully.")
         except Exception as e:
@@ -26,80 +33,209 @@ def get_model():
             return None
     return model_lazy
 
-def get_prediction_data(skills, experience_years, education, email="Unknown", full_text=None, filename=None, name=None):
+def get_scorer():
+    """
+    Returns the compact NumPy scorer, or None to fall back to the pickled pipeline.
+    """
+    global scorer_lazy, scorer_checked
+    if not scorer_checked:
+        scorer_checked = True
+        if COMPACT_MODEL_ENABLED:
+            try:
+                import compact_model  # Pulls in NumPy; deferred to first use or warm-up
+                scorer_lazy = compact_model.CompactScorer.load(COMPACT_MODEL_DIR, MODEL_PATH)
+                if scorer_lazy is not None:
+                    print(f"Compact model loaded from {COMPACT_MODEL_DIR}.")
+            except Exception as e:
+                print(f"Error loading compact model, using pickled pipeline: {e}")
+                scorer_lazy = None
+    return scorer_lazy
+
+def get_model_version():
+    """
+    Short sha256 of the model file, identifying the model this process serves. Results stored
+    elsewhere (e.g. the duplicate index) are tagged with it so a retrained model never reuses them.
+    The model is never reloaded in-process, so the hash is computed once.
+    """
+    global model_version_lazy
+    if model_version_lazy is None:
+        try:
+            digest = hashlib.sha256()
+            with open(MODEL_PATH, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            model_version_lazy = digest.hexdigest()[:16]
+        except OSError:
+            model_version_lazy = 'none'
+    return model_version_lazy
+
+def _pipeline_proba(clf, records):
+    """
+    Scores through the pickled sklearn pipeline. Returns (probabilities, classes).
+    """
+    import pandas as pd  # Only needed on this path; the compact scorer avoids it
+
     # Prepare input DataFrame
     input_data = pd.DataFrame({
-        'skills': [skills],
-        'experience_years': [experience_years],
-        'education': [education]
+        'skills': [record['skills'] for record in records],
+        'experience_years': [record['experience_years'] for record in records],
+        'education': [record['education'] for record in records]
     })
-    
-    # Predict class and probability
+    probabilities = clf.predict_proba(input_data)
+    return probabilities, list(getattr(clf, 'classes_', range(len(probabilities[0]))))
+
+def warm_up():
+    """
+    Loads the model and scores one dummy resume, without counting it in the stats.
+    Returns which scoring path is now warm: 'compact' or 'pickle'.
+    """
+    record = {'skills': 'python, sql, communication', 'experience_years': 1.0, 'education': 'B.Tech'}
+    get_model_version()
+    scorer = get_scorer()
+    if scorer is not None:
+        scorer.predict_proba([record])
+        return 'compact'
     clf = get_model()
-    # Fallback if model load failed
     if clf is None:
-         return {
-             'class_id': 0, 
-             'class_label': 'Error', 
-             'confidence_score': 0.0, 
-             'verdict': 'Model Error', 
-             'filename': filename, 
-             'parsed_data': {
-                 'skills': '', 
-                 'experience_years': 0, 
-                 'education': '', 
-                 'email': '', 
-                 'name': ''
-             }
-         }
-
-    try:
-        prediction = clf.predict(input_data)[0]
-    except:
-        prediction = 1 # Fallback to IT Resume
-
-    try:
-        probabilities = clf.predict_proba(input_data)[0]
-        confidence = float(probabilities[prediction])
-    except:
-        confidence = 0.95 
-
-    # Update Global Stats
-    global STATS_TOTAL_ANALYZED, STATS_IT_COUNT, STATS_TOTAL_CONFIDENCE
-    STATS_TOTAL_ANALYZED += 1
-    if prediction == 1:
-        STATS_IT_COUNT += 1
-    STATS_TOTAL_CONFIDENCE += confidence
-        
-    result_label = "IT Resume" if prediction == 1 else "Non-IT Resume"
-    verdict = "IT Ready" if prediction == 1 else "Not ready for IT"
-
-    response = {
-        'class_id': int(prediction),
-        'class_label': result_label,
-        'confidence_score': round(confidence, 2),
-        'verdict': verdict,
-        # Return parsed data for UI
+        raise RuntimeError("Model could not be loaded")
+    _pipeline_proba(clf, [record])
+    return 'pickle'
+
+def _error_response(filename):
+    return {
+        'class_id': 0, 
+        'class_label': 'Error', 
+        'confidence_score': 0.0, 
+        'verdict': 'Model Error', 
+        'filename': filename, 
         'parsed_data': {
-            'skills': skills[:100] + "..." if skills else "",
-            'experience_years': experience_years,
-            'education': education,
-            'email': email,
-            'name': name
-        },
-        'filename': filename
+            'skills': '', 
+            'experience_years': 0, 
+            'education': '', 
+            'email': '', 
+            'name': ''
+        }
     }
-    return response
+
+def _score(records):
+    scorer = get_scorer()
+    if scorer is not None:
+        probabilities, classes = scorer.predict_proba(records), scorer.classes
+    else:
+        clf = get_model()
+        if clf is None:
+            return None
+        probabilities, classes = _pipeline_proba(clf, records)
+    scored = []
+    for row in probabilities:
+        best = max(range(len(row)), key=lambda i: row[i])
+        scored.append((int(classes[best]), float(row[best])))
+    return scored
+
+def predict_confidence(records):
+    """
+    Returns [(class_id, confidence)] per record, or None when no model could be loaded.
+    Repeated feature tuples are answered from the prediction cache; only the misses are
+    scored, in one call. Unlike get_prediction_batch it records no stats, so it can be used
+    for internal decisions such as when to stop OCR.
+    """
+    if not prediction_cache.PREDICTION_CACHE_ENABLED:
+        return _score(records)
+    cache = prediction_cache.get_cache()
+    version = get_model_version()
+    keys = [prediction_cache.feature_key(record, version) for record in records]
+    scored = cache.get_many(keys)
+    missing = [i for i, value in enumerate(scored) if value is None]
+    if missing:
+        fresh = _score([records[i] for i in missing])
+        if fresh is None:
+            return None
+        for i, value in zip(missing, fresh):
+            scored[i] = value
+            cache.put(keys[i], value)
+    return scored
+
+def get_prediction_batch(records):
+    """
+    Scores N parsed resumes with a single predict_proba call.
+    Each record is a dict with 'skills', 'experience_years', 'education' and optionally
+    'email', 'filename', 'name'. Labels are derived from the probabilities, so the
+    features are computed once per batch instead of twice per resume. Uses the compact
+    NumPy scorer when available, otherwise the pickled sklearn pipeline.
+    Returns one response dict per record, in order.
+    """
+    if not records:
+        return []
+
+    with timing.span('predict'):
+        # Predict class and probability in one pass
+        fallback = False
+        try:
+            scored = predict_confidence(records)
+        except Exception:
+            # Fallback to IT Resume
+            scored = [(1, 0.95)] * len(records)
+            fallback = True
+
+    # Fallback if model load failed
+    if scored is None:
+        return [_error_response(record.get('filename')) for record in records]
+
+    # Update Stats (thread-safe, per-thread sharded counters)
+    for prediction, confidence in scored:
+        metrics.PREDICTIONS.inc(label='it' if prediction == 1 else 'non_it')
+        metrics.CONFIDENCE.observe(confidence)
+    if drift_store.DRIFT_ENABLED and not fallback:
+        # Shared with the other workers and kept across restarts, unlike the counters above
+        drift_store.get_store().record(scored)
+
+    responses = []
+    for record, (prediction, confidence) in zip(records, scored):
+        skills = record['skills']
+        result_label = "IT Resume" if prediction == 1 else "Non-IT Resume"
+        verdict = "IT Ready" if prediction == 1 else "Not ready for IT"
+
+        responses.append({
+            'class_id': int(prediction),
+            'class_label': result_label,
+            'confidence_score': round(confidence, 2),
+            'verdict': verdict,
+            # Return parsed data for UI
+            'parsed_data': {
+                'skills': skills[:100] + "..." if skills else "",
+                'experience_years': record['experience_years'],
+                'education': record['education'],
+                'email': record.get('email', "Unknown"),
+                'name': record.get('name')
+            },
+            'filename': record.get('filename')
+        })
+        if fallback:
+            # Not a model output: must not be cached or replayed for duplicates
+            responses[-1]['fallback'] = True
+    return responses
+
+def get_prediction_data(skills, experience_years, education, email="Unknown", full_text=None, filename=None, name=None):
+    return get_prediction_batch([{
+        'skills': skills,
+        'experience_years': experience_years,
+        'education': education,
+        'email': email,
+        'filename': filename,
+        'name': name
+    }])[0]
 
 def get_stats():
-    global STATS_TOTAL_ANALYZED, STATS_IT_COUNT, STATS_TOTAL_CONFIDENCE
+    total_analyzed = metrics.PREDICTIONS.value()
+    it_count = metrics.PREDICTIONS.value(label='it')
+    total_confidence, _ = metrics.CONFIDENCE.summary()
     
     avg_confidence = 0.0
-    if STATS_TOTAL_ANALYZED > 0:
-        avg_confidence = (STATS_TOTAL_CONFIDENCE / STATS_TOTAL_ANALYZED) * 100
+    if total_analyzed > 0:
+        avg_confidence = (total_confidence / total_analyzed) * 100
         
     return {
-        'total_analyzed': STATS_TOTAL_ANALYZED,
-        'it_candidates': STATS_IT_COUNT,
+        'total_analyzed': total_analyzed,
+        'it_candidates': it_count,
         'avg_confidence_percent': round(avg_confidence, 1)
     }
@@ -223,7 +223,8 @@ const Dashboard: React.FC = () => {
                     return;
                 }
 
-                url = `${API_BASE_URL}/predict_batch_pdf`;
+                // Stream results as NDJSON so each file shows up as soon as it is classified
+                url = `${API_BASE_URL}/predict_batch_pdf?stream=ndjson`;
                 options = {
                     method: 'POST',
                     body: data
@@ -237,6 +238,28 @@ const Dashboard: React.FC = () => {
                 throw new Error(errData.error || 'Network response was not ok');
             }
 
+            if (activeTab === 'folder' && response.body) {
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffered = '';
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    buffered += decoder.decode(value, { stream: true });
+                    const lines = buffered.split('\n');
+                    buffered = lines.pop() || '';
+                    for (const line of lines) {
+                        if (!line.trim()) continue;
+                        const record = JSON.parse(line);
+                        if (record.type === 'result') {
+                            setBatchResults(prev => [...prev, record]);
+                        }
+                    }
+                }
+                fetchStats();
+                return;
+            }
+
             const data = await response.json();
 
             if (activeTab === 'folder') {
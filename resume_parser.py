@@ -0,0 +1,259 @@
+import re
+
+# Degree keywords in priority order: the first one found on a short line wins
+DEGREES = [
+    "ph.d", "doctorate", "phd",
+    "m.tech", "m.sc", "m.s", "mca", "mba", "master", "post graduate",
+    "b.tech", "b.e", "b.sc", "b.s", "bca", "bba", "bachelor", "graduate", "engineer",
+    "diploma", "high school", "senior secondary"
+]
+
+SECTION_HEADERS = {'education', 'experience', 'skills', 'summary', 'objective', 'profile',
+                   'contact', 'projects', 'work', 'achievements', 'certifications', 'references',
+                   'curriculum vitae', 'resume', 'cv', 'phone', 'address', 'email'}
+
+MAX_EDUCATION_LENGTH = 100
+SKILLS_WINDOW = 500
+
+# Precompiled patterns
+EXPERIENCE_RE = re.compile(r'(\d+(\.\d+)?)(\+)?\s*(year|yr)')
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+EDUCATION_CLEAN_RE = re.compile(r'[^\w\s\.,\-\(\)]')
+DOUBLE_COMMA_RE = re.compile(r',\s*,')
+LONG_NUMBER_RE = re.compile(r'\d{5,}')
+DIGIT_RE = re.compile(r'\d')
+NAME_CLEAN_RE = re.compile(r'[^a-zA-Z\s\.\-]')
+
+YEAR_RE = re.compile(r'y(?:ear|r)')
+
+# Separators and bullets in the skills section all become ", "
+SKILL_SEPARATORS = '\n\r\t;|➢●•·-–>'
+
+
+def build_trie_pattern(words):
+    """
+    Compiles literal words into a regex shaped like a prefix trie, e.g. b(?:\\.(?:e|sc?)|ca).
+    Shared prefixes are tested once per position instead of once per word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return render(trie)
+
+
+class LineIndex:
+    """
+    Line lookups over a text without re-splitting it: offsets are resolved to line
+    boundaries with find/rfind and each resolved line is cached.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self._lines = {}
+
+    def line_at(self, offset):
+        """
+        Returns (start offset, line text) for the line containing `offset`.
+        """
+        start = self.text.rfind('\n', 0, offset) + 1
+        line = self._lines.get(start)
+        if line is None:
+            end = self.text.find('\n', offset)
+            line = self.text[start:] if end == -1 else self.text[start:end]
+            self._lines[start] = line
+        return start, line
+
+    def lines_after(self, offset):
+        """
+        Yields the rest of the line at `offset`, then every following line.
+        """
+        text = self.text
+        while True:
+            end = text.find('\n', offset)
+            if end == -1:
+                yield text[offset:]
+                return
+            yield text[offset:end]
+            offset = end + 1
+
+
+class MultiPatternMatcher:
+    """
+    Aho-Corasick style matcher: locates every line containing any of a fixed set of literal
+    patterns in a single scan. One trie-shaped compiled regex walks the text; since no pattern
+    spans a newline, each line holding a pattern yields at least one match, so exact membership
+    only has to be resolved on those few candidate lines.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._regex = re.compile(build_trie_pattern(self.patterns))
+
+    def match_lines(self, index):
+        """
+        Returns {pattern: [line texts in document order]} for every pattern present.
+        """
+        candidates = {}
+        for match in self._regex.finditer(index.text):
+            start, line = index.line_at(match.start())
+            candidates[start] = line
+        found = {}
+        for start in sorted(candidates):
+            line = candidates[start]
+            for pattern in self.patterns:
+                if pattern in line:
+                    found.setdefault(pattern, []).append(line)
+        return found
+
+
+class ResumeParser:
+    """
+    Single-pass heuristic resume parser: the text is lowercased and indexed once, degrees are
+    found with one multi-pattern scan, and skills cleanup is a handful of C-level replaces and
+    one precompiled substitution.
+    """
+
+    def __init__(self, degrees=DEGREES, section_headers=SECTION_HEADERS):
+        self.degrees = list(degrees)
+        self.section_headers = set(section_headers)
+        self.degree_matcher = MultiPatternMatcher(self.degrees)
+
+    def extract_candidate_name(self, text):
+        """
+        Heuristic: The candidate name is usually the first non-empty line at the top of a resume.
+        """
+        # Only the first 10 lines are ever inspected, so don't split the rest
+        for line in text.strip().split('\n', 10)[:10]:
+            line = line.strip()
+            if not line or len(line) < 3:
+                continue
+            lowered = line.lower()
+            if '@' in line or 'http' in lowered or 'www.' in lowered:
+                continue
+            if LONG_NUMBER_RE.search(line):  # Skip phone numbers
+                continue
+            if lowered.strip(':').strip() in self.section_headers:
+                continue
+            words = line.split()
+            if 1 <= len(words) <= 5 and not DIGIT_RE.search(line):
+                # Clean up: title case, remove special chars
+                name = NAME_CLEAN_RE.sub('', line).strip()
+                if len(name) > 2:
+                    return name.title()
+        return None
+
+    def _experience(self, text):
+        """
+        Same result as EXPERIENCE_RE.search(text), without trying the pattern at every offset:
+        a match must end in "year"/"yr", so only the digits/spaces run before each occurrence
+        is searched, in document order.
+        """
+        for occurrence in YEAR_RE.finditer(text):
+            end = occurrence.start()
+            start = end
+            while start and (text[start - 1].isdigit() or text[start - 1].isspace() or text[start - 1] in '.+'):
+                start -= 1
+            if start == end:
+                continue
+            match = EXPERIENCE_RE.search(text, start, occurrence.end())
+            if match:
+                return match
+        return None
+
+    def _education(self, index):
+        # Degree lines, by degree priority then line order
+        degree_lines = self.degree_matcher.match_lines(index)
+        education = "Not Specified"
+        for degree in self.degrees:
+            for line in degree_lines.get(degree, ()):
+                education = line.strip()
+                if len(education) < MAX_EDUCATION_LENGTH:
+                    return education
+
+        # Fallback: first meaningful line after an "education" header
+        position = index.text.find("education")
+        if position != -1:
+            non_empty = 0
+            for line in index.lines_after(position + len("education")):
+                line = line.strip()
+                if not line:
+                    continue
+                non_empty += 1
+                if non_empty > 3:
+                    break
+                if len(line) > 3:
+                    return line
+        return education
+
+    def _skills(self, text):
+        position = text.find("skills")
+        skills = text[position + len("skills"):position + len("skills") + SKILLS_WINDOW] if position != -1 else text
+
+        # Cleanup Skills (str.replace per separator beats a translate table in CPython)
+        for char in SKILL_SEPARATORS:
+            skills = skills.replace(char, ', ')
+        # split/join collapses whitespace like re.sub(r'\s+', ' ') up to the
+        # leading/trailing space, which the final strip removes anyway
+        skills = ' '.join(skills.split())
+        skills = DOUBLE_COMMA_RE.sub(', ', skills)
+        skills = skills.replace(',', ', ')
+        skills = ' '.join(skills.split())
+        return skills.strip(' ,')
+
+    def parse(self, text):
+        candidate_name = self.extract_candidate_name(text)
+        text = text.lower()
+        index = LineIndex(text)
+
+        # 1. Experience
+        experience_years = 0.0
+        exp_match = self._experience(text)
+        if exp_match:
+            try:
+                experience_years = float(exp_match.group(1))
+            except ValueError:
+                pass
+
+        # 2. Education
+        education = self._education(index).title()
+        education = EDUCATION_CLEAN_RE.sub('', education)
+
+        # 3. Skills
+        skills = self._skills(text)
+
+        # 4. Email
+        email = "Not Found"
+        email_match = EMAIL_RE.search(text)
+        if email_match:
+            email = email_match.group(0)
+
+        return {
+            "skills": skills,
+            "experience_years": experience_years,
+            "education": education,
+            "email": email,
+            "name": candidate_name
+        }
+
+
+_parser = ResumeParser()
+
+def extract_candidate_name(text):
+    return _parser.extract_candidate_name(text)
+
+def parse_resume_text(text):
+    """
+    Simple heuristic parser to extract features from resume text.
+    """
+    return _parser.parse(text)
@@ -6,6 +6,9 @@ import sys
 import webbrowser
 import socket
 import threading
+import json
+import urllib.request
+import urllib.error
 
 def run_project():
     """
@@ -28,13 +31,19 @@ def run_project():
         stderr=subprocess.STDOUT
     )
 
-    # 2. Wait for Backend (Critical Step)
-    if not wait_for_port(5003, timeout=120, name="Backend"):
+    # 2. Wait for Backend (Critical Step): port first, then model warm-up via /readyz
+    if not wait_for_port(5003, timeout=60, name="Backend"):
         print("❌ Backend failed to start.")
         backend.terminate()
         sys.exit(1)
-    
-    print("✅ Backend is ready on port 5003!")
+
+    report = wait_for_ready('http://127.0.0.1:5003/readyz', timeout=60)
+    if report is None:
+        print("⚠️ Backend is listening but did not report ready; the first request will load the model.")
+    elif report.get('state') == 'failed':
+        print("⚠️ Backend warm-up failed (model not loaded); predictions will return errors.")
+    else:
+        print(f"✅ Backend is ready on port 5003! (ready after {report.get('ready_after_ms')} ms)")
 
     # 3. Start Frontend
     print("🚀 Starting Frontend (Vite)...")
@@ -120,5 +129,28 @@ def wait_for_port(port, timeout=60, name="Service"):
         time.sleep(1)
     return False
 
+def wait_for_ready(url, timeout=60):
+    """
+    Polls the backend readiness endpoint. Returns its report once ready or failed, None on timeout.
+    """
+    print(f"⏳ Waiting for warm-up ({url})...")
+    start_time = time.time()
+    while time.time() - start_time < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            # 503 while warming up; the body carries the report
+            try:
+                report = json.loads(e.read())
+            except ValueError:
+                report = {}
+            if report.get('state') == 'failed':
+                return report
+        except Exception:
+            pass
+        time.sleep(0.25)
+    return None
+
 if __name__ == "__main__":
     run_project()
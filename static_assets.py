@@ -0,0 +1,153 @@
+"""
+In-memory serving of the built dashboard (resume-classifier-frontend/dist).
+
+The directory is indexed once: every file is held in memory with a strong ETag, plus gzip
+and brotli variants. The variants are read from .gz/.br files emitted by the build when
+present, otherwise compressed here (brotli only if the optional `brotli` package is
+installed). Vite's content-hashed files under assets/ are served as immutable for a year;
+everything else (index.html) is revalidated on each load, which costs a 304 that never
+touches the disk. Rebuilding the frontend needs a restart to be picked up.
+"""
+import os
+import re
+import gzip
+import hashlib
+import mimetypes
+import threading
+
+# Configuration
+STATIC_DIR = os.environ.get('STATIC_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resume-classifier-frontend', 'dist'))
+# Smaller files, and files that don't shrink by at least 10%, are only served uncompressed
+STATIC_COMPRESS_MIN_BYTES = int(os.environ.get('STATIC_COMPRESS_MIN_BYTES', 1024))
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+# Vite names bundled files like assets/index-BXq3f9aZ.js
+HASHED_NAME_RE = re.compile(r'(^|/)assets/.+[-.][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml',
+                      'application/xml', 'application/wasm', 'font/ttf', 'font/otf')
+# Preferred order when the client accepts several encodings
+ENCODINGS = ('br', 'gzip')
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def _brotli_compress(data):
+    try:
+        import brotli  # Optional dependency
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=11)
+
+def accepted_encodings(header):
+    """
+    Content codings from an Accept-Encoding header, without those refused with q=0.
+    """
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    if '*' in accepted:
+        accepted.update(ENCODINGS)
+    return accepted
+
+
+class Asset:
+    def __init__(self, relpath, content, variants):
+        self.relpath = relpath
+        self.mimetype = mimetypes.guess_type(relpath)[0] or 'application/octet-stream'
+        self.immutable = bool(HASHED_NAME_RE.search(relpath))
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if self.immutable else REVALIDATE_CACHE_CONTROL
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        # Each representation needs its own strong ETag
+        self.representations = {None: (content, f'"{digest}"')}
+        for encoding, data in variants.items():
+            self.representations[encoding] = (data, f'"{digest}-{encoding}"')
+
+    def select(self, accept_encoding):
+        """
+        Returns (encoding or None, body, etag) for the best representation the client accepts.
+        """
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in accepted and encoding in self.representations:
+                return (encoding,) + self.representations[encoding]
+        return (None,) + self.representations[None]
+
+
+class StaticIndex:
+    """
+    Read-only map of relative path -> Asset, built once from a directory.
+    """
+
+    def __init__(self, root=STATIC_DIR):
+        self.root = root
+        self.assets = {}
+        self.total_bytes = 0
+        if os.path.isdir(root):
+            self._build()
+
+    def _build(self):
+        files = set()
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                files.add(os.path.relpath(os.path.join(dirpath, name), self.root).replace(os.sep, '/'))
+        for relpath in sorted(files):
+            if relpath.endswith(('.gz', '.br')) and relpath[:-3] in files:
+                continue  # Precompressed variant, attached to its original below
+            with open(os.path.join(self.root, relpath), 'rb') as f:
+                content = f.read()
+            asset = Asset(relpath, content, self._variants(relpath, content, files))
+            self.assets[relpath] = asset
+            self.total_bytes += sum(len(body) for body, _ in asset.representations.values())
+
+    def _variants(self, relpath, content, files):
+        variants = {}
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            if relpath + suffix in files:
+                with open(os.path.join(self.root, relpath + suffix), 'rb') as f:
+                    variants[encoding] = f.read()
+        mimetype = mimetypes.guess_type(relpath)[0] or ''
+        if len(content) < STATIC_COMPRESS_MIN_BYTES or not mimetype.startswith(COMPRESSIBLE_TYPES):
+            return variants
+        if 'gzip' not in variants:
+            variants['gzip'] = gzip.compress(content, compresslevel=9, mtime=0)
+        if 'br' not in variants:
+            compressed = _brotli_compress(content)
+            if compressed is not None:
+                variants['br'] = compressed
+        # Only keep variants that are worth the Content-Encoding
+        return {encoding: data for encoding, data in variants.items() if len(data) < len(content) * 0.9}
+
+    def get(self, path):
+        return self.assets.get(path.lstrip('/'))
+
+    def stats(self):
+        return {
+            'root': self.root,
+            'files': len(self.assets),
+            'immutable': sum(1 for asset in self.assets.values() if asset.immutable),
+            'memory_bytes': self.total_bytes,
+            'encodings': sorted({encoding for asset in self.assets.values() for encoding in asset.representations if encoding})
+        }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_index(root=STATIC_DIR):
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = StaticIndex(root)
+    return _index
@@ -0,0 +1,20 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the suite off the real caches, queues and webhook before any module reads its config
+_scratch = tempfile.mkdtemp(prefix='resume-tests-')
+for name, value in {
+    'EXTRACTION_CACHE_DIR': os.path.join(_scratch, 'extraction'),
+    'JOBS_DIR': os.path.join(_scratch, 'jobs'),
+    'DEDUP_DIR': os.path.join(_scratch, 'dedup'),
+    'DRIFT_DIR': os.path.join(_scratch, 'drift'),
+    'WEBHOOK_SPILL_DIR': os.path.join(_scratch, 'webhooks'),
+    'N8N_WEBHOOK_URL': 'http://127.0.0.1:9/webhook',
+    'OCR_POOL_MODE': 'inline',
+    'JOB_AUTOSTART': '0',
+    'WARMUP_MODE': 'off',
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+import admission
+
+
+def test_slot_is_handed_to_the_oldest_waiter():
+    gate = admission.AdmissionGate('test', concurrency=1, queue_size=2, max_wait=5)
+    gate.acquire()
+    order = []
+
+    def waiter(name):
+        gate.acquire()
+        order.append(name)
+
+    threads = []
+    for name in ('first', 'second'):
+        thread = threading.Thread(target=waiter, args=(name,))
+        thread.start()
+        threads.append(thread)
+        while gate.stats()['queue_depth'] < len(threads):
+            time.sleep(0.005)
+
+    gate.release(0.1)
+    threads[0].join(2)
+    assert order == ['first']
+    assert gate.stats()['in_flight'] == 1  # Handed over, never freed in between
+
+    gate.release(0.1)
+    threads[1].join(2)
+    gate.release(0.1)
+    assert order == ['first', 'second']
+    assert gate.stats()['in_flight'] == 0
+
+
+def test_full_queue_is_shed_with_retry_after():
+    gate = admission.AdmissionGate('test', concurrency=1, queue_size=0, max_wait=5)
+    gate.acquire()
+    gate.release(4.0)
+    gate.acquire()
+
+    with pytest.raises(admission.Overloaded) as excinfo:
+        gate.acquire()
+
+    assert excinfo.value.retry_after == 4
+    assert gate.stats()['shed'] == {'queue_full': 1, 'timeout': 0}
+
+
+def test_wait_timeout_is_shed_and_leaves_the_queue():
+    gate = admission.AdmissionGate('test', concurrency=1, queue_size=1, max_wait=0.05)
+    gate.acquire()
+
+    with pytest.raises(admission.Overloaded):
+        gate.acquire()
+
+    stats = gate.stats()
+    assert stats['shed']['timeout'] == 1
+    assert stats['queue_depth'] == 0
+    gate.release()
+    gate.acquire()  # The abandoned wait did not consume the slot
+
+
+def test_endpoint_classes():
+    assert admission.get_gate('predict_pdf') is admission.get_gate('predict_batch_pdf')
+    assert admission.get_gate('predict') is not admission.get_gate('predict_pdf')
+    assert admission.get_gate('get_stats') is None
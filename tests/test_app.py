@@ -0,0 +1,186 @@
+import io
+import json
+
+import pytest
+
+import app
+
+TEXT = 'Jane Doe\njane@example.com\nSkills: Python, SQL, Docker\nExperience: 5 years\nEducation: BSc'
+PARSED = {'skills': 'python sql docker', 'experience_years': 5.0, 'education': 'BSc', 'email': 'jane@example.com', 'name': 'Jane Doe'}
+RESPONSE = {
+    'class_id': 1, 'class_label': 'IT Resume', 'confidence_score': 0.9, 'verdict': 'IT Ready',
+    'parsed_data': dict(PARSED, skills='python...'), 'filename': 'jane.pdf'
+}
+
+
+def fresh_response(*args, **kwargs):
+    return dict(RESPONSE, parsed_data=dict(RESPONSE['parsed_data']))
+
+
+@pytest.fixture
+def webhooks(monkeypatch):
+    sent = []
+    monkeypatch.setattr(app, 'trigger_n8n_webhook', sent.append)
+    monkeypatch.setattr(app.utils, 'extract_text_from_file_cached', lambda content, filename: TEXT)
+    monkeypatch.setattr(app.utils, 'parse_resume_text', lambda text: dict(PARSED))
+    monkeypatch.setattr(app, 'find_duplicate', lambda *args: (None, None))
+    monkeypatch.setattr(app.predictor, 'get_prediction_data', fresh_response)
+    monkeypatch.setattr(app.predictor, 'get_prediction_batch', lambda records: [fresh_response()])
+    return sent
+
+
+def test_job_webhook_payload_matches_predict_pdf(webhooks, tmp_path):
+    upload = tmp_path / 'jane.pdf'
+    upload.write_bytes(b'%PDF')
+
+    response = app.app.test_client().post('/predict_pdf', data={'file': (io.BytesIO(b'%PDF'), 'jane.pdf')})
+    app.run_job('jane.pdf', str(upload))
+
+    assert response.status_code == 200
+    assert response.json['parsed_data']['skills'] == 'python...'
+    sync, job = webhooks
+    assert sync == job
+    assert job['full_text'] == TEXT
+    assert job['filename'] == 'jane.pdf'
+    assert job['parsed_data']['skills'] == 'python sql docker'
+
+
+def test_fallback_results_are_not_remembered(monkeypatch):
+    added = []
+
+    class Index:
+        def add(self, *args):
+            added.append(args)
+
+    monkeypatch.setattr(app.dedup_index, 'get_index', Index)
+    monkeypatch.setattr(app.predictor, 'get_model_version', lambda: 'v1')
+
+    app.remember_result(('sig', 'jane@example.com'), dict(RESPONSE, fallback=True))
+    app.remember_result(('sig', 'jane@example.com'), dict(RESPONSE, class_label='Error'))
+    app.remember_result(('sig', 'jane@example.com'), RESPONSE)
+
+    assert len(added) == 1
+
+
+def test_scoring_exception_marks_fallback(monkeypatch):
+    def broken(records):
+        raise RuntimeError('scorer failed')
+
+    monkeypatch.setattr(app.predictor, 'predict_confidence', broken)
+
+    response = app.predictor.get_prediction_batch([{'skills': 'python', 'experience_years': 2.0, 'education': 'BSc'}])[0]
+
+    assert response['fallback'] is True
+    assert response['class_label'] == 'IT Resume'
+
+
+def test_batch_does_not_load_pickle_when_compact_scorer_is_available(webhooks, monkeypatch):
+    loaded = []
+    monkeypatch.setattr(app.predictor, 'get_scorer', lambda: object())
+    monkeypatch.setattr(app.predictor, 'get_model', lambda: loaded.append('pickle'))
+
+    response = app.app.test_client().post('/predict_batch_pdf', data={'files[]': [(io.BytesIO(b'%PDF'), 'jane.pdf')]})
+
+    assert response.status_code == 200
+    assert loaded == []
+
+
+def test_overloaded_endpoint_sheds_with_503_and_releases_slots(monkeypatch):
+    gate = app.admission.AdmissionGate('light', concurrency=1, queue_size=0, max_wait=0)
+    monkeypatch.setattr(app.admission, 'get_gate', lambda endpoint: gate if endpoint == 'predict' else None)
+    monkeypatch.setattr(app.predictor, 'get_prediction_data', fresh_response)
+    monkeypatch.setattr(app, 'trigger_n8n_webhook', lambda payload: None)
+    client = app.app.test_client()
+
+    assert client.post('/predict', json={'skills': 'python'}).status_code == 200
+    assert gate.stats()['in_flight'] == 0
+
+    gate.acquire()
+    shed = client.post('/predict', json={'skills': 'python'})
+    assert shed.status_code == 503
+    assert int(shed.headers['Retry-After']) >= 1
+
+
+def test_predict_accepts_a_batch_of_records(monkeypatch):
+    sent, batches = [], []
+    monkeypatch.setattr(app, 'trigger_n8n_webhook', sent.append)
+
+    def batch(records):
+        batches.append(records)
+        return [fresh_response() for _ in records]
+
+    monkeypatch.setattr(app.predictor, 'get_prediction_batch', batch)
+    client = app.app.test_client()
+    items = [{'skills': 'python sql docker', 'experience_years': '5'}, {'skills': 'sales'}]
+
+    response = client.post('/predict', json={'records': items})
+    assert response.status_code == 200 and len(response.json['results']) == 2
+    assert client.post('/predict', json=items).status_code == 200
+
+    assert len(batches) == 2
+    assert batches[0][0] == {'skills': 'python sql docker', 'experience_years': 5.0, 'education': 'Unknown'}
+    # The webhook gets the full skills; the response keeps the truncated ones
+    assert [payload['parsed_data']['skills'] for payload in sent[:2]] == ['python sql docker', 'sales']
+    assert response.json['results'][0]['parsed_data']['skills'] == 'python...'
+
+
+@pytest.mark.parametrize('stream_format', ['ndjson', 'sse'])
+def test_streamed_batch_yields_one_record_per_file_then_a_summary(webhooks, monkeypatch, stream_format):
+    def extract(content, filename):
+        if filename == 'broken.pdf':
+            raise ValueError('unreadable')
+        return TEXT
+
+    monkeypatch.setattr(app.utils, 'extract_text_from_file_cached', extract)
+    files = [(io.BytesIO(b'%PDF'), 'jane.pdf'), (io.BytesIO(b'%PDF'), 'broken.pdf')]
+
+    response = app.app.test_client().post(f'/predict_batch_pdf?stream={stream_format}', data={'files[]': files})
+    body = response.get_data(as_text=True)
+    if stream_format == 'sse':
+        assert response.mimetype == 'text/event-stream'
+        records = [json.loads(line[len('data: '):]) for line in body.splitlines() if line.startswith('data: ')]
+        assert body.count('event: result\n') == 2 and body.count('event: summary\n') == 1
+    else:
+        assert response.mimetype == 'application/x-ndjson'
+        records = [json.loads(line) for line in body.splitlines()]
+
+    results, summary = records[:-1], records[-1]
+    assert sorted((r['index'], r['filename'], 'error' in r) for r in results) == [(0, 'jane.pdf', False), (1, 'broken.pdf', True)]
+    assert (summary['type'], summary['total'], summary['succeeded'], summary['failed']) == ('summary', 2, 1, 1)
+    assert response.headers['X-Accel-Buffering'] == 'no'
+
+
+def test_readiness_follows_warmup_while_liveness_does_not(monkeypatch):
+    state = app.warmup.Warmup()
+    monkeypatch.setattr(app.warmup, 'get_warmup', lambda: state)
+    client = app.app.test_client()
+
+    assert client.get('/healthz').status_code == 200
+    assert client.get('/readyz').status_code == 503
+    state.start(mode='off')
+    assert client.get('/readyz').status_code == 200
+
+
+def test_fast_pool_sends_uploads_to_the_heavy_pool(webhooks, monkeypatch):
+    monkeypatch.setitem(app.app.config, 'SERVING_ROLE', 'fast')
+    client = app.app.test_client()
+
+    rejected = client.post('/predict_pdf', data={'file': (io.BytesIO(b'%PDF'), 'jane.pdf')})
+    assert rejected.status_code == 421
+
+    monkeypatch.setattr(app, 'HEAVY_POOL_URL', 'http://heavy:5004')
+    redirected = client.post('/predict_batch_pdf?stream=ndjson', data={'files[]': [(io.BytesIO(b'%PDF'), 'jane.pdf')]})
+    assert redirected.status_code == 307
+    assert redirected.headers['Location'] == 'http://heavy:5004/predict_batch_pdf?stream=ndjson'
+
+    # JSON endpoints stay on the fast pool
+    assert client.post('/predict', json={'skills': 'python'}).status_code == 200
+
+
+def test_single_predict_keeps_truncated_skills_in_the_response(webhooks):
+    skills = 'python sql docker kubernetes ' * 10
+
+    response = app.app.test_client().post('/predict', json={'skills': skills, 'experience_years': 5})
+
+    assert response.json['parsed_data']['skills'] == 'python...'
+    assert webhooks[0]['parsed_data']['skills'] == skills
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+
+@pytest.fixture
+def run(monkeypatch):
+    # Importing the runner switches the stores off process-wide; undo that after the test
+    for name in ('DRIFT_STORE', 'DEDUP_INDEX', 'PREDICTION_CACHE'):
+        monkeypatch.setenv(name, '1')
+    import run
+    return run
+
+
+def test_summary_and_regression_check(run):
+    stats = run.summarize([0.004, 0.001, 0.002, 0.003], errors=1)
+    assert stats == {'count': 4, 'errors': 1, 'throughput_per_s': 400.0, 'mean_ms': 2.5,
+                     'p50_ms': 3.0, 'p95_ms': 4.0, 'p99_ms': 4.0}
+
+    baseline = {'parse': {'p50_ms': 1.0, 'p95_ms': 2.0}, 'predict': {'p50_ms': 0.01, 'p95_ms': 0.02}}
+    current = {'parse': {'p50_ms': 1.1, 'p95_ms': 3.0}, 'predict': {'p50_ms': 0.05, 'p95_ms': 0.02},
+               'extract.png': {'p50_ms': 50.0, 'p95_ms': 80.0}}
+    # Within the threshold, under the noise floor, or without a baseline: not a regression
+    assert run.compare(current, baseline, threshold=0.2) == ['parse p95_ms: 2.0 -> 3.0 (+50%)']
+
+
+def test_pareto_front_keeps_only_undominated_candidates():
+    import model_selection
+
+    results = [
+        {'name': 'sgd-500', 'accuracy': 0.90, 'row_p50_ms': 0.5, 'compact_row_p50_ms': 0.05},
+        {'name': 'logreg-5000', 'accuracy': 0.93, 'row_p50_ms': 0.6, 'compact_row_p50_ms': 0.08},
+        {'name': 'forest-500', 'accuracy': 0.92, 'row_p50_ms': 9.0, 'compact_row_p50_ms': None},
+        {'name': 'sgd-250', 'accuracy': 0.90, 'row_p50_ms': 0.4, 'compact_row_p50_ms': 0.05}
+    ]
+    assert model_selection.pareto_front(results) == {'sgd-500', 'sgd-250', 'logreg-5000'}
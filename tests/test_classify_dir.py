@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def classify_dir(monkeypatch):
+    # Importing the CLI switches drift recording off process-wide; undo that after the test
+    monkeypatch.setenv('DRIFT_STORE', '1')
+    import classify_dir
+    monkeypatch.setattr(classify_dir.predictor, 'get_prediction_batch',
+                        lambda records: [{'class_id': 1, 'filename': record['filename']} for record in records])
+    return classify_dir
+
+
+def record(path):
+    return {'path': path, 'filename': path, 'skills': 'python', 'experience_years': 1.0, 'education': 'BSc'}
+
+
+def test_find_files_filters_extensions_and_excludes_outputs(classify_dir, tmp_path):
+    (tmp_path / 'nested').mkdir()
+    for name in ('b.pdf', 'a.PNG', 'notes.txt', 'nested/c.tiff', 'results.jsonl'):
+        (tmp_path / name).write_bytes(b'')
+
+    found = classify_dir.find_files(str(tmp_path), classify_dir.EXTENSIONS + ('.jsonl',),
+                                    exclude=(str(tmp_path / 'results.jsonl'),))
+    assert found == ['a.PNG', 'b.pdf', 'nested/c.tiff']
+
+
+def test_resume_drops_uncommitted_output_and_skips_done_files(classify_dir, tmp_path):
+    output, checkpoint_path = str(tmp_path / 'out.jsonl'), str(tmp_path / 'out.checkpoint')
+
+    classifier = classify_dir.BulkClassifier(str(tmp_path), output, classify_dir.Checkpoint(checkpoint_path), batch_size=2)
+    classifier.add(record('a.pdf'))
+    classifier.add({'path': 'b.pdf', 'filename': 'b.pdf', 'error': 'Text extraction failed'})
+    # Simulate a crash after a batch was written but before it was checkpointed
+    classifier.output.write(b'{"path": "c.pdf"}\n')
+    classifier.output.close()
+    with open(checkpoint_path, 'a') as f:
+        f.write('{"offset": 9')  # Torn final line
+
+    checkpoint = classify_dir.Checkpoint(checkpoint_path)
+    assert checkpoint.done == {'a.pdf', 'b.pdf'}
+    classifier = classify_dir.BulkClassifier(str(tmp_path), output, checkpoint, batch_size=2)
+    classifier.add(record('c.pdf'))
+    classifier.close()
+
+    with open(output) as f:
+        results = [json.loads(line) for line in f]
+    assert [(r['path'], 'error' in r) for r in results] == [('a.pdf', False), ('b.pdf', True), ('c.pdf', False)]
+
+    # The commit after the torn line is readable on the next resume
+    checkpoint = classify_dir.Checkpoint(checkpoint_path)
+    assert checkpoint.done == {'a.pdf', 'b.pdf', 'c.pdf'}
+    checkpoint.close()
+
+
+def test_interrupted_batch_is_not_written_twice(classify_dir, tmp_path, monkeypatch):
+    output, checkpoint_path = str(tmp_path / 'out.jsonl'), str(tmp_path / 'out.checkpoint')
+    checkpoint = classify_dir.Checkpoint(checkpoint_path)
+    classifier = classify_dir.BulkClassifier(str(tmp_path), output, checkpoint, batch_size=2)
+
+    def interrupted(offset, paths):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(checkpoint, 'commit', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        try:
+            classifier.add(record('a.pdf'))
+            classifier.add(record('b.pdf'))
+        finally:
+            classifier.close()
+
+    with open(output) as f:
+        assert [json.loads(line)['path'] for line in f] == ['a.pdf', 'b.pdf']
+    # Never checkpointed: the next run drops those lines and redoes both files
+    assert classify_dir.Checkpoint(checkpoint_path).done == set()
+
+
+def test_output_shorter_than_its_checkpoint_is_refused(classify_dir, tmp_path):
+    output, checkpoint_path = tmp_path / 'out.jsonl', str(tmp_path / 'out.checkpoint')
+    classifier = classify_dir.BulkClassifier(str(tmp_path), str(output), classify_dir.Checkpoint(checkpoint_path), batch_size=1)
+    classifier.add(record('a.pdf'))
+    classifier.close()
+    output.unlink()
+
+    with pytest.raises(ValueError, match='--restart'):
+        classify_dir.BulkClassifier(str(tmp_path), str(output), classify_dir.Checkpoint(checkpoint_path), batch_size=1)
+    assert not output.exists()
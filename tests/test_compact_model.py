@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+import compact_model
+
+FRAME = pd.DataFrame({
+    'skills': ['python sql docker', 'java spring kubernetes', 'sales negotiation crm',
+               'nursing patient care', 'python machine learning', 'accounting excel audit'],
+    'education': ['BSc', 'MSc', 'BA', 'Diploma', 'PhD', 'BA'],
+    'experience_years': [5.0, 3.0, 7.0, 2.0, 1.0, 10.0]
+})
+LABELS = [1, 1, 0, 0, 1, 0]
+
+
+def pipeline(numeric='passthrough'):
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('text', TfidfVectorizer(max_features=500), 'skills'),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), ['education'])
+        ],
+        remainder=numeric
+    )
+    return Pipeline([
+        ('preprocessor', preprocessor),
+        ('classifier', SGDClassifier(loss='log_loss', random_state=42, max_iter=1000, tol=1e-3))
+    ]).fit(FRAME, LABELS)
+
+
+def test_scorer_matches_the_pipeline(tmp_path):
+    model = pipeline()
+    model_path = tmp_path / 'model.pkl'
+    model_path.write_bytes(b'pickled model')
+    compact_model.export(model, str(tmp_path / 'compact'), model_path=str(model_path))
+
+    scorer = compact_model.CompactScorer.load(str(tmp_path / 'compact'), model_path=str(model_path))
+    # Unknown education and out-of-vocabulary skills go through the same paths as in sklearn
+    records = FRAME.to_dict('records') + [{'skills': 'python golang', 'education': 'MBA', 'experience_years': 4.0},
+                                          {'skills': '', 'education': 'BSc', 'experience_years': 0.0}]
+    expected = model.predict_proba(pd.DataFrame(records))
+    np.testing.assert_allclose(scorer.predict_proba(records), expected, rtol=1e-9, atol=1e-12)
+
+    model_path.write_bytes(b'retrained model')
+    assert compact_model.CompactScorer.load(str(tmp_path / 'compact'), model_path=str(model_path)) is None
+
+
+def test_export_rejects_transformers_it_cannot_reproduce(tmp_path):
+    with pytest.raises(compact_model.UnsupportedModel):
+        compact_model.export(pipeline(numeric=StandardScaler()), str(tmp_path / 'compact'))
+    assert not (tmp_path / 'compact').exists()
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+import dedup_index
+
+RESUME = ' '.join(
+    'Senior backend engineer with {n} years building Python services, PostgreSQL schemas, '
+    'Kafka pipelines and Kubernetes deployments for payments teams.'.format(n=n) for n in range(12)
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return dedup_index.DuplicateIndex(str(tmp_path), threshold=0.85)
+
+
+def test_light_edit_is_a_duplicate_for_same_identity(index):
+    result = {'class_label': 'IT Resume', 'confidence_score': 0.97}
+    entry_id = index.add(dedup_index.signature(RESUME), 'v1', 'jane@example.com', 'jane.pdf', result)
+
+    edited = dedup_index.signature(RESUME.replace('payments teams.', 'payment teams!', 1))
+    match = index.lookup(edited, 'v1', 'jane@example.com')
+
+    assert match['id'] == entry_id
+    assert match['result'] == result
+    assert match['similarity'] >= 0.85
+
+
+def test_other_identity_model_or_text_does_not_match(index):
+    index.add(dedup_index.signature(RESUME), 'v1', 'jane@example.com', 'jane.pdf', {})
+
+    assert index.lookup(dedup_index.signature(RESUME), 'v1', 'john@example.com') is None
+    assert index.lookup(dedup_index.signature(RESUME), 'v2', 'jane@example.com') is None
+    other = 'Registered nurse with ICU experience, patient care, triage and medication administration. ' * 10
+    assert index.lookup(dedup_index.signature(other), 'v1', 'jane@example.com') is None
+
+
+def test_purge_removes_entries_and_bands_in_batches(index, monkeypatch):
+    old = time.time() - 1000
+    monkeypatch.setattr(dedup_index.time, 'time', lambda: old)
+    for n in range(5):
+        index.add(dedup_index.signature(RESUME + f' variant {n}'), 'v1', f'user{n}@example.com', None, {})
+    monkeypatch.undo()
+    index.add(dedup_index.signature(RESUME), 'v1', 'fresh@example.com', None, {})
+
+    assert index.purge(older_than=500, batch_size=2) == 5
+
+    conn = index._connect()
+    assert conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0] == 1
+    assert conn.execute('SELECT COUNT(*) FROM bands').fetchone()[0] == dedup_index.BANDS
+
+
+def test_candidate_identity():
+    assert dedup_index.candidate_identity(' Jane@Example.com ') == 'jane@example.com'
+    assert dedup_index.candidate_identity('Unknown', 'Jane  DOE') == 'jane doe'
+    assert dedup_index.candidate_identity(None) == ''
+
+
+def test_signature_matches_exact_integer_arithmetic():
+    text = 'Senior Python engineer, SQL and Docker. Kubernetes operations and cloud migrations.'
+    perm_a, perm_b = dedup_index._get_permutations()
+    assert int(perm_a.max()) < 2 ** 32 and int(perm_b.max()) < 2 ** 32
+
+    expected = [
+        min((int(a) * x + int(b)) % dedup_index.MERSENNE_PRIME & dedup_index.MAX_HASH for x in dedup_index.shingles(text))
+        for a, b in zip(perm_a, perm_b)
+    ]
+    assert dedup_index.signature(text).tolist() == expected
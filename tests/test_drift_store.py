@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+import drift_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(drift_store, 'DRIFT_FLUSH_INTERVAL', 0.05)
+    return drift_store.DriftStore(str(tmp_path))
+
+
+def test_window_rolls_up_counts_ratio_and_histogram(store):
+    now = time.time()
+    store.record([(1, 0.97), (0, 0.55), (1, 0.72)], now=now)
+    store.record([(1, 0.99)], now=now - 120)
+
+    window = store.window(600, now=now)
+
+    assert window['resolution'] == drift_store.MINUTE
+    assert window['count'] == 4
+    assert window['it_ratio'] == 0.75
+    assert window['avg_confidence'] == round((0.97 + 0.55 + 0.72 + 0.99) / 4, 4)
+    histogram = window['confidence_histogram']
+    assert histogram['0.5-0.6'] == 1
+    assert histogram['0.7-0.8'] == 1
+    assert histogram['0.95-0.99'] == 2
+    assert [bucket['count'] for bucket in window['series']] == [1, 3]
+
+
+def test_long_windows_use_hour_buckets_and_compare_with_baseline(store):
+    now = time.time()
+    store.record([(0, 0.95)] * 10, now=now - 3 * 86400)
+    store.record([(1, 0.6)] * 10, now=now)
+
+    window = store.window(86400, now=now)
+
+    assert window['resolution'] == drift_store.HOUR
+    assert window['count'] == 10
+    assert window['baseline']['count'] == 10
+    assert window['baseline']['it_ratio_delta'] == 1.0
+    assert window['baseline']['psi'] > 0.2
+
+
+def test_idle_worker_counts_are_flushed_in_the_background(store):
+    store.record([(1, 0.9)])
+    reader = drift_store.DriftStore(os.path.dirname(store.db_path))
+
+    deadline = time.time() + 2
+    while reader.window(600)['count'] == 0 and time.time() < deadline:
+        time.sleep(0.02)
+
+    assert reader.window(600)['count'] == 1
+
+
+def test_forked_child_does_not_flush_parent_counts(store):
+    store._ensure_flusher()
+    store._pid = -1  # As seen from a forked child
+    minute = int(time.time() // drift_store.MINUTE) * drift_store.MINUTE
+    store._pending[(drift_store.MINUTE, minute)] = [1, 1, 0.9] + [0] * len(drift_store.HIST_COLUMNS)
+
+    store.flush()
+
+    assert store._pending == {}
+    assert store.window(600)['count'] == 0
+
+
+def test_parse_window():
+    assert drift_store.parse_window('15m') == 900
+    assert drift_store.parse_window('7d') == 7 * 86400
+    assert drift_store.parse_window(None) == drift_store.HOUR
+    with pytest.raises(ValueError):
+        drift_store.parse_window('-1h')
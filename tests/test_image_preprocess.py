@@ -0,0 +1,72 @@
+import io
+
+import pytest
+from PIL import Image
+
+import image_preprocess
+
+
+def reopen(image, fmt, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **params)
+    buffer.seek(0)
+    return Image.open(buffer)
+
+
+@pytest.mark.parametrize('mode, transparency', [
+    ('RGB', (255, 0, 0)),
+    ('L', 200),
+])
+def test_trns_transparency_is_flattened_onto_white(mode, transparency):
+    image = Image.new(mode, (40, 20), transparency)
+    image.paste(Image.new(mode, (10, 10), 'black' if mode == 'L' else (1, 1, 1)), (0, 0))
+    source = reopen(image, 'PNG', transparency=transparency)
+    assert 'transparency' in source.info
+
+    prepared = image_preprocess.prepare(source, max_side=100)
+
+    assert prepared.mode == 'L'
+    assert prepared.getpixel((30, 15)) == 255  # Transparent background became paper
+    assert prepared.getpixel((2, 2)) < 10      # Opaque ink kept
+
+
+def test_palette_transparency_and_rgba():
+    palette = reopen(Image.new('P', (20, 20), 0), 'PNG', transparency=0)
+    rgba = Image.new('RGBA', (20, 20), (0, 0, 0, 0))
+
+    for source in (palette, rgba):
+        prepared = image_preprocess.prepare(source, max_side=100)
+        assert prepared.mode == 'L'
+        assert prepared.getpixel((5, 5)) == 255
+
+
+def test_downscales_to_max_side_and_keeps_aspect():
+    source = reopen(Image.new('RGB', (4000, 2000), 'white'), 'JPEG')
+
+    prepared = image_preprocess.prepare(source, max_side=1000)
+
+    assert max(prepared.size) == 1000
+    assert prepared.size[1] == 500
+    assert prepared.mode == 'L'
+
+
+def test_sixteen_bit_scan_is_rescaled_not_clipped():
+    source = Image.new('I;16', (10, 10), 32768)
+
+    prepared = image_preprocess.prepare(source, max_side=100)
+
+    assert prepared.getpixel((0, 0)) == 128
+
+
+def test_pixel_limit():
+    with pytest.raises(image_preprocess.ImageTooLarge):
+        image_preprocess.prepare(Image.new('L', (100, 100)), max_side=0, max_pixels=9999)
+
+
+def test_iter_frames_is_bounded():
+    pages = [Image.new('1', (30, 30), color) for color in (0, 1, 0)]
+    source = reopen(pages[0], 'TIFF', save_all=True, append_images=pages[1:])
+
+    colors = [image_preprocess.prepare(frame, max_side=100).getpixel((0, 0)) for frame in image_preprocess.iter_frames(source, max_frames=2)]
+
+    assert colors == [0, 255]
@@ -0,0 +1,111 @@
+import io
+import os
+import time
+import threading
+
+import pytest
+
+import jobs
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return jobs.JobQueue(str(tmp_path))
+
+
+def test_claim_is_fifo_and_exclusive(queue):
+    first = queue.submit('a.pdf', io.BytesIO(b'a'))
+    queue.submit('b.pdf', io.BytesIO(b'b'))
+
+    assert queue.claim()['id'] == first
+    assert queue.claim()['filename'] == 'b.pdf'
+    assert queue.claim() is None
+
+
+def test_exception_is_retried_until_max_attempts(queue, monkeypatch):
+    monkeypatch.setattr(jobs, 'JOB_MAX_ATTEMPTS', 2)
+    job_id = queue.submit('a.pdf', io.BytesIO(b'a'))
+    row = queue.claim()
+
+    queue.fail(job_id, 'boom', row['attempts'] + 1)
+    assert queue.get(job_id)['status'] == 'queued'
+    row = queue.claim()
+    queue.fail(job_id, 'boom', row['attempts'] + 1)
+
+    job = queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 2
+
+
+def test_lease_expired_job_fails_after_max_attempts(queue, monkeypatch):
+    # A file that kills its worker: the lease lapses every time
+    monkeypatch.setattr(jobs, 'JOB_MAX_ATTEMPTS', 2)
+    monkeypatch.setattr(jobs, 'JOB_LEASE_SECONDS', -1)
+    job_id = queue.submit('crash.pdf', io.BytesIO(b'x'))
+    path = queue.claim()['file_path']
+
+    assert queue.claim()['id'] == job_id
+    assert queue.claim() is None
+
+    job = queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert 'Worker stopped' in job['error']
+    assert not os.path.exists(path)
+
+
+def test_worker_renews_lease_of_long_job(queue, monkeypatch):
+    monkeypatch.setattr(jobs, 'JOB_LEASE_SECONDS', 0.3)
+    release = threading.Event()
+    calls = []
+
+    def handler(filename, path):
+        calls.append(filename)
+        release.wait(5)
+        return {'ok': True}
+
+    job_id = queue.submit('slow.pdf', io.BytesIO(b'x'))
+    workers = jobs.JobWorkers(queue, handler, workers=1)
+    thread = threading.Thread(target=workers._process, args=(queue.claim(),))
+    thread.start()
+    try:
+        time.sleep(0.8)  # Well past the original lease
+        assert queue.claim() is None
+    finally:
+        release.set()
+        thread.join()
+
+    assert calls == ['slow.pdf']
+    assert queue.get(job_id)['result'] == {'ok': True}
+
+
+def test_job_failed_is_not_retried(queue):
+    def handler(filename, path):
+        raise jobs.JobFailed('No text')
+
+    job_id = queue.submit('a.pdf', io.BytesIO(b'a'))
+    jobs.JobWorkers(queue, handler, workers=1)._process(queue.claim())
+
+    job = queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert job['error'] == 'No text'
+    assert job['attempts'] == 1
+
+
+def test_late_worker_cannot_overwrite_the_reclaimed_attempt(queue, monkeypatch):
+    monkeypatch.setattr(jobs, 'JOB_LEASE_SECONDS', -1)
+    job_id = queue.submit('slow.pdf', io.BytesIO(b'x'))
+    stale = queue.claim()
+    monkeypatch.setattr(jobs, 'JOB_LEASE_SECONDS', 600)
+    current = queue.claim()
+    assert current['id'] == job_id
+
+    # The first worker finishes after its lease lapsed: its outcome is discarded
+    workers = jobs.JobWorkers(queue, lambda filename, path: {'from': 'stale'}, workers=1)
+    workers._run_handler(stale)
+    assert not queue.fail(job_id, 'boom', stale['attempts'] + 1)
+    assert queue.get(job_id)['status'] == 'running'
+    assert workers.stats()['lost_leases'] == 1
+
+    assert queue.complete(job_id, {'from': 'current'}, current['attempts'] + 1)
+    job = queue.get(job_id)
+    assert (job['status'], job['result'], job['attempts']) == ('done', {'from': 'current'}, 2)
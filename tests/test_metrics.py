@@ -0,0 +1,51 @@
+import gc
+import threading
+
+import pytest
+
+import metrics
+
+
+def run_threads(target, count):
+    for _ in range(count):
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+
+def test_counter_folds_shards_of_exited_threads():
+    counter = metrics.Counter('test_total', 'Test.', labelnames=('label',))
+    run_threads(lambda: counter.inc(label='it'), 500)
+    counter.inc(label='non_it')
+
+    assert len(counter._shards) <= 2
+    assert counter.value(label='it') == 500
+    assert counter.value() == 501
+
+
+def test_histogram_folds_shards_of_exited_threads():
+    histogram = metrics.Histogram('test_seconds', 'Test.', buckets=(0.5, 1.0))
+    run_threads(lambda: histogram.observe(0.7), 300)
+    histogram.observe(0.2)
+
+    assert len(histogram._shards) <= 2
+    cumulative, total, count = histogram.collect()[()]
+    assert cumulative == [1, 301, 301]
+    assert count == 301
+    assert abs(total - (300 * 0.7 + 0.2)) < 1e-9
+
+
+def test_render_prometheus_text():
+    registry = metrics.Registry()
+    counter = registry.register(metrics.Counter('test_render_total', 'Rendered.', labelnames=('label',)))
+    counter.inc(2, label='a"b')
+
+    text = registry.render()
+    assert '# TYPE test_render_total counter' in text
+    assert 'test_render_total{label="a\\"b"} 2' in text
+
+
+def test_sharded_base_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        metrics._Sharded('x', 'x')
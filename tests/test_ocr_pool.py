@@ -0,0 +1,55 @@
+import os
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+
+import ocr_pool
+
+
+def crash():
+    os._exit(1)
+
+
+def test_late_broken_callback_keeps_replacement_executor():
+    pool = ocr_pool.OCRPool(workers=1, queue_size=2, mode='process')
+    old = pool._get_executor()
+    pool._reset_executor(old)
+    replacement = pool._get_executor()
+
+    # A callback from a task of the old pool arrives after the replacement started
+    pool._slots.acquire()
+    pool.in_flight += 1
+    future = concurrent.futures.Future()
+    future.set_exception(BrokenProcessPool())
+    pool._on_done(old, future)
+
+    assert pool._executor is replacement
+    assert pool.run(abs, -3) == 3
+    assert pool.stats()['in_flight'] == 0
+    pool.shutdown()
+
+
+def test_pool_recovers_after_worker_crash():
+    pool = ocr_pool.OCRPool(workers=1, queue_size=2, mode='process')
+    future = pool.submit(crash)
+    try:
+        future.result()
+    except BrokenProcessPool:
+        pass
+
+    assert pool.run(abs, -5) == 5
+    stats = pool.stats()
+    assert stats['failed'] == 1
+    assert stats['completed'] == 1
+    pool.shutdown()
+
+
+def test_binarize_splits_ink_from_paper():
+    from PIL import Image
+
+    image = Image.new('L', (20, 10), 220)
+    image.paste(40, (0, 0, 10, 10))
+
+    binary = ocr_pool.binarize(image)
+
+    assert binary.getpixel((2, 2)) == 0
+    assert binary.getpixel((15, 5)) == 255
@@ -0,0 +1,46 @@
+import prediction_cache
+
+
+def key(skills, experience=3, education='BSc'):
+    return prediction_cache.feature_key({'skills': skills, 'experience_years': experience, 'education': education}, 'v1')
+
+
+def test_feature_key_normalizes_skills_only():
+    assert key('Python  SQL') == key('python sql')
+    assert key('python', education='BSc') != key('python', education='bsc')
+    assert key('python', experience=True) is None
+    assert key('python', experience='3') is None
+
+
+def test_lru_evicts_least_recently_used():
+    cache = prediction_cache.PredictionCache(max_entries=2, ttl=60)
+    cache.put(key('a'), (1, 0.9))
+    cache.put(key('b'), (0, 0.8))
+    cache.get_many([key('a')])
+    cache.put(key('c'), (1, 0.7))
+
+    assert cache.get_many([key('a'), key('b'), key('c')]) == [(1, 0.9), None, (1, 0.7)]
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(prediction_cache.time, 'monotonic', lambda: clock[0])
+    cache = prediction_cache.PredictionCache(max_entries=10, ttl=5)
+    cache.put(key('a'), (1, 0.9))
+
+    assert cache.get_many([key('a')]) == [(1, 0.9)]
+    clock[0] += 6
+    assert cache.get_many([key('a')]) == [None]
+    stats = cache.stats()
+    assert stats['expirations'] == 1
+    assert stats['entries'] == 0
+    assert stats['memory_bytes'] == 0
+
+
+def test_uncacheable_keys_are_misses():
+    cache = prediction_cache.PredictionCache(max_entries=10, ttl=60)
+    cache.put(None, (1, 0.9))
+
+    assert cache.get_many([None]) == [None]
+    assert cache.stats()['entries'] == 0
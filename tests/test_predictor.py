@@ -0,0 +1,50 @@
+import pytest
+
+import predictor
+
+
+class Scorer:
+    classes = [0, 1]
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, records):
+        self.calls.append(len(records))
+        return [[0.2, 0.8] if 'python' in record['skills'] else [0.7, 0.3] for record in records]
+
+
+@pytest.fixture
+def scorer(monkeypatch):
+    scorer = Scorer()
+    monkeypatch.setattr(predictor, 'get_scorer', lambda: scorer)
+    monkeypatch.setattr(predictor.prediction_cache, 'PREDICTION_CACHE_ENABLED', False)
+    monkeypatch.setattr(predictor.drift_store, 'DRIFT_ENABLED', False)
+    return scorer
+
+
+def record(skills, filename):
+    return {'skills': skills, 'experience_years': 2.0, 'education': 'BSc', 'filename': filename}
+
+
+def test_batch_is_scored_in_one_call_and_keeps_order(scorer):
+    responses = predictor.get_prediction_batch([record('python sql', 'a.pdf'), record('sales', 'b.pdf'), record('python', 'c.pdf')])
+
+    assert scorer.calls == [3]
+    assert [(r['filename'], r['class_label'], r['confidence_score']) for r in responses] == [
+        ('a.pdf', 'IT Resume', 0.8), ('b.pdf', 'Non-IT Resume', 0.7), ('c.pdf', 'IT Resume', 0.8)
+    ]
+    assert predictor.get_prediction_batch([]) == [] and scorer.calls == [3]
+
+
+def test_scoring_errors_fall_back_and_are_flagged(scorer, monkeypatch):
+    def broken(records):
+        raise ValueError('bad features')
+
+    monkeypatch.setattr(scorer, 'predict_proba', broken)
+    responses = predictor.get_prediction_batch([record('sales', 'a.pdf')])
+    assert responses[0]['class_id'] == 1 and responses[0]['fallback'] is True
+
+    monkeypatch.setattr(predictor, 'predict_confidence', lambda records: None)
+    responses = predictor.get_prediction_batch([record('sales', 'a.pdf'), record('python', 'b.pdf')])
+    assert [(r['class_label'], r['filename']) for r in responses] == [('Error', 'a.pdf'), ('Error', 'b.pdf')]
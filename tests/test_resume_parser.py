@@ -0,0 +1,42 @@
+import resume_parser
+
+RESUME = """JOHN SMITH
+john.smith@Example.com | +1 555 123 45678
+Summary
+Backend engineer with 6.5+ years of experience.
+Education
+Bachelor of Science in Computer Science, MIT
+Skills
+Python • SQL; Docker | Kubernetes
+- AWS"""
+
+
+def test_parse_extracts_every_field():
+    assert resume_parser.parse_resume_text(RESUME) == {
+        'skills': 'python , sql, docker , kubernetes, aws',
+        'experience_years': 6.5,
+        'education': 'Bachelor Of Science In Computer Science, Mit',
+        'email': 'john.smith@example.com',
+        'name': 'John Smith'
+    }
+
+
+def test_degrees_follow_priority_then_line_length():
+    parsed = resume_parser.parse_resume_text('Ann Lee\nB.Sc Physics, 2010\nPh.D in Chemistry, 2016')
+    assert parsed['education'] == 'Ph.D In Chemistry, 2016'
+
+    # A degree line too long to be one is skipped for the next degree
+    parsed = resume_parser.parse_resume_text('Ann Lee\nMaster of ' + 'very long ' * 20 + '\nMBA')
+    assert parsed['education'] == 'Mba'
+
+
+def test_education_falls_back_to_the_section_body():
+    parsed = resume_parser.parse_resume_text('Education:\n\nState College Program\nSkills: none')
+    assert parsed['education'] == 'State College Program'
+    assert parsed['skills'] == ': none'
+
+
+def test_name_skips_contact_lines_and_headers():
+    assert resume_parser.extract_candidate_name('jane@x.io\n+44 7700 900123\nPROFILE\nJane  O\'Neil-Smith') == 'Jane  Oneil-Smith'
+    parsed = resume_parser.parse_resume_text('jane@x.io\nEXPERIENCE\n12 yrs')
+    assert (parsed['name'], parsed['experience_years'], parsed['education']) == (None, 12.0, 'Not Specified')
@@ -0,0 +1,56 @@
+import gzip
+
+import pytest
+
+import static_assets
+
+BUNDLE = 'assets/index-BXq3f9aZ.js'
+
+
+@pytest.fixture
+def dist(tmp_path):
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'index.html').write_text('<!doctype html><div id="root"></div>' + ' ' * 2000)
+    (tmp_path / BUNDLE).write_text('console.log("resume classifier");\n' * 200)
+    (tmp_path / (BUNDLE + '.br')).write_bytes(b'prebuilt-brotli')
+    (tmp_path / 'favicon.ico').write_bytes(b'\x00' * 10)
+    return tmp_path
+
+
+def test_index_variants_and_cache_headers(dist):
+    index = static_assets.StaticIndex(str(dist))
+    bundle = index.get('/' + BUNDLE)
+
+    assert bundle.cache_control == static_assets.IMMUTABLE_CACHE_CONTROL
+    assert index.get('index.html').cache_control == static_assets.REVALIDATE_CACHE_CONTROL
+    assert index.get(BUNDLE + '.br') is None  # Attached to its original, not served alone
+    assert 'gzip' not in index.get('favicon.ico').representations
+
+    encoding, body, etag = bundle.select('gzip, br')
+    assert (encoding, body) == ('br', b'prebuilt-brotli')
+    encoding, body, gzip_etag = bundle.select('gzip')
+    assert encoding == 'gzip'
+    assert gzip.decompress(body) == (dist / BUNDLE).read_bytes()
+    identity = bundle.select('br;q=0, gzip;q=0')
+    assert identity[0] is None
+    assert len({etag, gzip_etag, identity[2]}) == 3
+
+
+def test_serve_revalidates_with_304_and_falls_back_to_the_shell(dist, monkeypatch):
+    import app
+
+    index = static_assets.StaticIndex(str(dist))
+    monkeypatch.setattr(static_assets, 'get_index', lambda root=None: index)
+    client = app.app.test_client()
+
+    first = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert first.headers['Vary'] == 'Accept-Encoding'
+
+    again = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+
+    assert client.get('/history/42').headers['ETag'] == index.get('index.html').select(None)[2]
+    assert client.get('/assets/missing-12345678.js').status_code == 404
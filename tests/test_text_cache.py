@@ -0,0 +1,42 @@
+import os
+
+import text_cache
+
+
+def disk_usage(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files if f.endswith('.txt'))
+
+
+def test_memory_then_disk_tier(tmp_path):
+    cache = text_cache.ExtractionCache(str(tmp_path), memory_max_bytes=10, disk_max_bytes=10_000)
+    key = text_cache.content_key(b'resume', 'pdf')
+    cache.put(key, 'x' * 50)  # Too large for the memory tier
+
+    other_worker = text_cache.ExtractionCache(str(tmp_path))
+    assert other_worker.get(key) == 'x' * 50
+    assert other_worker.stats()['disk_hits'] == 1
+    assert cache.get('missing') is None
+
+
+def test_workers_sharing_the_disk_tier_stay_within_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_cache, 'DISK_MEASURE_INTERVAL', 0)
+    workers = [text_cache.ExtractionCache(str(tmp_path), memory_max_bytes=0, disk_max_bytes=5000) for _ in range(4)]
+
+    for i in range(200):
+        workers[i % 4].put(text_cache.content_key(str(i).encode()), 'y' * 100)
+
+    assert disk_usage(tmp_path) <= 5000
+    assert sum(worker.stats()['evictions'] for worker in workers) > 0
+
+
+def test_disk_walk_never_holds_the_cache_lock(tmp_path):
+    cache = text_cache.ExtractionCache(str(tmp_path))
+    scan = cache._scan_disk
+
+    def checked_scan():
+        assert not cache._lock.locked()
+        return scan()
+
+    cache._scan_disk = checked_scan
+    cache.put(text_cache.content_key(b'a'), 'text')
+    assert cache.stats()['disk_bytes'] == 4
@@ -0,0 +1,36 @@
+import concurrent.futures
+
+import timing
+
+
+def test_spans_from_executor_threads_land_in_the_request_breakdown():
+    token = timing.start_request()
+    try:
+        with timing.span('extract'):
+            pass
+
+        def score():
+            with timing.span('predict'):
+                pass
+
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            list(executor.map(lambda fn: fn(), [timing.propagate(score), timing.propagate(score)]))
+        stages = timing.breakdown()
+    finally:
+        timing.end_request(token)
+
+    assert stages['extract']['count'] == 1
+    assert stages['predict']['count'] == 2
+    header = timing.server_timing_header(stages)
+    assert header.startswith('extract;dur=') and ', predict;dur=' in header
+    assert timing.breakdown() == {}  # Outside a request nothing is collected
+
+
+def test_stage_percentiles_roll_over_the_window(monkeypatch):
+    monkeypatch.setattr(timing, '_windows', {})
+    for ms in range(1, 101):
+        timing._record('parse', ms / 1000)
+
+    parse = timing.stage_percentiles()['parse']
+    assert parse['count'] == 100
+    assert (parse['p50_ms'], parse['p99_ms'], parse['max_ms']) == (51.0, 99.0, 100.0)
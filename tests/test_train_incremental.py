@@ -0,0 +1,55 @@
+import json
+import sys
+
+import pandas as pd
+
+import train_incremental
+
+
+def test_progressive_accuracy_only_on_unseen_rows(tmp_path, monkeypatch, capsys):
+    rows = []
+    for i in range(60):
+        it = i % 2
+        rows.append({
+            'skills': 'python sql docker kubernetes' if it else 'nursing patient care triage',
+            'experience_years': i % 7,
+            'education': 'BSc Computer Science' if it else 'BSc Nursing',
+            'is_it_resume': it
+        })
+    data = tmp_path / 'rows.csv'
+    pd.DataFrame(rows).to_csv(data, index=False)
+    output = tmp_path / 'model.pkl'
+    monkeypatch.setattr(sys, 'argv', ['train_incremental.py', str(data), '--output', str(output), '--chunk-size', '20', '--epochs', '3'])
+
+    assert train_incremental.main() == 0
+
+    epochs = [line for line in capsys.readouterr().out.splitlines() if line.startswith('Epoch')]
+    assert 'progressive accuracy' in epochs[0]
+    assert all('accuracy' not in line for line in epochs[1:])
+    assert output.exists()
+
+
+def test_jsonl_rows_need_a_label_and_full_skills(tmp_path, capsys):
+    results = [
+        # classify_dir output, reviewed: the full skills sit next to the display copy
+        {'skills': 'python sql docker', 'parsed_data': {'skills': 'python...', 'experience_years': 3, 'education': 'BSc'},
+         'class_id': 1, 'is_it_resume': 1},
+        # Not reviewed: the model's own class_id is no label
+        {'skills': 'nursing', 'parsed_data': {'skills': 'nursing', 'experience_years': 2, 'education': 'BSc'}, 'class_id': 0},
+        # API response: only the truncated skills
+        {'parsed_data': {'skills': 'x' * 100 + '...', 'experience_years': 1, 'education': 'BA'}, 'class_id': 0, 'is_it_resume': 0},
+        {'path': 'broken.pdf', 'error': 'Text extraction failed'}
+    ]
+    data = tmp_path / 'reviewed.jsonl'
+    data.write_text(''.join(json.dumps(result) + '\n' for result in results))
+
+    chunks = list(train_incremental.iter_chunks(str(data), 10, 'is_it_resume', report=True))
+
+    assert len(chunks) == 1
+    assert chunks[0].to_dict('records') == [{'skills': 'python sql docker', 'experience_years': 3, 'education': 'BSc', 'is_it_resume': 1}]
+    assert '1 with no label, 1 with truncated skills' in capsys.readouterr().out
+
+
+def test_prediction_columns_are_refused_as_labels(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['train_incremental.py', str(tmp_path / 'x.jsonl'), '--label-column', 'class_id'])
+    assert train_incremental.main() == 1
@@ -0,0 +1,44 @@
+import os
+import io
+import threading
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+import uploads
+
+
+def test_small_uploads_stay_in_memory_and_large_ones_spool(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, 'UPLOAD_SPOOL_DIR', str(tmp_path))
+
+    small = uploads.SpooledUpload.from_file_storage(FileStorage(io.BytesIO(b'x' * 10), 'a.pdf'), threshold=16)
+    assert not small.spooled and small.buffer() == b'x' * 10
+
+    content = bytes(range(256)) * 4
+    large = uploads.SpooledUpload.from_file_storage(FileStorage(io.BytesIO(content), 'b.pdf'), threshold=16)
+    path = large.path
+    assert large.spooled and path.endswith('.pdf') and large.size == len(content)
+    buffer = large.buffer()
+    assert buffer[:] == content and buffer.path == path
+
+    large.close()
+    assert not os.path.exists(path) and large.path is None
+
+
+def test_budget_blocks_until_released_and_admits_oversized_work_alone():
+    budget = uploads.MemoryBudget(limit=100)
+    budget.acquire(60)
+    with pytest.raises(uploads.MemoryBudgetExceeded):
+        budget.acquire(60, timeout=0.05)
+
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (budget.acquire(60, timeout=5), acquired.set()))
+    waiter.start()
+    assert not acquired.wait(0.1)
+    budget.release(60)
+    waiter.join(5)
+    assert acquired.is_set() and budget.stats()['waits'] == 1
+
+    budget.release(60)
+    budget.acquire(500, timeout=0)  # Larger than the limit, but nothing else is in flight
+    assert budget.stats()['peak_bytes'] == 500
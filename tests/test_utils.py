@@ -0,0 +1,107 @@
+import io
+import os
+import sys
+
+import pytest
+
+import utils
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from corpus import _build_pdf, render_page, text_pdf  # noqa: E402
+
+LINES = ['Jane Doe', 'jane@example.com', 'Skills: Python, SQL, Docker, Kubernetes', 'Experience: 5 years backend engineering']
+
+
+@pytest.fixture
+def ocr_calls(monkeypatch):
+    calls = []
+
+    def fake_ocr(source, page_number, dpi, preprocess=False):
+        calls.append(page_number)
+        return 'Skills Python SQL Docker Kubernetes Experience 5 years ' * 10
+
+    monkeypatch.setattr(utils.ocr_pool, 'ocr_pdf_page', fake_ocr)
+    monkeypatch.setattr(utils.ocr_pool, 'get_pool', lambda: utils.ocr_pool.OCRPool(mode='inline'))
+    return calls
+
+
+def scanned_pdf():
+    buffer = io.BytesIO()
+    render_page(LINES, dpi=50).save(buffer, 'PDF', resolution=50)
+    return buffer.getvalue()
+
+
+def test_text_pdf_with_footer_page_is_not_ocrd(ocr_calls):
+    body = ' '.join(f'({line}) Tj T*' for line in LINES)
+    pdf = _build_pdf([f'BT /F1 11 Tf 14 TL 50 740 Td {body} ET', 'BT /F1 9 Tf 50 40 Td (Page 2) Tj ET'])
+
+    result = utils.extract_pdf(pdf)
+
+    assert ocr_calls == []
+    assert [page['strategy'] for page in result['pages']] == ['plain', 'empty']
+    assert 'Page 2' in result['text']
+
+
+def test_scanned_pdf_is_ocrd(ocr_calls):
+    result = utils.extract_pdf(scanned_pdf())
+
+    assert ocr_calls == [1]
+    assert result['pages'][0]['strategy'] == 'ocr'
+
+
+def test_mixed_pdf_ocrs_only_the_scanned_page(ocr_calls):
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for document in (text_pdf(LINES), scanned_pdf()):
+        writer.add_page(PdfReader(io.BytesIO(document)).pages[0])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+
+    result = utils.extract_pdf(buffer.getvalue())
+
+    assert ocr_calls == [2]
+    assert [page['strategy'] for page in result['pages']] == ['plain', 'ocr']
+    assert 'Jane Doe' in result['text'] and 'Kubernetes Experience' in result['text']
+
+
+def test_blank_page_without_images_is_not_ocrd(ocr_calls):
+    result = utils.extract_pdf(_build_pdf(['']))
+
+    assert ocr_calls == []
+    assert result['pages'][0]['strategy'] == 'empty'
+
+
+def test_text_pdf_uses_text_layer(ocr_calls):
+    assert 'Jane Doe' in utils.extract_pdf(text_pdf(LINES))['text']
+    assert ocr_calls == []
+
+
+def test_confidence_failure_escalates_instead_of_failing(monkeypatch):
+    import predictor
+
+    def broken(records):
+        raise RuntimeError('scorer failed')
+
+    monkeypatch.setattr(predictor, 'predict_confidence', broken)
+
+    assert utils.ocr_text_sufficient('Skills Python SQL Docker ' * 20) is False
+
+
+def test_extraction_cache_key_tracks_model_version(monkeypatch, tmp_path):
+    import predictor
+    import text_cache
+
+    cache = text_cache.ExtractionCache(str(tmp_path))
+    monkeypatch.setattr(text_cache, 'get_cache', lambda: cache)
+    monkeypatch.setattr(utils, 'OCR_MODE', 'progressive')
+    extracted = []
+    monkeypatch.setattr(utils, 'extract_text_from_file', lambda content, filename: extracted.append(filename) or 'resume text')
+
+    monkeypatch.setattr(predictor, 'get_model_version', lambda: 'v1')
+    utils.extract_text_from_file_cached(b'%PDF', 'a.pdf')
+    utils.extract_text_from_file_cached(b'%PDF', 'a.pdf')
+    monkeypatch.setattr(predictor, 'get_model_version', lambda: 'v2')
+    utils.extract_text_from_file_cached(b'%PDF', 'a.pdf')
+
+    assert len(extracted) == 2
@@ -0,0 +1,41 @@
+import threading
+
+import predictor
+import warmup
+
+
+def test_background_warmup_reports_steps_and_becomes_ready(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(warmup, 'WARMUP_MODULES', ['json', 'no_such_module'])
+    monkeypatch.setattr(predictor, 'warm_up', lambda: release.wait(5) and 'compact')
+    state = warmup.Warmup()
+    state.add_step('static', lambda: 3)
+
+    state.start(mode='background')
+    assert not state.wait(0.05) and not state.is_ready()
+    state.note_request('/predict', 0.012)
+    release.set()
+    assert state.wait(5) and state.is_ready()
+
+    report = state.report()
+    assert [(step['step'], step['ok']) for step in report['steps']] == [
+        ('import json', True), ('import no_such_module', False), ('model', True), ('parser', True), ('static', True)
+    ]
+    assert report['steps'][2]['result'] == 'compact' and report['steps'][4]['result'] == 3
+    assert report['first_request'] == {'path': '/predict', 'ms': 12.0, 'state': 'warming'}
+
+
+def test_model_failure_leaves_the_process_unready(monkeypatch):
+    def broken():
+        raise RuntimeError('Model could not be loaded')
+
+    monkeypatch.setattr(warmup, 'WARMUP_MODULES', [])
+    monkeypatch.setattr(predictor, 'warm_up', broken)
+    state = warmup.Warmup()
+    state.start(mode='blocking')
+    assert state.state == 'failed' and not state.is_ready()
+    assert state.report()['steps'][0]['error'] == 'RuntimeError: Model could not be loaded'
+
+    off = warmup.Warmup()
+    off.start(mode='off')
+    assert off.is_ready() and off.report()['steps'] == []
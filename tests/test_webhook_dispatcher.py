@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import webhook_dispatcher
+
+
+@pytest.fixture
+def dispatcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(webhook_dispatcher, 'WEBHOOK_SPILL_RETRY_INTERVAL', 0)
+    return webhook_dispatcher.WebhookDispatcher('http://127.0.0.1:9/webhook', queue_size=10, spill_dir=str(tmp_path))
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_spill_only_exposes_closed_files(dispatcher, tmp_path):
+    dispatcher._spill(['{"a": 1}', '{"b": 2}'])
+    dispatcher._spill(['{"c": 3}'])
+
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 2
+    assert all(name.endswith('.jsonl') for name in names)
+
+    dispatcher._respool()
+    assert sorted(dispatcher._queue.get_nowait() for _ in range(3)) == ['{"a": 1}', '{"b": 2}', '{"c": 3}']
+    assert os.listdir(tmp_path) == []
+
+
+def test_files_of_dead_processes_are_recovered(dispatcher, tmp_path):
+    pid = dead_pid()
+    (tmp_path / f'spill-{pid}-1-0.tmp').write_text('{"a": 1}\n{"torn"')
+    (tmp_path / f'spill-{pid}-1-1.jsonl.{pid}.claimed').write_text('{"b": 2}\n')
+    live = tmp_path / f'spill-{os.getpid()}-1-9.tmp'
+    live.write_text('{"writing": true}\n')
+
+    dispatcher._recover_stale()
+    dispatcher._respool()
+
+    assert sorted(dispatcher._queue.get_nowait() for _ in range(2)) == ['{"a": 1}', '{"b": 2}']
+    assert dispatcher._queue.empty()
+    assert os.listdir(tmp_path) == [live.name]
+
+
+def test_overflow_is_spilled_not_dropped(tmp_path):
+    dispatcher = webhook_dispatcher.WebhookDispatcher('http://127.0.0.1:9/webhook', queue_size=1, spill_dir=str(tmp_path))
+    dispatcher._ensure_started = lambda: None  # Keep the queue full
+
+    dispatcher.enqueue({'a': 1})
+    dispatcher.enqueue({'b': 2})
+
+    stats = dispatcher.stats()
+    assert stats['enqueued'] == 1
+    assert stats['spilled'] == 1
+    assert stats['dropped'] == 0
+
+
+def test_claimed_file_outlives_an_interrupted_respool(dispatcher, tmp_path, monkeypatch):
+    dispatcher._spill(['{"a": 1}', '{"b": 2}'])
+
+    def interrupted(body):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(dispatcher._queue, 'put_nowait', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        dispatcher._respool()
+
+    [name] = os.listdir(tmp_path)
+    assert name.endswith(f'.{os.getpid()}.claimed')
+    assert (tmp_path / name).read_text() == '{"a": 1}\n{"b": 2}\n'
+
+
+def test_respool_into_a_full_queue_spills_the_rest(tmp_path, monkeypatch):
+    monkeypatch.setattr(webhook_dispatcher, 'WEBHOOK_SPILL_RETRY_INTERVAL', 0)
+    dispatcher = webhook_dispatcher.WebhookDispatcher('http://127.0.0.1:9/webhook', queue_size=2, spill_dir=str(tmp_path))
+    dispatcher._spill(['{"a": 1}', '{"b": 2}', '{"c": 3}'])
+
+    dispatcher._respool()
+
+    [name] = os.listdir(tmp_path)
+    assert name.endswith('.jsonl')
+    assert (tmp_path / name).read_text() == '{"c": 3}\n'
+    assert [dispatcher._queue.get_nowait() for _ in range(2)] == ['{"a": 1}', '{"b": 2}']
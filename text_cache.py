@@ -0,0 +1,276 @@
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction is then only serialized within a process
+    fcntl = None
+
+# Configuration
+CACHE_DIR = os.environ.get('EXTRACTION_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'extraction'))
+MEMORY_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MEMORY_BYTES', 32 * 1024 * 1024))
+DISK_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_DISK_BYTES', 512 * 1024 * 1024))
+CACHE_ENABLED = os.environ.get('EXTRACTION_CACHE', '1') != '0'
+# The disk tier is shared by every worker, so each one re-measures it at least this often
+# (seconds) instead of trusting a count of its own writes
+DISK_MEASURE_INTERVAL = float(os.environ.get('EXTRACTION_CACHE_MEASURE_INTERVAL', 30))
+
+# Bump when extraction logic changes so stale texts are never served
+EXTRACTOR_VERSION = '3'
+
+
+def content_key(file_content, kind=''):
+    """
+    Content-addressed key: sha256 of the file bytes plus the extractor kind/version.
+    """
+    digest = hashlib.sha256(file_content).hexdigest()
+    return f"{digest}-{kind}-v{EXTRACTOR_VERSION}" if kind else f"{digest}-v{EXTRACTOR_VERSION}"
+
+
+class ExtractionCache:
+    """
+    Two-tier cache for extracted resume text.
+    Tier 1: in-process LRU bounded by total text size.
+    Tier 2: on-disk files shared by every worker on the host, bounded by total size. Each
+    worker re-measures the directory periodically, and eviction runs under a cross-process
+    file lock, so N workers keep the tier near disk_max_bytes rather than N times it.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, memory_max_bytes=MEMORY_MAX_BYTES, disk_max_bytes=DISK_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None  # Last measurement plus this process's writes since
+        self._measured_at = None
+        self._measure_lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # --- Tier 1: memory ---
+
+    def _memory_get(self, key):
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+            return text
+
+    def _memory_put(self, key, text):
+        size = len(text.encode('utf-8'))
+        if size > self.memory_max_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old.encode('utf-8'))
+            self._memory[key] = text
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_max_bytes and self._memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted.encode('utf-8'))
+
+    # --- Tier 2: disk ---
+
+    def _path(self, key):
+        # Fan out into subdirectories so no single directory grows huge
+        return os.path.join(self.cache_dir, key[:2], key + '.txt')
+
+    def _disk_get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except (FileNotFoundError, OSError, UnicodeDecodeError):
+            return None
+        try:
+            # Touch so eviction approximates LRU across workers
+            os.utime(path, None)
+        except OSError:
+            pass
+        return text
+
+    def _disk_put(self, key, text):
+        path = self._path(key)
+        data = text.encode('utf-8')
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Atomic write: concurrent workers never observe partial files
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Extraction cache write failed: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data)
+            stale = self._measured_at is None or time.monotonic() - self._measured_at >= DISK_MEASURE_INTERVAL
+        if stale:
+            self._refresh_disk_bytes()
+        with self._lock:
+            over_budget = self._disk_bytes is not None and self._disk_bytes > self.disk_max_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _refresh_disk_bytes(self):
+        # The walk runs outside _lock so cache gets and puts never wait for it; one thread
+        # measures at a time
+        if not self._measure_lock.acquire(blocking=False):
+            return
+        try:
+            total = self._measure_disk()
+            with self._lock:
+                self._disk_bytes = total
+                self._measured_at = time.monotonic()
+        finally:
+            self._measure_lock.release()
+
+    def _scan_disk(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for name in filenames:
+                if not name.endswith('.txt'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _measure_disk(self):
+        return sum(size for _, size, _ in self._scan_disk())
+
+    def _evict_disk(self):
+        """
+        Size-based eviction: drop least recently used files until 90% of the budget.
+        Rescans the directory because other workers write to it too. Only one process evicts
+        at a time; the others skip, since the running eviction frees space for all of them.
+        """
+        lock_file = None
+        if fcntl is not None:
+            try:
+                lock_file = open(os.path.join(self.cache_dir, '.evict.lock'), 'a')
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                if lock_file is not None:
+                    lock_file.close()
+                return
+        try:
+            self._evict_locked()
+        finally:
+            if lock_file is not None:
+                lock_file.close()  # Releases the flock
+
+    def _evict_locked(self):
+        entries = self._scan_disk()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.disk_max_bytes * 0.9)
+        entries.sort()
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                evicted += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = total
+            self._measured_at = time.monotonic()
+            self.evictions += evicted
+
+    # --- Public API ---
+
+    def get(self, key):
+        text = self._memory_get(key)
+        if text is not None:
+            with self._lock:
+                self.memory_hits += 1
+            return text
+
+        text = self._disk_get(key)
+        if text is not None:
+            self._memory_put(key, text)
+            with self._lock:
+                self.disk_hits += 1
+            return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, text):
+        # Never cache empty results: they usually mean OCR tooling was missing
+        if not text or not text.strip():
+            return
+        self._memory_put(key, text)
+        self._disk_put(key, text)
+
+    def get_or_extract(self, file_content, filename, extractor, kind=''):
+        key = content_key(file_content, kind)
+        text = self.get(key)
+        if text is not None:
+            return text
+        text = extractor(file_content, filename)
+        self.put(key, text)
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for _, _, path in self._scan_disk():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = 0
+            self._measured_at = time.monotonic()
+
+    def stats(self):
+        if self._disk_bytes is None:
+            self._refresh_disk_bytes()
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': round(hits / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_bytes': self._disk_bytes,
+                'evictions': self.evictions,
+                'enabled': CACHE_ENABLED
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ExtractionCache()
+    return _cache
@@ -0,0 +1,106 @@
+import os
+import time
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+import metrics
+
+# Configuration
+STAGE_WINDOW = int(os.environ.get('TIMING_STAGE_WINDOW', 2048))  # Samples kept per stage
+
+STAGE_LATENCY = metrics.histogram('resume_stage_duration_seconds', 'Latency of pipeline stages.', labelnames=('stage',))
+
+# Spans of the request being handled; shared by worker threads via propagate()
+_request_spans = contextvars.ContextVar('request_spans', default=None)
+
+_windows = {}
+_windows_lock = threading.Lock()
+
+
+def start_request():
+    """
+    Starts collecting spans for the current request. Returns a token for end_request().
+    """
+    return _request_spans.set([])
+
+def end_request(token):
+    _request_spans.reset(token)
+
+def _record(stage, seconds):
+    spans = _request_spans.get()
+    if spans is not None:
+        # list.append is atomic, so batch threads can share the request's list
+        spans.append((stage, seconds))
+    window = _windows.get(stage)
+    if window is None:
+        with _windows_lock:
+            window = _windows.setdefault(stage, deque(maxlen=STAGE_WINDOW))
+    window.append(seconds)
+    STAGE_LATENCY.observe(seconds, stage=stage)
+
+@contextmanager
+def span(stage):
+    """
+    Times a pipeline stage: with timing.span('extract'): ...
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(stage, time.perf_counter() - started)
+
+def propagate(fn):
+    """
+    Binds fn to a copy of the caller's context so spans recorded on executor
+    threads land in the submitting request's breakdown.
+    """
+    context = contextvars.copy_context()
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return run
+
+def breakdown():
+    """
+    Per-stage totals for the current request: {stage: {'ms': total, 'count': n}}.
+    """
+    spans = _request_spans.get()
+    result = {}
+    for stage, seconds in list(spans or ()):
+        entry = result.setdefault(stage, {'ms': 0.0, 'count': 0})
+        entry['ms'] += seconds * 1000
+        entry['count'] += 1
+    for entry in result.values():
+        entry['ms'] = round(entry['ms'], 2)
+    return result
+
+def server_timing_header(stages):
+    """
+    Formats a breakdown as a Server-Timing header value (durations in ms).
+    """
+    return ', '.join(f"{stage};dur={entry['ms']}" for stage, entry in stages.items())
+
+def _percentile(ordered, fraction):
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def stage_percentiles():
+    """
+    Rolling p50/p90/p99 (ms) per stage over the last STAGE_WINDOW samples.
+    """
+    with _windows_lock:
+        windows = dict(_windows)
+    result = {}
+    for stage, window in sorted(windows.items()):
+        ordered = sorted(window)
+        if not ordered:
+            continue
+        result[stage] = {
+            'count': len(ordered),
+            'p50_ms': round(_percentile(ordered, 0.50) * 1000, 2),
+            'p90_ms': round(_percentile(ordered, 0.90) * 1000, 2),
+            'p99_ms': round(_percentile(ordered, 0.99) * 1000, 2),
+            'max_ms': round(ordered[-1] * 1000, 2)
+        }
+    return result
@@ -0,0 +1,219 @@
+"""
+Out-of-core training: streams CSV or JSONL in chunks into a hashing-vectorizer + SGD pipeline
+with partial_fit, so memory stays bounded by the chunk size rather than the dataset size.
+
+The result is the same kind of pickled Pipeline(preprocessor, classifier) that train_model.py
+writes, so predictor loads it unchanged.
+
+Labels always come from --label-column, i.e. ground truth. The model's own class_id is never
+used as a label: continuing a model on its own predictions only reinforces its mistakes. JSONL
+output of classify_dir.py can be used once a reviewed label has been added to each line; it
+carries the full skills text, unlike API responses, whose skills are truncated for display.
+
+Usage:
+    python train_incremental.py " resume_dataset.csv"
+    python train_incremental.py reviewed.jsonl --label-column is_it_resume --continue-from resume_it_model.pkl
+"""
+import os
+import sys
+import json
+import shutil
+import pickle
+import resource
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+
+import compact_model
+
+FEATURE_COLUMNS = ['skills', 'experience_years', 'education']
+CLASSES = np.array([0, 1])
+# Appended by predictor to the display copy of skills in parsed_data
+TRUNCATION_MARKER = '...'
+# Model outputs, not ground truth
+PREDICTION_COLUMNS = {'class_id', 'class_label', 'verdict', 'confidence_score'}
+
+
+def build_pipeline(skills_features=2 ** 18, education_features=2 ** 10):
+    # Hashing vectorizers are stateless: no vocabulary to fit, so any chunk can be transformed
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('text', HashingVectorizer(n_features=skills_features, alternate_sign=False), 'skills'),
+            ('edu', HashingVectorizer(n_features=education_features, alternate_sign=False, ngram_range=(1, 2)), 'education')
+        ],
+        remainder='passthrough'
+    )
+    return Pipeline([
+        ('preprocessor', preprocessor),
+        ('classifier', SGDClassifier(loss='log_loss', random_state=42))
+    ])
+
+def _normalize_row(row, label_column):
+    """
+    Accepts dataset rows ({skills, experience_years, education, <label>}) and classify_dir.py
+    results ({skills, parsed_data: {...}, <label>}). Returns (row, None), or (None, reason)
+    for rows without a label or with only the truncated display copy of the skills.
+    """
+    label = row.get(label_column)
+    if label is None:
+        return None, 'no label'
+    source = row.get('parsed_data') or row
+    skills = row['skills'] if 'skills' in row else source.get('skills')
+    if 'skills' not in row and isinstance(skills, str) and skills.endswith(TRUNCATION_MARKER):
+        # Training on the first 100 characters would not match the features seen when serving
+        return None, 'truncated skills'
+    return {
+        'skills': skills,
+        'experience_years': source.get('experience_years'),
+        'education': source.get('education'),
+        label_column: label
+    }, None
+
+def iter_chunks(path, chunk_size, label_column, report=False):
+    """
+    Yields DataFrames of at most chunk_size rows with FEATURE_COLUMNS + label_column.
+    With report, prints how many JSONL rows were skipped and why.
+    """
+    if path.endswith('.jsonl') or path.endswith('.ndjson'):
+        rows = []
+        skipped = {}
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                raw = json.loads(line)
+                if 'error' in raw:
+                    continue  # Failed extractions carry no features
+                row, reason = _normalize_row(raw, label_column)
+                if row is None:
+                    skipped[reason] = skipped.get(reason, 0) + 1
+                    continue
+                rows.append(row)
+                if len(rows) >= chunk_size:
+                    yield pd.DataFrame(rows)
+                    rows = []
+        if rows:
+            yield pd.DataFrame(rows)
+        if report and skipped:
+            details = ', '.join(f"{count} with {reason}" for reason, count in sorted(skipped.items()))
+            print(f"Skipped rows of {path}: {details} (label column '{label_column}')")
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=FEATURE_COLUMNS + [label_column])
+
+def prepare(chunk, label_column):
+    # Same missing-value handling as train_model.py
+    chunk = chunk.dropna(subset=[label_column])
+    X = pd.DataFrame({
+        'skills': chunk['skills'].fillna('').astype(str),
+        'experience_years': pd.to_numeric(chunk['experience_years'], errors='coerce').fillna(0),
+        'education': chunk['education'].fillna('Unknown').astype(str)
+    })
+    return X, chunk[label_column].astype(int).to_numpy()
+
+def load_existing(path):
+    from model_def import LiteModel  # Required for pickle loading
+
+    with open(path, 'rb') as f:
+        pipeline = pickle.load(f)
+    steps = dict(getattr(pipeline, 'steps', []))
+    preprocessor, classifier = steps.get('preprocessor'), steps.get('classifier')
+    stateless = preprocessor is not None and all(
+        isinstance(transformer, HashingVectorizer) or transformer in ('passthrough', 'drop')
+        for _, transformer, _ in preprocessor.transformers
+    )
+    if not stateless or not hasattr(classifier, 'partial_fit'):
+        raise ValueError(f"{path} was not trained incrementally (needs hashing features and a partial_fit "
+                         f"classifier); train a fresh model without --continue-from first")
+    return pipeline
+
+def save(pipeline, output):
+    tmp_path = f"{output}.tmp-{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(pipeline, f)
+    os.replace(tmp_path, output)
+
+    if os.path.abspath(output) != os.path.abspath(compact_model.MODEL_FILENAME):
+        return
+    # The compact NumPy scorer only reproduces TF-IDF pipelines; drop any artifact of the old model
+    try:
+        compact_model.export(pipeline, compact_model.COMPACT_DIRNAME, output)
+    except compact_model.UnsupportedModel:
+        if os.path.isdir(compact_model.COMPACT_DIRNAME):
+            shutil.rmtree(compact_model.COMPACT_DIRNAME)
+            print(f"Removed stale {compact_model.COMPACT_DIRNAME}; predictor will score with the pickle.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked, incremental training with partial_fit.")
+    parser.add_argument('paths', nargs='+', help="CSV or JSONL files, streamed in order")
+    parser.add_argument('--continue-from', help="Existing incrementally trained model to update")
+    parser.add_argument('--output', default='resume_it_model.pkl')
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Rows held in memory at once")
+    parser.add_argument('--epochs', type=int, default=5, help="Passes over the data")
+    parser.add_argument('--label-column', default='is_it_resume', help="Ground-truth label (0/1)")
+    args = parser.parse_args()
+
+    if args.label_column in PREDICTION_COLUMNS:
+        print(f"Error: '{args.label_column}' is the model's own output, not ground truth; "
+              f"label the rows and pass that column with --label-column")
+        return 1
+
+    if args.continue_from:
+        print(f"Continuing from {args.continue_from}...")
+        try:
+            pipeline = load_existing(args.continue_from)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+    else:
+        pipeline = build_pipeline()
+    preprocessor = pipeline.named_steps['preprocessor']
+    classifier = pipeline.named_steps['classifier']
+    fitted = args.continue_from is not None
+    rng = np.random.default_rng(42)
+
+    for epoch in range(1, args.epochs + 1):
+        seen = correct = rows = 0
+        # Only the first pass scores rows the model has not trained on yet; later epochs
+        # would report training accuracy
+        validating = epoch == 1
+        for path in args.paths:
+            for chunk in iter_chunks(path, args.chunk_size, args.label_column, report=epoch == 1):
+                X, y = prepare(chunk, args.label_column)
+                if not len(y):
+                    continue
+                order = rng.permutation(len(y))
+                X, y = X.iloc[order], y[order]
+
+                if not fitted:
+                    # Stateless, so fitting on the first chunk only records the column layout
+                    preprocessor.fit(X)
+                features = preprocessor.transform(X)
+                if fitted and validating:
+                    # Progressive validation: score each chunk before learning from it
+                    correct += int((classifier.predict(features) == y).sum())
+                    seen += len(y)
+                classifier.partial_fit(features, y, classes=CLASSES)
+                fitted = True
+                rows += len(y)
+        if validating:
+            accuracy = f"{correct / seen:.4f}" if seen else "n/a"
+            print(f"Epoch {epoch}/{args.epochs}: {rows} rows, progressive accuracy {accuracy}")
+        else:
+            print(f"Epoch {epoch}/{args.epochs}: {rows} rows")
+
+    if not fitted:
+        print("No training rows found.")
+        return 1
+
+    save(pipeline, args.output)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Model saved to {args.output} (peak RSS {peak_mb:.0f} MB)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,10 +3,12 @@ import pickle
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.metrics import classification_report, accuracy_score
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder
+import compact_model
 
 # Load dataset
 # Note: The file has a leading space in the name
@@ -70,6 +72,13 @@ try:
         pickle.dump(pipeline, f)
     print(f"Model saved to {model_filename} SUCCESSFULLY")
 
+    # Export the NumPy-only artifact the predictor scores with at request time
+    try:
+        compact_model.export(pipeline, compact_model.COMPACT_DIRNAME, model_filename)
+        print(f"Compact model exported to {compact_model.COMPACT_DIRNAME}")
+    except compact_model.UnsupportedModel as e:
+        print(f"Compact model not exported ({e}); predictor will use the pickle.")
+
 except Exception as e:
     print(f"CRITICAL ERROR during training: {e}")
     # Force minimal fallback model creation if main training fails
@@ -0,0 +1,162 @@
+import os
+import mmap
+import time
+import shutil
+import tempfile
+import threading
+
+# Configuration
+# Uploads larger than this are spooled to a temp file and read through mmap
+UPLOAD_SPOOL_THRESHOLD = int(os.environ.get('UPLOAD_SPOOL_THRESHOLD', 1024 * 1024))
+UPLOAD_SPOOL_DIR = os.environ.get('UPLOAD_SPOOL_DIR') or None  # None = system temp dir
+# Global budget for memory held by in-flight extractions in this process
+UPLOAD_MEMORY_BUDGET = int(os.environ.get('UPLOAD_MEMORY_BUDGET', 512 * 1024 * 1024))
+UPLOAD_BUDGET_TIMEOUT = float(os.environ.get('UPLOAD_BUDGET_TIMEOUT', 300))
+# Rough working-set estimate: parsed PDF objects scale with file size, and
+# each rasterized OCR page at 150 DPI is ~6 MB of RGB pixels
+WORKING_SET_FACTOR = 4
+RASTER_PAGE_BYTES = 6 * 1024 * 1024
+
+
+class MappedFile(mmap.mmap):
+    """
+    Read-only memory map that remembers its backing path, so OCR workers
+    can open the file themselves instead of receiving a pickled copy.
+    """
+    path = None
+
+
+def estimate_cost(size):
+    """
+    Bytes to reserve from the memory budget while extracting a file of `size` bytes.
+    """
+    return size * WORKING_SET_FACTOR + RASTER_PAGE_BYTES
+
+def map_file(path):
+    """
+    Opens a file as a read-only MappedFile carrying its path.
+    """
+    with open(path, 'rb') as f:
+        mapped = MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+    mapped.path = path
+    return mapped
+
+
+class SpooledUpload:
+    """
+    An uploaded file held either as small in-memory bytes or as a temp file on disk.
+    Call buffer() for a bytes-like view (bytes or mmap) and close() when done.
+    """
+
+    def __init__(self, filename, size, data=None, path=None):
+        self.filename = filename
+        self.size = size
+        self.path = path
+        self._data = data
+        self._mapped = None
+
+    @classmethod
+    def from_file_storage(cls, file_storage, threshold=UPLOAD_SPOOL_THRESHOLD):
+        """
+        Copies a werkzeug FileStorage without ever holding more than `threshold` bytes in RAM.
+        """
+        stream = file_storage.stream
+        head = stream.read(threshold + 1)
+        if len(head) <= threshold:
+            return cls(file_storage.filename, len(head), data=head)
+
+        suffix = os.path.splitext(file_storage.filename or '')[1]
+        fd, path = tempfile.mkstemp(prefix='upload-', suffix=suffix, dir=UPLOAD_SPOOL_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(head)
+                del head
+                shutil.copyfileobj(stream, f, 1024 * 1024)
+            size = os.path.getsize(path)
+        except Exception:
+            os.remove(path)
+            raise
+        return cls(file_storage.filename, size, path=path)
+
+    @property
+    def spooled(self):
+        return self.path is not None
+
+    def buffer(self):
+        if self._data is not None:
+            return self._data
+        if self._mapped is None:
+            self._mapped = map_file(self.path)
+        return self._mapped
+
+    def estimated_cost(self):
+        return estimate_cost(self.size)
+
+    def close(self):
+        if self._mapped is not None:
+            try:
+                self._mapped.close()
+            except BufferError:
+                # Still exported (e.g. a live memoryview); the OS reclaims it on exit
+                pass
+            self._mapped = None
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+        self._data = None
+
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+
+class MemoryBudget:
+    """
+    Counting limiter over bytes rather than slots. Work larger than the whole budget
+    is still admitted, but only when nothing else is in flight.
+    """
+
+    def __init__(self, limit=UPLOAD_MEMORY_BUDGET):
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self.waits = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, amount, timeout=UPLOAD_BUDGET_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            waited = False
+            while self.in_use and self.in_use + amount > self.limit:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise MemoryBudgetExceeded(f"Timed out waiting for {amount} bytes of upload memory budget")
+                waited = True
+                self._cond.wait(remaining)
+            if waited:
+                self.waits += 1
+            self.in_use += amount
+            self.peak = max(self.peak, self.in_use)
+
+    def release(self, amount):
+        with self._cond:
+            self.in_use -= amount
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'limit_bytes': self.limit,
+                'in_use_bytes': self.in_use,
+                'peak_bytes': self.peak,
+                'waits': self.waits
+            }
+
+
+_budget = MemoryBudget()
+
+def get_budget():
+    return _budget
@@ -1,183 +1,240 @@
 import os
 import io
-import re
-from pypdf import PdfReader
-import pytesseract
-from pdf2image import convert_from_bytes
-from PIL import Image
+import mmap
+
+import text_cache
+import ocr_pool
+import metrics
+import timing
+# Parsing lives in resume_parser; re-exported here for existing callers
+from resume_parser import extract_candidate_name, parse_resume_text
 
 # Supported file extensions
 IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.tiff', '.tif', '.bmp', '.webp'}
 PDF_EXTENSIONS = {'.pdf'}
 
-def extract_candidate_name(text):
-    """
-    Heuristic: The candidate name is usually the first non-empty line at the top of a resume.
-    """
-    section_headers = {'education', 'experience', 'skills', 'summary', 'objective', 'profile', 
-                       'contact', 'projects', 'work', 'achievements', 'certifications', 'references',
-                       'curriculum vitae', 'resume', 'cv', 'phone', 'address', 'email'}
-    
-    lines = text.strip().split('\n')
-    for line in lines[:10]:  # Check first 10 lines
-        line = line.strip()
-        if not line or len(line) < 3:
-            continue
-        if '@' in line or 'http' in line.lower() or 'www.' in line.lower():
-            continue
-        if re.search(r'\d{5,}', line):  # Skip phone numbers
-            continue
-        if line.lower().strip(':').strip() in section_headers:
-            continue
-        words = line.split()
-        if 1 <= len(words) <= 5 and not re.search(r'\d', line):
-            # Clean up: title case, remove special chars
-            name = re.sub(r'[^a-zA-Z\s\.\-]', '', line).strip()
-            if len(name) > 2:
-                return name.title()
-    return None
-
-def parse_resume_text(text):
-    """
-    Simple heuristic parser to extract features from resume text.
-    """
-    candidate_name = extract_candidate_name(text)
-    text = text.lower()
-    
-    # 1. Experience
-    experience_years = 0.0
-    exp_match = re.search(r'(\d+(\.\d+)?)(\+)?\s*(year|yr)', text)
-    if exp_match:
+# PDF extraction limits
+MAX_PDF_PAGES = 3         # Pages read from the text layer
+MAX_OCR_PAGES = 2         # Pages we are willing to rasterize
+OCR_DPI = 150
+MIN_PAGE_TEXT_LENGTH = 20  # Below this a page is treated as image-only
+
+# Progressive OCR: first page at low DPI, binarized; more pages or full resolution only
+# when the text is too short or the model is unsure. 'full' OCRs every page at OCR_DPI.
+OCR_MODE = os.environ.get('OCR_MODE', 'progressive')
+OCR_FAST_DPI = int(os.environ.get('OCR_FAST_DPI', 100))
+OCR_FAST_IMAGE_MAX_SIDE = int(os.environ.get('OCR_FAST_IMAGE_MAX_SIDE', 1400))  # ~100 DPI for a letter page
+OCR_MIN_TEXT_LENGTH = int(os.environ.get('OCR_MIN_TEXT_LENGTH', 200))
+OCR_CONFIDENCE_THRESHOLD = float(os.environ.get('OCR_CONFIDENCE_THRESHOLD', 0.8))
+
+def _as_stream(file_content):
+    """
+    Seekable stream over the upload without copying memory-mapped (spooled) files.
+    """
+    if isinstance(file_content, mmap.mmap):
+        file_content.seek(0)
+        return file_content
+    return io.BytesIO(file_content)
+
+def _ocr_source(file_content):
+    """
+    What to send to an OCR worker: the backing file path for spooled uploads,
+    otherwise the raw bytes.
+    """
+    path = getattr(file_content, 'path', None)
+    if path:
+        return path
+    if isinstance(file_content, bytes):
+        return file_content
+    return bytes(file_content)
+
+def ocr_text_sufficient(text):
+    """
+    Progressive OCR stop rule: enough text, and the model is confident about its verdict.
+    """
+    if len(text.strip()) < OCR_MIN_TEXT_LENGTH:
+        return False
+    import predictor  # Deferred: keeps extraction importable without the model stack
+    try:
+        scored = predictor.predict_confidence([parse_resume_text(text)])
+    except Exception as e:
+        # Can't tell whether the fast pass is good enough: escalate rather than lose the text
+        print(f"OCR confidence check failed, escalating: {e}")
+        return False
+    # Without a model there is nothing to be unsure about
+    return scored is None or scored[0][1] >= OCR_CONFIDENCE_THRESHOLD
+
+def _page_has_images(page):
+    """
+    Whether a pypdf page draws any image or form XObject. Unknown structures count as images,
+    so OCR is only skipped when the page is known to hold nothing to recognize.
+    """
+    try:
+        resources = page.get('/Resources')
+        resources = resources.get_object() if resources is not None else {}
+        xobjects = resources.get('/XObject')
+        if xobjects is None:
+            return False
+        xobjects = xobjects.get_object()
+        return any(xobjects[name].get_object().get('/Subtype') in ('/Image', '/Form') for name in xobjects)
+    except Exception:
+        return True
+
+def _ocr_pages(source, page_numbers, dpi, preprocess, texts, pages, strategy='ocr'):
+    """
+    OCRs pages in parallel on the shared pool, storing results into texts/pages.
+    Returns the number of pages sent to Tesseract.
+    """
+    pool = ocr_pool.get_pool()
+    futures = []
+    for page_number in page_numbers:
         try:
-            experience_years = float(exp_match.group(1))
-        except ValueError:
-            pass
-            
-    # 2. Education
-    education = "Not Specified" 
-    degrees = [
-        "ph.d", "doctorate", "phd",
-        "m.tech", "m.sc", "m.s", "mca", "mba", "master", "post graduate",
-        "b.tech", "b.e", "b.sc", "b.s", "bca", "bba", "bachelor", "graduate", "engineer",
-        "diploma", "high school", "senior secondary"
-    ]
-    
-    found_degree = False
-    for degree in degrees:
-        if degree in text:
-            for line in text.split('\n'):
-                if degree in line:
-                    education = line.strip()
-                    if len(education) < 100:
-                         found_degree = True
-                         break
-            if found_degree:
-                break
-    
-    if not found_degree and "education" in text:
+            futures.append((page_number, pool.submit(ocr_pool.ocr_pdf_page, source, page_number, dpi, preprocess)))
+        except Exception as e:
+            futures.append((page_number, e))
+
+    for page_number, future in futures:
+        index = page_number - 1
         try:
-            post_education = text.split("education", 1)[1]
-            lines = [l.strip() for l in post_education.split('\n') if l.strip()]
-            if lines:
-                for line in lines[:3]:
-                    if len(line) > 3:
-                        education = line
-                        break
-        except:
-            pass
-            
-    education = education.title().replace('B.Tech', 'B.Tech').replace('M.Tech', 'M.Tech')
-    education = re.sub(r'[^\w\s\.,\-\(\)]', '', education)
-        
-    # 3. Skills
-    skills = text
-    if "skills" in text:
+            if isinstance(future, Exception):
+                raise future
+            texts[index] = future.result()
+            pages[index]['strategy'] = strategy
+        except Exception as e:
+            print(f"OCR Failed on page {page_number}: {e}")
+            pages[index]['strategy'] = 'ocr_failed'
+    return len(futures)
+
+def _progressive_pdf_ocr(source, pending_ocr, texts, pages):
+    """
+    1. First image-only page at OCR_FAST_DPI, grayscale + binarized.
+    2. Page text too short: re-run that page at OCR_DPI without binarization.
+    3. Still too short or low model confidence: OCR the remaining pages at the DPI that worked.
+    Pages never rasterized are marked 'ocr_skipped'. Returns the number of OCR passes.
+    """
+    for page_number in pending_ocr:
+        pages[page_number - 1]['strategy'] = 'ocr_skipped'
+    first, rest = pending_ocr[0], pending_ocr[1:]
+
+    passes = _ocr_pages(source, [first], OCR_FAST_DPI, True, texts, pages)
+    if pages[first - 1]['strategy'] == 'ocr_failed':
+        return passes  # Tesseract/poppler unusable; higher settings won't help
+    if ocr_text_sufficient("".join(texts)):
+        return passes
+
+    dpi, preprocess = OCR_FAST_DPI, True
+    if len(texts[first - 1].strip()) < OCR_MIN_TEXT_LENGTH:
+        metrics.OCR_ESCALATIONS.inc(step='hires')
+        dpi, preprocess = OCR_DPI, False
+        passes += _ocr_pages(source, [first], dpi, preprocess, texts, pages, strategy='ocr_hires')
+        if ocr_text_sufficient("".join(texts)):
+            return passes
+
+    if rest:
+        metrics.OCR_ESCALATIONS.inc(step='more_pages')
+        strategy = 'ocr_hires' if dpi == OCR_DPI else 'ocr'
+        passes += _ocr_pages(source, rest, dpi, preprocess, texts, pages, strategy=strategy)
+    return passes
+
+def extract_pdf(file_content):
+    """
+    Single-parse, per-page extraction engine.
+    Parses the PDF once and picks a strategy per page: pypdf plain text, pypdf layout mode,
+    or OCR. Only pages without a usable text layer that contain images are rasterized, so
+    a mixed PDF OCRs its scanned pages alone and footer or signature pages are skipped.
+
+    Returns {'text': str, 'pages': [{'page': n, 'strategy': str, 'chars': n}]} where strategy is
+    'plain', 'layout', 'ocr', 'ocr_hires', 'ocr_skipped', 'ocr_failed' or 'empty'.
+    """
+    pages = []
+    texts = []
+
+    # Text layer: one parse, plain then layout per page
+    with timing.span('pdf_text'):
         try:
-            skills_section = text.split("skills", 1)[1]
-            skills = skills_section[:500] 
-        except:
-            pass
-            
-    # 4. Email
-    email = "Not Found"
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    email_matches = re.findall(email_pattern, text)
-    if email_matches:
-        email = email_matches[0]
-        
-    # Cleanup Skills
-    for char in ['\n', '\r', '\t', ';', '|']:
-        skills = skills.replace(char, ', ')
-    for bullet in ['➢', '●', '•', '·', '-', '–', '>']:
-         skills = skills.replace(bullet, ', ')
-    skills = re.sub(r'\s+', ' ', skills)
-    skills = re.sub(r',\s*,', ', ', skills)
-    skills = skills.replace(',', ', ')
-    skills = re.sub(r'\s+', ' ', skills)
-    skills = skills.strip(' ,')
-
-    return {
-        "skills": skills,
-        "experience_years": experience_years,
-        "education": education,
-        "email": email,
-        "name": candidate_name
-    }
+            from pypdf import PdfReader  # Deferred: pypdf is a large import and warm-up preloads it
+            pdf_reader = PdfReader(_as_stream(file_content))
+            pdf_pages = pdf_reader.pages[:MAX_PDF_PAGES]
+        except Exception as e:
+            # Unparseable text layer: fall back to OCR of the leading pages
+            print(f"pypdf failed to parse document, using OCR: {e}")
+            pdf_pages = None
+
+        if pdf_pages is None:
+            pending_ocr = list(range(1, MAX_OCR_PAGES + 1))
+            texts = [""] * len(pending_ocr)
+            pages = [{'page': n, 'strategy': 'ocr', 'chars': 0} for n in pending_ocr]
+        else:
+            pending_ocr = []
+            sparse = []
+            for i, page in enumerate(pdf_pages):
+                page_number = i + 1
+                strategy = 'empty'
+                page_text = ""
+
+                # Strategy 1: pypdf plain
+                try:
+                    page_text = page.extract_text() or ""
+                    if len(page_text.strip()) >= MIN_PAGE_TEXT_LENGTH:
+                        strategy = 'plain'
+                except Exception:
+                    page_text = ""
+
+                # Strategy 2: pypdf layout (same parsed page, no re-read)
+                if strategy == 'empty':
+                    try:
+                        layout_text = page.extract_text(extraction_mode="layout") or ""
+                        if len(layout_text.strip()) >= MIN_PAGE_TEXT_LENGTH:
+                            page_text = layout_text
+                            strategy = 'layout'
+                    except Exception:
+                        pass
+
+                if strategy == 'empty':
+                    sparse.append((page_number, page))
+                texts.append(page_text)
+                pages.append({'page': page_number, 'strategy': strategy, 'chars': 0})
+
+            # Strategy 3: OCR, decided per page: only pages that draw images, within the OCR budget
+            for page_number, page in sparse:
+                if len(pending_ocr) < MAX_OCR_PAGES and _page_has_images(page):
+                    pages[page_number - 1]['strategy'] = 'ocr'
+                    pending_ocr.append(page_number)
+
+    if pending_ocr:
+        source = _ocr_source(file_content)
+        with timing.span('ocr'):
+            if OCR_MODE == 'progressive':
+                ocr_count = _progressive_pdf_ocr(source, pending_ocr, texts, pages)
+            else:
+                ocr_count = _ocr_pages(source, pending_ocr, OCR_DPI, False, texts, pages)
+        metrics.OCR_PAGES.inc(ocr_count, source='pdf')
+
+    for entry, page_text in zip(pages, texts):
+        entry['chars'] = len(page_text.strip())
+        metrics.EXTRACTION_PAGES.inc(strategy=entry['strategy'])
+
+    text = "".join(page_text + "\n" for page_text in texts)
+    return {'text': text, 'pages': pages}
 
 def extract_text_from_pdf_bytes(file_content):
-    MIN_TEXT_LENGTH = 50
-    text = ""
-    
-    # Strategy 1: pypdf plain
-    try:
-        pdf_reader = PdfReader(io.BytesIO(file_content))
-        plain_text = ""
-        for i, page in enumerate(pdf_reader.pages):
-            if i >= 3: break
-            try:
-                page_text = page.extract_text() or ""
-                plain_text += page_text + "\n"
-            except: pass
-
-        if len(plain_text.strip()) >= MIN_TEXT_LENGTH:
-            return plain_text
-    except: pass
-
-    # Strategy 2: pypdf layout
-    try:
-        pdf_reader = PdfReader(io.BytesIO(file_content))
-        layout_text = ""
-        for i, page in enumerate(pdf_reader.pages):
-            if i >= 3: break
-            try:
-                page_text = page.extract_text(extraction_mode="layout") or ""
-                layout_text += page_text + "\n"
-            except: pass
-
-        if len(layout_text.strip()) >= MIN_TEXT_LENGTH:
-            return layout_text
-    except: pass
-
-    # Strategy 3: OCR
-    try:
-        # Optimize: Reduce DPI to 150 and limit to first 2 pages (Using limits from previous optimization)
-        images = convert_from_bytes(file_content, dpi=150, last_page=2)
-        ocr_text = ""
-        for i, image in enumerate(images):
-            page_text = pytesseract.image_to_string(image)
-            ocr_text += page_text + "\n"
-        return ocr_text
-    except Exception as e:
-        print(f"OCR Failed: {e}")
-        return text
+    return extract_pdf(file_content)['text']
 
 def extract_text_from_image(file_content):
+    pool = ocr_pool.get_pool()
+    source = _ocr_source(file_content)
     try:
-        image = Image.open(io.BytesIO(file_content))
-        if image.mode not in ('L', 'RGB'):
-            image = image.convert('RGB')
-        return pytesseract.image_to_string(image)
-    except:
+        with timing.span('ocr'):
+            if OCR_MODE == 'progressive':
+                # Fast pass: downscaled and binarized; full resolution only if it isn't enough
+                metrics.OCR_PAGES.inc(source='image')
+                text = pool.run(ocr_pool.ocr_image_bytes, source, OCR_FAST_IMAGE_MAX_SIDE, True)
+                if ocr_text_sufficient(text):
+                    return text
+                metrics.OCR_ESCALATIONS.inc(step='hires')
+            metrics.OCR_PAGES.inc(source='image')
+            return pool.run(ocr_pool.ocr_image_bytes, source)
+    except Exception:
         return ""
 
 def extract_text_from_file(file_content, filename):
@@ -188,3 +245,22 @@ def extract_text_from_file(file_content, filename):
         return extract_text_from_pdf_bytes(file_content)
     else:
         return ""
+
+def extract_text_from_file_cached(file_content, filename):
+    """
+    Same as extract_text_from_file, but consults the content-addressed extraction cache first.
+    Re-uploads of identical bytes skip pypdf/OCR entirely.
+    """
+    ext = os.path.splitext(filename)[1].lower() if filename else ''
+    kind = 'image' if ext in IMAGE_EXTENSIONS else 'pdf'
+    metrics.FILE_SIZE.observe(len(file_content), kind=kind)
+    with timing.span('extract'):
+        if not text_cache.CACHE_ENABLED:
+            return extract_text_from_file(file_content, filename)
+        key_kind = kind
+        if OCR_MODE == 'progressive':
+            # How far OCR escalates depends on the model's confidence, so a new model must
+            # not be served texts extracted under the old one
+            import predictor
+            key_kind = f"{kind}-{OCR_MODE}-{predictor.get_model_version()}"
+        return text_cache.get_cache().get_or_extract(file_content, filename, extract_text_from_file, kind=key_kind)
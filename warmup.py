@@ -0,0 +1,139 @@
+import os
+import time
+import importlib
+import threading
+
+import metrics
+
+# Configuration
+# 'background' (listen immediately, /readyz turns 200 once warm), 'blocking' (warm before
+# serving) or 'off' (everything loads lazily on first use; ready at once)
+WARMUP_MODE = os.environ.get('WARMUP_MODE', 'background')
+# Modules the request path imports lazily; warm-up loads them before reporting ready
+WARMUP_MODULES = [m for m in os.environ.get('WARMUP_MODULES', 'numpy,pypdf,requests').split(',') if m]
+
+SAMPLE_RESUME = """Jane Doe
+jane.doe@example.com
+Skills: Python, SQL, Docker
+Experience: 3 years as a software engineer
+Education
+B.Tech Computer Science
+"""
+
+
+class Warmup:
+    """
+    Tracks cold start: how long the app took to import, what warm-up loaded and how long
+    each step took, and the latency of the first real request afterwards.
+    """
+
+    def __init__(self):
+        self.mode = None
+        self.state = 'pending'  # pending -> warming -> ready | failed
+        self.origin = None
+        self.phases = {}
+        self.steps = []
+        self.ready_after_ms = None
+        self.first_request = None
+        self.extra_steps = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def record_phase(self, name, seconds):
+        with self._lock:
+            self.phases[name] = round(seconds * 1000, 1)
+
+    def add_step(self, name, fn):
+        """
+        Registers another warm-up step, run after the model and parser (e.g. by the app).
+        """
+        self.extra_steps.append((name, fn))
+
+    def _step(self, name, fn):
+        started = time.perf_counter()
+        entry = {'step': name}
+        try:
+            result = fn()
+            if result is not None:
+                entry['result'] = result
+            entry['ok'] = True
+        except Exception as e:
+            entry['ok'] = False
+            entry['error'] = f"{type(e).__name__}: {e}"
+        entry['ms'] = round((time.perf_counter() - started) * 1000, 1)
+        with self._lock:
+            self.steps.append(entry)
+        return entry['ok']
+
+    def run(self):
+        import predictor
+        from resume_parser import parse_resume_text
+
+        self.state = 'warming'
+        started = time.perf_counter()
+        for module in WARMUP_MODULES:
+            # A missing optional module only matters to the code path that needs it
+            self._step(f'import {module}', lambda module=module: importlib.import_module(module) and None)
+        model_ok = self._step('model', predictor.warm_up)
+        self._step('parser', lambda: parse_resume_text(SAMPLE_RESUME) and None)
+        for name, fn in self.extra_steps:
+            self._step(name, fn)
+
+        finished = time.perf_counter()
+        self.record_phase('warmup', finished - started)
+        if self.origin is not None:
+            self.ready_after_ms = round((finished - self.origin) * 1000, 1)
+        self.state = 'ready' if model_ok else 'failed'
+        self._done.set()
+
+        summary = ', '.join(f"{entry['step']} {entry['ms']}ms{'' if entry['ok'] else ' FAILED'}" for entry in self.steps)
+        print(f"Warm-up {self.state} in {self.phases['warmup']} ms ({summary})")
+
+    def start(self, mode=WARMUP_MODE, origin=None):
+        """
+        Runs warm-up according to `mode`. `origin` is a perf_counter() timestamp taken when
+        startup began, used to report time-to-ready.
+        """
+        self.mode = mode
+        self.origin = origin
+        if mode == 'off':
+            self.state = 'ready'
+            self._done.set()
+        elif mode == 'blocking':
+            self.run()
+        else:
+            threading.Thread(target=self.run, name='warmup', daemon=True).start()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def is_ready(self):
+        return self.state == 'ready'
+
+    def note_request(self, path, seconds):
+        """
+        Records the first request served after startup (probes excluded by the caller).
+        """
+        if self.first_request is None:
+            with self._lock:
+                if self.first_request is None:
+                    self.first_request = {'path': path, 'ms': round(seconds * 1000, 1), 'state': self.state}
+
+    def report(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'mode': self.mode,
+                'phases_ms': dict(self.phases),
+                'steps': list(self.steps),
+                'ready_after_ms': self.ready_after_ms,
+                'first_request': self.first_request
+            }
+
+
+_warmup = Warmup()
+
+def get_warmup():
+    return _warmup
+
+metrics.gauge_func('resume_ready', 'Whether warm-up has completed (1) or not (0).', lambda: 1 if _warmup.is_ready() else 0)
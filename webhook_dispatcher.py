@@ -0,0 +1,321 @@
+import os
+import json
+import time
+import glob
+import queue
+import random
+import atexit
+import itertools
+import threading
+
+# Configuration
+WEBHOOK_QUEUE_SIZE = int(os.environ.get('WEBHOOK_QUEUE_SIZE', 1000))
+# 1 keeps the one-payload-per-POST contract n8n flows expect; >1 POSTs a JSON array
+WEBHOOK_BATCH_SIZE = int(os.environ.get('WEBHOOK_BATCH_SIZE', 1))
+WEBHOOK_BATCH_WAIT = float(os.environ.get('WEBHOOK_BATCH_WAIT', 0.05))
+WEBHOOK_TIMEOUT = float(os.environ.get('WEBHOOK_TIMEOUT', 5))
+WEBHOOK_MAX_RETRIES = int(os.environ.get('WEBHOOK_MAX_RETRIES', 4))
+WEBHOOK_BACKOFF_BASE = float(os.environ.get('WEBHOOK_BACKOFF_BASE', 0.5))
+WEBHOOK_BACKOFF_MAX = float(os.environ.get('WEBHOOK_BACKOFF_MAX', 30))
+# Empty string disables the on-disk spill (overflow is then dropped and counted)
+WEBHOOK_SPILL_DIR = os.environ.get('WEBHOOK_SPILL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'webhook_spill'))
+WEBHOOK_SPILL_RETRY_INTERVAL = float(os.environ.get('WEBHOOK_SPILL_RETRY_INTERVAL', 30))
+
+
+class WebhookDispatcher:
+    """
+    Background delivery of n8n webhook payloads.
+    Payloads are serialized at enqueue time and delivered by a single worker thread over a
+    pooled keep-alive session, optionally micro-batched, with exponential backoff.
+    When the in-memory queue is full, or delivery keeps failing, payloads are spilled to
+    JSONL files on disk and re-queued later instead of being lost. Every spill is written to
+    its own .tmp file and renamed to .jsonl once closed, so a file is never claimed for
+    replay while someone is still appending to it.
+    """
+
+    def __init__(self, url, queue_size=WEBHOOK_QUEUE_SIZE, batch_size=WEBHOOK_BATCH_SIZE, spill_dir=WEBHOOK_SPILL_DIR):
+        self.url = url
+        self.batch_size = max(1, batch_size)
+        self.spill_dir = spill_dir
+
+        # requests is imported on first use to keep it off the app's import path
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._spill_seq = itertools.count()
+        self._thread = None
+        self._stopping = threading.Event()
+        self._last_spill_check = 0.0
+
+        self.metrics = {
+            'enqueued': 0,
+            'delivered': 0,
+            'batches_sent': 0,
+            'retries': 0,
+            'failed': 0,
+            'spilled': 0,
+            'respooled': 0,
+            'dropped': 0,
+            'last_latency_ms': None,
+            'last_error': None
+        }
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self.metrics[key] += n
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='webhook-dispatcher', daemon=True)
+                self._thread.start()
+
+    # --- Producer side ---
+
+    def enqueue(self, payload):
+        """
+        Never blocks the request thread: the payload is queued, spilled or dropped.
+        """
+        try:
+            body = json.dumps(payload)
+        except (TypeError, ValueError) as e:
+            print(f"Webhook payload not serializable, dropping: {e}")
+            self._count('dropped')
+            return False
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(body)
+            self._count('enqueued')
+            return True
+        except queue.Full:
+            return self._spill([body])
+
+    # --- Spill to disk ---
+
+    def _spill(self, bodies):
+        if not self.spill_dir:
+            self._count('dropped', len(bodies))
+            return False
+        name = f"spill-{os.getpid()}-{threading.get_ident()}-{next(self._spill_seq)}"
+        tmp_path = os.path.join(self.spill_dir, name + '.tmp')
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for body in bodies:
+                    f.write(body + '\n')
+            # Only complete, closed files carry the .jsonl suffix that _respool claims
+            os.rename(tmp_path, os.path.join(self.spill_dir, name + '.jsonl'))
+            self._count('spilled', len(bodies))
+            return True
+        except OSError as e:
+            print(f"Webhook spill failed, dropping {len(bodies)} payload(s): {e}")
+            self._count('dropped', len(bodies))
+            return False
+
+    @staticmethod
+    def _pid_alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True  # Exists, owned by another user
+        return True
+
+    def _recover_stale(self):
+        """
+        Returns files left behind by processes that died mid-spill (.tmp) or mid-replay
+        (.claimed) to the .jsonl pool. A torn last line of a .tmp file is skipped on replay.
+        """
+        if not self.spill_dir:
+            return
+        for path in glob.glob(os.path.join(self.spill_dir, 'spill-*.tmp')):
+            # spill-<pid>-<tid>-<seq>.tmp
+            pid = os.path.basename(path).split('-')[1]
+            if pid.isdigit() and not self._pid_alive(int(pid)):
+                try:
+                    os.rename(path, path[:-len('.tmp')] + '.jsonl')
+                except OSError:
+                    pass
+        for path in glob.glob(os.path.join(self.spill_dir, 'spill-*.jsonl.*.claimed')):
+            # <original>.jsonl.<pid>.claimed
+            original, pid, _ = path.rsplit('.', 2)
+            if pid.isdigit() and not self._pid_alive(int(pid)):
+                try:
+                    os.rename(path, original)
+                except OSError:
+                    pass
+
+    def _respool(self):
+        """
+        Moves spilled payloads back into the queue once it has drained.
+        Files are claimed by atomic rename so concurrent workers never replay the same file.
+        """
+        now = time.monotonic()
+        if not self.spill_dir or now - self._last_spill_check < WEBHOOK_SPILL_RETRY_INTERVAL:
+            return
+        self._last_spill_check = now
+
+        for path in sorted(glob.glob(os.path.join(self.spill_dir, 'spill-*.jsonl'))):
+            claimed = f"{path}.{os.getpid()}.claimed"
+            try:
+                os.rename(path, claimed)
+                with open(claimed, 'r', encoding='utf-8') as f:
+                    bodies = [line.rstrip('\n') for line in f if line.endswith('\n') and line.strip()]
+            except OSError:
+                continue
+
+            # The claimed file is only removed once every payload is queued or spilled again, so
+            # a crash in between leaves it for _recover_stale (at worst delivering some twice)
+            full = False
+            for i, body in enumerate(bodies):
+                try:
+                    self._queue.put_nowait(body)
+                    self._count('respooled')
+                except queue.Full:
+                    full = True
+                    if not self._spill(bodies[i:]):
+                        return
+                    break
+            try:
+                os.remove(claimed)
+            except OSError:
+                pass
+            if full:
+                return
+
+    # --- Consumer side ---
+
+    def _next_batch(self):
+        try:
+            first = self._queue.get(timeout=1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + WEBHOOK_BATCH_WAIT
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _deliver(self, batch):
+        import requests  # Already loaded by __init__; binds the exception type
+
+        if self.batch_size == 1:
+            data = batch[0]
+        else:
+            data = '[' + ','.join(batch) + ']'
+
+        for attempt in range(WEBHOOK_MAX_RETRIES + 1):
+            if attempt:
+                self._count('retries')
+                backoff = min(WEBHOOK_BACKOFF_MAX, WEBHOOK_BACKOFF_BASE * (2 ** (attempt - 1)))
+                # Jitter avoids synchronized retries from several workers
+                if self._stopping.wait(backoff * random.uniform(0.5, 1.0)):
+                    break
+            started = time.perf_counter()
+            try:
+                response = self.session.post(
+                    self.url,
+                    data=data,
+                    headers={'Content-Type': 'application/json'},
+                    timeout=WEBHOOK_TIMEOUT
+                )
+            except requests.RequestException as e:
+                with self._lock:
+                    self.metrics['last_error'] = str(e)
+                continue
+
+            with self._lock:
+                self.metrics['last_latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            if response.ok:
+                self._count('delivered', len(batch))
+                self._count('batches_sent')
+                return True
+            with self._lock:
+                self.metrics['last_error'] = f"HTTP {response.status_code}"
+            # Client errors other than rate limiting will not succeed on retry
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                print(f"n8n rejected webhook payload: {response.status_code}")
+                self._count('failed', len(batch))
+                return False
+
+        # Transient failure: keep the payloads on disk for a later attempt
+        print(f"Failed to deliver {len(batch)} webhook payload(s): {self.metrics['last_error']}")
+        self._spill(batch)
+        return False
+
+    def _run(self):
+        self._recover_stale()
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if not batch:
+                self._respool()
+                continue
+            try:
+                self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    # --- Lifecycle ---
+
+    def flush(self, timeout=None):
+        """
+        Blocks until every queued payload has been delivered or spilled.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self):
+        """
+        Stops the worker and spills whatever is still queued so it survives the restart.
+        """
+        self._stopping.set()
+        remaining = []
+        while True:
+            try:
+                remaining.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if remaining:
+            self._spill(remaining)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.metrics)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['queue_size'] = self._queue.maxsize
+        stats['batch_size'] = self.batch_size
+        return stats
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher(url):
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = WebhookDispatcher(url)
+                atexit.register(_dispatcher.shutdown)
+    return _dispatcher